@@ -4,6 +4,7 @@ import bpy
 import numpy as np
 
 from ... import draw, geometry, math, mesh
+from .internal import instance_on_points, make_instance_material
 
 class ConvexPolyhedra(draw.ConvexPolyhedra):
 
@@ -12,26 +13,18 @@ class ConvexPolyhedra(draw.ConvexPolyhedra):
         rotation = np.asarray(rotation)
         prim_name = '{}_{}'.format(type(self).__name__, suffix)
 
-        material = bpy.data.materials.new(prim_name)
-        material.use_object_color = True
+        (positions, orientations, colors) = mesh.unfoldProperties([
+            self.positions, self.orientations, self.colors])
+        positions = math.quatrot(rotation[np.newaxis, :], positions)
+        orientations = math.quatquat(rotation[np.newaxis, :], orientations)
+        scales = np.ones_like(positions)
+
+        material = make_instance_material(prim_name, np.any(colors[:, 3] < 1))
 
         (vertices, faces) = geometry.convexHull(self.vertices)
-        mesh = bpy.data.meshes.new(prim_name)
-        mesh.from_pydata(vertices, edges=[], faces=faces)
-        mesh.materials.append(material)
-
-        group = bpy.data.groups.new(prim_name)
-        positions = math.quatrot(rotation[np.newaxis, :], self.positions)
-
-        particles = zip(*mesh.unfoldProperties([
-            positions, self.orientations, self.colors]))
-        for (i, (position, orientation, color)) in enumerate(particles):
-            shape_name = prim_name + '_{}'.format(i)
-            shape = bpy.data.objects.new(shape_name, object_data=mesh)
-            shape.location = position
-            shape.rotation_mode = 'QUATERNION'
-            shape.rotation_quaternion = orientation
-            shape.color = color
-
-            group.objects.link(shape)
-            scene.objects.link(shape)
+        shape_mesh = bpy.data.meshes.new(prim_name)
+        shape_mesh.from_pydata(vertices, [], faces)
+        shape_mesh.materials.append(material)
+
+        instance_on_points(scene, prim_name, shape_mesh, positions,
+                           orientations, scales, colors)
@@ -2,6 +2,7 @@ import bpy
 import numpy as np
 
 from ... import draw
+from .internal import link_object
 
 class Scene(draw.Scene):
     __doc__ = draw.Scene.__doc__
@@ -13,7 +14,7 @@ class Scene(draw.Scene):
         (width, height) = self.size_pixels
         new_scene.render.resolution_x = width
         new_scene.render.resolution_y = height
-        new_scene.render.alpha_mode = 'TRANSPARENT'
+        new_scene.render.film_transparent = True
 
         kwargs = dict(scene=new_scene, translation=self.translation,
                       rotation=self.rotation)
@@ -36,7 +37,7 @@ class Scene(draw.Scene):
         camera_params.ortho_scale = np.max(self.size/self.zoom)
         camera_object = bpy.data.objects.new('plato_camera', object_data=camera_params)
         camera_object.location = (0, 0, dz)
-        scene.objects.link(camera_object)
+        link_object(scene, camera_object)
         scene.camera = camera_object
 
     def render_lights(self, scene, **kwargs):
@@ -54,14 +55,14 @@ class Scene(draw.Scene):
                 magnitude = np.linalg.norm(light)
                 direction = light/magnitude
 
-                light_params = bpy.data.lamps.new(name=name, type='SUN')
+                light_params = bpy.data.lights.new(name=name, type='SUN')
                 light_params.color = (magnitude, magnitude, magnitude)
                 light_object = bpy.data.objects.new(name, object_data=light_params)
-                scene.objects.link(light_object)
+                link_object(scene, light_object)
 
     def show(self):
         blender_scene = self.render()
-        bpy.context.screen.scene = blender_scene
+        bpy.context.window.scene = blender_scene
         return blender_scene
 
     def save(self, filename):
@@ -3,33 +3,39 @@ import itertools
 import bpy
 import numpy as np
 
-from ... import draw, math, mesh
+from ... import draw, geometry, math, mesh
+from ..internal import ShapeAttribute, ShapeDecorator
+from .internal import instance_on_points, make_instance_material
 
+@ShapeDecorator
 class Spheres(draw.Spheres):
 
+    _ATTRIBUTES = draw.Spheres._ATTRIBUTES + list(
+        itertools.starmap(ShapeAttribute, [
+        ('vertex_count', np.int32, 256, 0, False,
+         'Number of vertices used to render sphere')
+    ]))
+
     def render(self, scene, suffix='', translation=(0, 0, 0),
                rotation=(1, 0, 0, 0)):
         rotation = np.asarray(rotation)
         prim_name = '{}_{}'.format(type(self).__name__, suffix)
 
-        material = bpy.data.materials.new(prim_name)
-        material.use_object_color = True
-
-        shape_params = bpy.data.metaballs.new(prim_name)
-        shape_params.materials.append(material)
-        elt_params = shape_params.elements.new('BALL')
+        (positions, radii, colors) = mesh.unfoldProperties([
+            self.positions, self.radii, self.colors])
+        positions = math.quatrot(rotation[np.newaxis, :], positions)
+        orientations = np.tile([1., 0, 0, 0], (len(positions), 1))
+        scales = np.tile(radii, (1, 3))
 
-        group = bpy.data.groups.new(prim_name)
-        positions = math.quatrot(rotation[np.newaxis, :], self.positions)
+        material = make_instance_material(prim_name, np.any(colors[:, 3] < 1))
 
-        particles = zip(*mesh.unfoldProperties([
-            positions, self.radii, self.colors]))
-        for (i, (position, (radius,), color)) in enumerate(particles):
-            shape_name = prim_name + '_{}'.format(i)
-            shape = bpy.data.objects.new(shape_name, object_data=shape_params)
-            shape.location = position
-            shape.color = color
-            shape.scale = (radius, radius, radius)
+        # unit sphere, shared by all particles
+        vertices = geometry.fibonacciPositions(self.vertex_count, 1, 1, 1)
+        (vertices, faces) = geometry.convexHull(vertices)
+        shape_mesh = bpy.data.meshes.new(prim_name)
+        shape_mesh.from_pydata(vertices, [], faces)
+        shape_mesh.polygons.foreach_set('use_smooth', [True]*len(shape_mesh.polygons))
+        shape_mesh.materials.append(material)
 
-            group.objects.link(shape)
-            scene.objects.link(shape)
+        instance_on_points(scene, prim_name, shape_mesh, positions,
+                           orientations, scales, colors)
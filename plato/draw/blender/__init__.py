@@ -1,3 +1,14 @@
+"""
+The blender backend builds scenes within `blender
+<https://www.blender.org/>`_, so it must be used from blender's
+bundled python interpreter.
+
+Primitives consisting of many copies of a single shape (`Spheres`
+and `ConvexPolyhedra`) are drawn by instancing a shared mesh onto a
+set of points using a geometry nodes modifier, which requires blender
+3.2 or newer.
+"""
+
 from .Scene import Scene
 
 from .ConvexPolyhedra import ConvexPolyhedra
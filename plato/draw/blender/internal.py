@@ -0,0 +1,106 @@
+import bpy
+import numpy as np
+import rowan
+
+def link_object(scene, obj):
+    """Link an object into a scene."""
+    scene.collection.objects.link(obj)
+
+def _new_group_socket(node_group, name, in_out, socket_type):
+    # blender 4.0 moved node group sockets into node_group.interface
+    if hasattr(node_group, 'interface'):
+        node_group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    elif in_out == 'INPUT':
+        node_group.inputs.new(socket_type, name)
+    else:
+        node_group.outputs.new(socket_type, name)
+
+def make_instance_material(name, transparent=False):
+    """Create a material that takes its color from the `color` attribute
+    of each instance."""
+    material = bpy.data.materials.new(name)
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+
+    bsdf = nodes['Principled BSDF']
+    attribute = nodes.new('ShaderNodeAttribute')
+    attribute.attribute_type = 'INSTANCER'
+    attribute.attribute_name = 'color'
+    links.new(attribute.outputs['Color'], bsdf.inputs['Base Color'])
+
+    if transparent:
+        links.new(attribute.outputs['Alpha'], bsdf.inputs['Alpha'])
+        material.blend_method = 'BLEND'
+
+    return material
+
+def instance_on_points(scene, name, shape_mesh, positions, orientations,
+                       scales, colors):
+    """Draw copies of a mesh at a set of points.
+
+    Rather than creating a blender object for each shape, a single
+    mesh stores one vertex (with rotation, scale, and color attributes)
+    per shape, and a geometry nodes modifier instances `shape_mesh`
+    onto each vertex. The color of each instance is available to
+    materials as the `color` instancer attribute (see
+    :py:func:`make_instance_material`). Requires blender 3.2 or newer
+    for the Named Attribute geometry node.
+
+    :param scene: blender scene to link the resulting object into
+    :param name: name of the created blender objects
+    :param shape_mesh: blender mesh to instance
+    :param positions: (N, 3) array of instance positions
+    :param orientations: (N, 4) array of instance orientation quaternions
+    :param scales: (N, 3) array of instance scale factors
+    :param colors: (N, 4) array of instance RGBA colors
+    :returns: the blender object containing the instances
+    """
+    # not linked into the scene, so that only the instances are drawn
+    shape_object = bpy.data.objects.new(name + '_shape', object_data=shape_mesh)
+
+    node_group = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    _new_group_socket(node_group, 'Geometry', 'INPUT', 'NodeSocketGeometry')
+    _new_group_socket(node_group, 'Geometry', 'OUTPUT', 'NodeSocketGeometry')
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
+    object_info = nodes.new('GeometryNodeObjectInfo')
+    object_info.inputs['Object'].default_value = shape_object
+    instancer = nodes.new('GeometryNodeInstanceOnPoints')
+
+    links.new(group_input.outputs['Geometry'], instancer.inputs['Points'])
+    links.new(object_info.outputs['Geometry'], instancer.inputs['Instance'])
+    for attribute_name in ('rotation', 'scale'):
+        attribute = nodes.new('GeometryNodeInputNamedAttribute')
+        attribute.data_type = 'FLOAT_VECTOR'
+        attribute.inputs['Name'].default_value = attribute_name
+        links.new(attribute.outputs['Attribute'],
+                  instancer.inputs[attribute_name.capitalize()])
+    # point attributes (including color) are propagated to the instances
+    links.new(instancer.outputs['Instances'], group_output.inputs['Geometry'])
+
+    # blender's XYZ euler angles rotate about the x, y, then z axes
+    orientations = rowan.normalize(orientations)
+    eulers = rowan.to_euler(orientations, convention='xyz', axis_type='extrinsic')
+
+    points = bpy.data.meshes.new(name)
+    points.vertices.add(len(positions))
+    points.vertices.foreach_set('co', np.asarray(positions, dtype=np.float32).reshape(-1))
+    point_attributes = [
+        ('rotation', 'FLOAT_VECTOR', 'vector', eulers),
+        ('scale', 'FLOAT_VECTOR', 'vector', scales),
+        ('color', 'FLOAT_COLOR', 'color', colors),
+    ]
+    for (attribute_name, attribute_type, key, values) in point_attributes:
+        attribute = points.attributes.new(attribute_name, attribute_type, 'POINT')
+        attribute.data.foreach_set(key, np.asarray(values, dtype=np.float32).reshape(-1))
+
+    result = bpy.data.objects.new(name, object_data=points)
+    modifier = result.modifiers.new(name, 'NODES')
+    modifier.node_group = node_group
+    link_object(scene, result)
+
+    return result
@@ -3,3 +3,6 @@ from .Lines import Lines
 
 class Box(draw.Box, Lines):
     __doc__ = draw.Box.__doc__
+
+    _UPDATABLE_ATTRIBUTES = Lines._UPDATABLE_ATTRIBUTES | frozenset(
+        ['Lx', 'Ly', 'Lz', 'xy', 'xz', 'yz', 'width', 'color'])
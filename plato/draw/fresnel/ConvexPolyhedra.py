@@ -17,6 +17,21 @@ class ConvexPolyhedra(FresnelPrimitive, draw.ConvexPolyhedra):
          'Outline width for all particles')
     ]))
 
+    _UPDATABLE_ATTRIBUTES = frozenset(['positions', 'orientations', 'colors', 'outline'])
+
+    def update(self, geometry, names):
+        if len(geometry.position) != len(self.positions):
+            return False
+        if 'positions' in names:
+            geometry.position[:] = self.positions
+        if 'orientations' in names:
+            geometry.orientation[:] = self.orientations
+        if 'colors' in names:
+            geometry.color[:] = fresnel.color.linear(self.colors)
+        if 'outline' in names:
+            geometry.outline_width = self.outline
+        return True
+
     def render(self, scene):
         polyhedron_info = fresnel.util.convex_polyhedron_from_vertices(self.vertices)
         geometry = fresnel.geometry.ConvexPolyhedron(
@@ -6,6 +6,21 @@ from .FresnelPrimitive import FresnelPrimitiveSolid
 class Disks(FresnelPrimitiveSolid, draw.Disks):
     __doc__ = draw.Disks.__doc__
 
+    _UPDATABLE_ATTRIBUTES = frozenset(['positions', 'radii', 'colors', 'outline'])
+
+    def update(self, geometry, names):
+        if len(geometry.position) != len(self.positions):
+            return False
+        if 'positions' in names:
+            geometry.position[:, :2] = self.positions
+        if 'radii' in names:
+            geometry.radius[:] = self.radii
+        if 'colors' in names:
+            geometry.color[:] = fresnel.color.linear(self.colors)
+        if 'outline' in names:
+            geometry.outline_width = self.outline
+        return True
+
     def render(self, scene):
         geometry = fresnel.geometry.Sphere(
             scene=scene,
@@ -18,12 +18,55 @@ def _get_default_material(solid=0):
 
 
 class FresnelPrimitive(object):
-    """A mixin class that defines a default :py:class:`fresnel.material.Material`."""
+    """A mixin class that defines a default :py:class:`fresnel.material.Material`.
+
+    Subclasses create a new fresnel geometry in `render` and can list
+    attributes that can be copied into an existing geometry (by
+    `update`) in `_UPDATABLE_ATTRIBUTES`.
+    """
+
+    _UPDATABLE_ATTRIBUTES = frozenset()
 
     def __init__(self, *args, **kwargs):
         self._material = kwargs.get("material", _get_default_material(solid=0))
         super().__init__(*args, **kwargs)
 
+    def update(self, geometry, names):
+        """Copy the values of the given attributes into an existing geometry.
+
+        :param geometry: fresnel geometry previously created by `render`
+        :param names: set of attribute names (all in `_UPDATABLE_ATTRIBUTES`) to update
+        :returns: False if the geometry could not be updated (for example, if the number of particles changed)
+        """
+        return False
+
+    def render_geometry(self, scene, geometry=None):
+        """Return a fresnel geometry for this primitive.
+
+        If `geometry` is given and only attributes that can be updated
+        in place have been modified since it was created, it is
+        updated and reused; otherwise, it is removed and a new
+        geometry is created.
+
+        :param scene: fresnel scene to add the geometry to
+        :param geometry: geometry previously returned by this method, if any
+        """
+        dirty = set(self._dirty_attributes)
+
+        if geometry is not None:
+            if dirty <= self._UPDATABLE_ATTRIBUTES and self.update(geometry, dirty):
+                geometry.material = self._material
+            else:
+                geometry.remove()
+                geometry = None
+
+        if geometry is None:
+            geometry = self.render(scene)
+
+        self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
+        return geometry
+
 
 class FresnelPrimitiveSolid(FresnelPrimitive):
     """A mixin class that defines a solid default :py:class:`fresnel.material.Material`.
@@ -17,6 +17,23 @@ class Lines(FresnelPrimitiveSolid, draw.Lines):
          'Outline width for all particles')
     ]))
 
+    _UPDATABLE_ATTRIBUTES = frozenset(
+        ['start_points', 'end_points', 'widths', 'colors', 'outline'])
+
+    def update(self, geometry, names):
+        if len(geometry.points) != len(self.start_points):
+            return False
+        if 'start_points' in names:
+            geometry.points[:, 0, :] = self.start_points
+        if 'end_points' in names:
+            geometry.points[:, 1, :] = self.end_points
+        if 'widths' in names:
+            geometry.radius[:] = self.widths/2
+        if 'colors' in names:
+            geometry.color[:, 0, :] = fresnel.color.linear(self.colors)
+            geometry.color[:, 1, :] = fresnel.color.linear(self.colors)
+        return True
+
     def render(self, scene):
         geometry = fresnel.geometry.Cylinder(
             scene=scene,
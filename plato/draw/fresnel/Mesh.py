@@ -18,6 +18,26 @@ class Mesh(FresnelPrimitive, draw.Mesh):
          'Outline width for all particles')
     ]))
 
+    _UPDATABLE_ATTRIBUTES = frozenset(
+        ['positions', 'orientations', 'colors', 'shape_colors',
+         'shape_color_fraction', 'outline'])
+
+    def update(self, geometry, names):
+        if len(geometry.position) != len(self.positions):
+            return False
+        if 'positions' in names:
+            geometry.position[:] = self.positions
+        if 'orientations' in names:
+            geometry.orientation[:] = self.orientations
+        if 'colors' in names:
+            geometry.color[:] = fresnel.color.linear(self.colors)[self.indices].reshape(-1, 3)
+        if names & {'shape_colors', 'shape_color_fraction'}:
+            self._material.color = fresnel.color.linear(self.shape_colors[0])
+            self._material.primitive_color_mix = 1-self.shape_color_fraction
+        if 'outline' in names:
+            geometry.outline_width = self.outline
+        return True
+
     def render(self, scene):
         # Convert from vertices shape (num_unique_vertices, 3) and indices with
         # shape (num_triangles, 3) to (3 * num_triangles, 3) array
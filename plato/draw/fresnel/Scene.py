@@ -1,20 +1,50 @@
+from collections import namedtuple, OrderedDict
+import time
+
 import fresnel
 import numpy as np
 import rowan
 
 from ... import draw
 
+_MATERIAL_PROPERTIES = ('solid', 'color', 'primitive_color_mix', 'roughness',
+                        'specular', 'spec_trans', 'metal')
+
+PathTracerProgress = namedtuple(
+    'PathTracerProgress', ['image', 'samples', 'error', 'seconds'])
+PathTracerProgress.__doc__ = """Intermediate result of progressive path tracing.
+
+:param image: (height, width, 4) array of RGBA image data, using all samples taken so far
+:param samples: number of samples taken per pixel so far
+:param error: estimated standard error of the image (99th percentile over all pixels and color channels of the linear, not tone-mapped, image); infinite until at least two batches have been sampled
+:param seconds: time spent sampling so far
+"""
+
+def _material_key(material):
+    return tuple(repr(np.asarray(getattr(material, name)).tolist())
+                 for name in _MATERIAL_PROPERTIES)
+
 class Scene(draw.Scene):
     __doc__ = (draw.Scene.__doc__ or '') + """
     This Scene supports the following features:
 
     * *antialiasing*: Enable antialiasing, for the preview tracer only.
-    * *pathtracer*: Enable the path tracer. Accepts parameter ``samples`` with default value 64.
+    * *pathtracer*: Enable the path tracer. Accepts parameter ``samples`` with default value 64. If a ``tolerance`` (estimated per-pixel standard error, see :py:class:`PathTracerProgress`) or ``time_limit`` (in seconds) is given, samples are instead taken in batches of ``batch_size`` (default 8), stopping early once either is reached; ``callback`` can be given as a function to be called with a :py:class:`PathTracerProgress` after each batch.
     * *directional_light*: Add directional lights. The given vector(s) indicates the light direction. The length of the vector(s) determines the magnitude of the light(s).
     * *ambient_light*: Enable ambient lighting. The given value indicates the magnitude of the light.
+
+    Rendered images are cached: if the primitives (as tracked by
+    setting their attributes), materials, camera, and features of the
+    scene are unchanged since one of the last `output_cache_size`
+    renders, that image is reused rather than traced again. Returned
+    images are therefore read-only; copy them before modifying them.
+    Only assignments to primitive attributes are tracked, so in-place
+    modifications (such as ``prim.positions[:] = ...``) are not
+    detected; reassign the attribute, or set `output_cache_size` to 0
+    to always trace a new image.
     """
 
-    def __init__(self, *args, tracer_kwargs={}, **kwargs):
+    def __init__(self, *args, tracer_kwargs={}, output_cache_size=4, **kwargs):
         super(Scene, self).__init__(*args, **kwargs)
         self._device = fresnel.Device()
         self._fresnel_scene = fresnel.Scene(device=self._device)
@@ -23,15 +53,21 @@ class Scene(draw.Scene):
             device=self._device, w=default_size[0], h=default_size[1])
         self._path_tracer = fresnel.tracer.Path(
             device=self._device, w=default_size[0], h=default_size[1])
-        self._geometries = []
+        # map id(primitive) -> (primitive, fresnel geometry)
+        self._geometries = {}
+        # incremented whenever the set of primitives or their contents change
+        self._content_version = 0
+        # map render stamps -> cached output images (most recently used last)
+        self._output_cache = OrderedDict()
+        self.output_cache_size = output_cache_size
         self._output = None
 
     def show(self):
         """Render the scene to an image and display using IPython."""
         import IPython
-        if self._output is None:
-            self.render()
-        IPython.display.display(self._output, display_id=str(id(self)))
+        import PIL.Image
+        image = PIL.Image.fromarray(self.render(), mode='RGBA')
+        IPython.display.display(image, display_id=str(id(self)))
 
     def save(self, filename):
         """Render and save an image of this Scene.
@@ -43,25 +79,60 @@ class Scene(draw.Scene):
         except ImportError:
             raise RuntimeError('Could not import PIL. PIL (pillow) is required to save fresnel images.')
         else:
-            if self._output is None:
-                self.render()
-            image = PIL.Image.fromarray(self._output[:], mode='RGBA')
+            image = PIL.Image.fromarray(self.render(), mode='RGBA')
             image.save(filename)
 
     def render(self):
-        """Render this Scene object."""
-        # Remove existing fresnel geometries from the scene
-        for geometry in self._geometries:
-            geometry.remove()
+        """Render this Scene object.
 
-        # Clear the list of fresnel geometries
-        self._geometries = []
+        :returns: (height, width, 4) array of RGBA image data
+        """
+        self._update_geometries()
 
-        # Add fresnel scene geometries from plato scene primitives
-        for prim in self._primitives:
-            geometry = prim.render(self._fresnel_scene)
-            self._geometries.append(geometry)
+        stamp = self._render_stamp()
+        if stamp in self._output_cache:
+            self._output_cache.move_to_end(stamp)
+            self._output = self._output_cache[stamp]
+            return self._output
+
+        self._setup_fresnel_scene()
+
+        if 'pathtracer' in self.enabled_features:
+            # Use path tracer if enabled
+            for progress in self._sample_progressively():
+                pass
+            output = progress.image
+        else:
+            # Use preview tracer by default
+            tracer = self._preview_tracer
+            tracer.anti_alias = 'antialiasing' in self.enabled_features
+            # copy the image, since tracers reuse their output buffers
+            output = np.array(tracer.render(self._fresnel_scene)[:])
+
+        self._store_output(stamp, output)
+        return self._output
+
+    def render_progressive(self):
+        """Path trace this Scene, yielding intermediate images.
+
+        Samples are accumulated in batches as configured by the
+        *pathtracer* feature (which does not need to be enabled). After
+        each batch, a :py:class:`PathTracerProgress` object is
+        yielded. The final image becomes the output of the scene.
+        """
+        self._update_geometries()
+        stamp = self._render_stamp()
+        self._setup_fresnel_scene()
+
+        for progress in self._sample_progressively():
+            yield progress
 
+        if 'pathtracer' in self.enabled_features:
+            self._store_output(stamp, progress.image)
+        else:
+            self._output = progress.image
+
+    def _setup_fresnel_scene(self):
         # Set up the camera
         camera_up = rowan.rotate(rowan.conjugate(self.rotation), [0, 1, 0])
         camera_position = rowan.rotate(rowan.conjugate(self.rotation), -self.translation)
@@ -100,21 +171,105 @@ class Scene(draw.Scene):
         if len(lights) > 0:
             self._fresnel_scene.lights = lights
 
-        # Set up tracer
-        if 'pathtracer' in self.enabled_features:
-            # Use path tracer if enabled
-            config = self.get_feature_config('pathtracer')
-            tracer = self._path_tracer
-            samples = config.get('samples', 64)
-            def render_function(scene, **kwargs):
-                return tracer.sample(scene, samples, **kwargs)
-        else:
-            # Use preview tracer by default
-            tracer = self._preview_tracer
-            tracer.anti_alias = 'antialiasing' in self.enabled_features
-            render_function = tracer.render
+    def _sample_progressively(self):
+        config = self.get_feature_config('pathtracer') or {}
+        max_samples = config.get('samples', 64)
+        tolerance = config.get('tolerance', None)
+        time_limit = config.get('time_limit', None)
+        callback = config.get('callback', None)
+        progressive = tolerance is not None or time_limit is not None
+        batch_size = config.get('batch_size', 8 if progressive else max_samples)
+
+        if max_samples <= 0:
+            raise ValueError('The number of path tracer samples must be positive')
+
+        tracer = self._path_tracer
+        start = time.perf_counter()
+        samples = batches = 0
+        # running mean and sum of squared deviations (Welford's
+        # method) of the image produced by each batch of samples
+        (batch_mean, batch_m2) = (0, 0)
+        previous = None
+        while samples < max_samples:
+            batch = min(batch_size, max_samples - samples)
+            image = np.array(tracer.sample(
+                self._fresnel_scene, batch, reset=(samples == 0))[:])
+            # use the linear (not tone-mapped or quantized) accumulated
+            # color channels to estimate the error
+            values = np.array(tracer.linear_output[:], dtype=np.float64)[..., :3]
+
+            # recover the image of this batch alone from the change in
+            # the accumulated image
+            if previous is None:
+                batch_values = values
+            else:
+                batch_values = previous + (values - previous)*(samples + batch)/batch
+            previous = values
+            samples += batch
+            batches += 1
+
+            delta = batch_values - batch_mean
+            batch_mean = batch_mean + delta/batches
+            batch_m2 = batch_m2 + delta*(batch_values - batch_mean)
+
+            error = np.inf
+            if batches > 1:
+                standard_errors = np.sqrt(batch_m2/(batches - 1)/batches)
+                error = float(np.percentile(standard_errors, 99))
+
+            progress = PathTracerProgress(
+                image, samples, error, time.perf_counter() - start)
+            if callback is not None:
+                callback(progress)
+            yield progress
+
+            if tolerance is not None and error < tolerance:
+                break
+            elif time_limit is not None and progress.seconds >= time_limit:
+                break
+
+    def _store_output(self, stamp, output):
+        # cached images are shared with callers, so prevent them from
+        # being modified
+        output.flags.writeable = False
+        self._output = output
+        self._output_cache[stamp] = output
+        self._output_cache.move_to_end(stamp)
+        while len(self._output_cache) > max(0, self.output_cache_size):
+            self._output_cache.popitem(last=False)
+
+    def _render_stamp(self):
+        """Return a hashable value identifying the current contents,
+        camera, and rendering settings of this Scene."""
+        features = tuple(sorted(
+            (name, repr(sorted(config.items())))
+            for (name, config) in self._enabled_features.items()))
+        materials = tuple(_material_key(prim._material) for prim in self._primitives)
+        return (self._content_version, tuple(self.size_pixels.tolist()),
+                tuple(self.rotation.tolist()), tuple(self.translation.tolist()),
+                float(self.zoom), features, materials)
+
+    def _update_geometries(self):
+        """Create fresnel geometries for new primitives and update the
+        geometries of existing primitives, removing those of
+        primitives that are no longer in this Scene."""
+        geometries = {}
+        changed = False
+        for prim in self._primitives:
+            if id(prim) in geometries:
+                continue
+            changed = changed or bool(prim._dirty_attributes) or id(prim) not in self._geometries
+            (_, geometry) = self._geometries.pop(id(prim), (None, None))
+            geometries[id(prim)] = (
+                prim, prim.render_geometry(self._fresnel_scene, geometry))
+
+        for (_, geometry) in self._geometries.values():
+            geometry.remove()
+            changed = True
 
-        self._output = render_function(self._fresnel_scene)
+        self._geometries = geometries
+        if changed:
+            self._content_version += 1
 
     def _ipython_display_(self):
         return self.show()
@@ -8,17 +8,34 @@ from .FresnelPrimitive import FresnelPrimitive
 class SphereUnions(FresnelPrimitive, draw.SphereUnions):
     __doc__ = draw.SphereUnions.__doc__
 
-    def render(self, scene):
+    _UPDATABLE_ATTRIBUTES = frozenset(
+        ['positions', 'orientations', 'colors', 'points', 'radii'])
+
+    def _sphere_arrays(self):
         positions = np.tile(self.positions[:, np.newaxis, :], (1, len(self.points), 1))
         positions += math.quatrot(self.orientations[:, np.newaxis], self.points[np.newaxis])
 
         radii = np.repeat(self.radii[np.newaxis, :], len(self.positions), axis=0)
         colors = np.repeat(self.colors[np.newaxis, :], len(self.positions), axis=0)
 
+        return (positions.reshape((-1, 3)), radii.flatten(),
+                fresnel.color.linear(colors.reshape(-1, 4)))
+
+    def update(self, geometry, names):
+        (positions, radii, colors) = self._sphere_arrays()
+        if len(geometry.position) != len(positions):
+            return False
+        geometry.position[:] = positions
+        geometry.radius[:] = radii
+        geometry.color[:] = colors
+        return True
+
+    def render(self, scene):
+        (positions, radii, colors) = self._sphere_arrays()
         geometry = fresnel.geometry.Sphere(
             scene=scene,
-            position=positions.reshape((-1, 3)),
-            radius=radii.flatten(),
-            color=fresnel.color.linear(colors.reshape(-1, 4)),
+            position=positions,
+            radius=radii,
+            color=colors,
             material=self._material)
         return geometry
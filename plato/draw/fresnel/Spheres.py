@@ -6,6 +6,19 @@ from .FresnelPrimitive import FresnelPrimitive
 class Spheres(FresnelPrimitive, draw.Spheres):
     __doc__ = draw.Spheres.__doc__
 
+    _UPDATABLE_ATTRIBUTES = frozenset(['positions', 'radii', 'colors'])
+
+    def update(self, geometry, names):
+        if len(geometry.position) != len(self.positions):
+            return False
+        if 'positions' in names:
+            geometry.position[:] = self.positions
+        if 'radii' in names:
+            geometry.radius[:] = self.radii
+        if 'colors' in names:
+            geometry.color[:] = fresnel.color.linear(self.colors)
+        return True
+
     def render(self, scene):
         geometry = fresnel.geometry.Sphere(
             scene=scene,
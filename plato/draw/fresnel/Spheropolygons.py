@@ -7,6 +7,21 @@ from .FresnelPrimitive import FresnelPrimitiveSolid
 class Spheropolygons(FresnelPrimitiveSolid, draw.Spheropolygons):
     __doc__ = draw.Spheropolygons.__doc__
 
+    _UPDATABLE_ATTRIBUTES = frozenset(['positions', 'orientations', 'colors', 'outline'])
+
+    def update(self, geometry, names):
+        if len(geometry.position) != len(self.positions):
+            return False
+        if 'positions' in names:
+            geometry.position[:] = self.positions
+        if 'orientations' in names:
+            geometry.angle[:] = rowan.geometry.angle(rowan.normalize(self.orientations))
+        if 'colors' in names:
+            geometry.color[:] = fresnel.color.linear(self.colors)
+        if 'outline' in names:
+            geometry.outline_width = self.outline
+        return True
+
     def render(self, scene):
         geometry = fresnel.geometry.Polygon(
             scene=scene,
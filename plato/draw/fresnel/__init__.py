@@ -13,7 +13,7 @@ with the primitives.
 
 """
 
-from .Scene import Scene
+from .Scene import PathTracerProgress, Scene
 
 from .Arrows2D import Arrows2D
 from .Box import Box
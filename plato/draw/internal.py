@@ -18,6 +18,11 @@ class Shape:
     def __init__(self, **kwargs):
         self._attributes = {}
         self._dirty_attributes = {attr.name for attr in self._ATTRIBUTES}
+        # map attribute names to lists of modified indices for
+        # attributes that have only been partially modified (see
+        # update_subset); dirty attributes not present here have
+        # been modified completely
+        self._dirty_subsets = {}
 
         for attr in self._ATTRIBUTES:
             size_checker = array_size_checkers[attr.dimension]
@@ -70,6 +75,7 @@ class Shape:
         result._attributes = other._attributes
         if share_redraw_state:
             result._dirty_attributes = other._dirty_attributes
+            result._dirty_subsets = other._dirty_subsets
         return result
 
     @classmethod
@@ -88,11 +94,49 @@ class Shape:
                 continue
             setattr(self, key, value)
 
+    def update_subset(self, name, indices, values):
+        """Modify the value of an array attribute for a subset of its entries.
+
+        Unlike setting the attribute directly, only the given entries
+        are marked as modified, so backends that support it (currently
+        vispy) can update only the corresponding parts of their
+        buffers. Values are modified in place, so any shapes sharing
+        data with this one (see :py:meth:`link`) will also see the
+        change.
+
+        :param name: Name of the attribute to modify
+        :param indices: Integer index, array of indices, boolean mask, or slice of the entries to modify
+        :param values: New values for the selected entries
+        """
+        attr = self._ATTRIBUTES_BY_NAME[name]
+        if attr.dimension == 0:
+            raise ValueError(
+                'Can\'t update a subset of scalar attribute {}'.format(name))
+
+        array = self._attributes[name]
+        if attr.per_shape and len(array) == 1 and len(self) > 1:
+            # expand broadcasted values before modifying some of them
+            setattr(self, name, np.repeat(array, len(self), axis=0))
+            array = self._attributes[name]
+        elif not array.flags.writeable:
+            setattr(self, name, array.copy())
+            array = self._attributes[name]
+
+        indices = np.atleast_1d(np.arange(len(array))[indices])
+        array[indices] = np.asarray(values, dtype=attr.dtype)
+
+        if name not in self._dirty_attributes:
+            self._dirty_attributes.add(name)
+            self._dirty_subsets[name] = [indices]
+        elif name in self._dirty_subsets:
+            self._dirty_subsets[name].append(indices)
+
 def attribute_setter(self, value, name, dtype, dimension, default, callback=None):
     size_checker = array_size_checkers[dimension]
     result = size_checker(np.asarray(value, dtype=dtype))
     assert default.ndim == 0 or result.shape[-default.ndim:] == self._ATTRIBUTE_DIMENSIONS[name], 'Invalid shape for property {}: {}'.format(name, result.shape)
     self._dirty_attributes.add(name)
+    self._dirty_subsets.pop(name, None)
     self._attributes[name] = result
     if callback is not None:
         callback(self, value)
@@ -1,12 +1,10 @@
 import numpy as np
-from matplotlib.path import Path
-from matplotlib.patches import PathPatch, Polygon
 
 from ... import math
 from ... import mesh
 from ... import geometry
 from ... import draw
-from .internal import PatchUser
+from .internal import PatchUser, Polygons
 
 class ConvexPolyhedra(draw.ConvexPolyhedra, PatchUser):
     __doc__ = draw.ConvexPolyhedra.__doc__
@@ -15,10 +13,8 @@ class ConvexPolyhedra(draw.ConvexPolyhedra, PatchUser):
                ambient_light=0, directional_light=(-.1, -.25, -1), **kwargs):
         rotation = np.asarray(rotation)
         directional_light = np.atleast_2d(directional_light)
-        collections = []
 
-        (vertices, faces_) = geometry.convexHull(self.vertices)
-        faces = [np.array(face, dtype=np.uint32) for face in faces_]
+        (vertices, faces) = geometry.convexHull(self.vertices)
 
         (positions, orientations, shape_colors) = mesh.unfoldProperties([
             self.positions, self.orientations, self.colors])
@@ -32,53 +28,61 @@ class ConvexPolyhedra(draw.ConvexPolyhedra, PatchUser):
 
         outline = self.outline
 
-        colors = []
-        patches = []
-        for (vertices, color) in zip(rotated_vertices, shape_colors):
-            for face in faces:
-                face_verts = vertices[face]
-                z = np.min(face_verts[:, 2])
-                normal = np.cross(face_verts[1] - face_verts[0],
-                                  face_verts[-1] - face_verts[0])
-                normal /= np.linalg.norm(normal)
-
-                # cull back faces
-                if normal[2] < 0:
-                    continue
-
-                if outline > 0:
-                    outline_verts = face_verts
-                    face_verts = geometry.insetPolygon(face_verts, outline)
-                    outline_verts[:, :2] += np.sign(outline_verts[:, :2])*aa_pixel_size
-
-                face_verts[:, :2] += np.sign(face_verts[:, :2])*aa_pixel_size
-
-                light = ambient_light
-                for light_direction in directional_light:
-                    light += max(0, -np.dot(light_direction, normal))
-
-                lit_color = color.copy()
-                lit_color[:3] *= light
-
-                patches.append(Polygon(face_verts[:, :2], closed=True, zorder=z))
-                colors.append(lit_color)
-
-                if outline > 0:
-                    commands = ([Path.MOVETO] +
-                                (face_verts.shape[0] - 1)*[Path.LINETO] +
-                                [Path.CLOSEPOLY])
-                    commands = 2*commands
-
-                    # reverse the inner vertices order to make an open
-                    # polygon. Duplicate the first vertex of each polygon to
-                    # close the shapes.
-                    outline_vertices = np.concatenate(
-                        [outline_verts, outline_verts[:1],
-                         face_verts[::-1], face_verts[:1]], axis=0)[:, :2]
-
-                    outline_path = Path(outline_vertices, commands)
-                    patches.append(PathPatch(outline_path, zorder=z))
-                    colors.append(lit_color*(0, 0, 0, 1))
-
-        colors = np.clip(colors, 0, 1)
-        return [(patches, colors)]
+        result = []
+        # process all (particle, face) pairs for faces with the same
+        # number of vertices at once
+        face_degrees = np.array([len(face) for face in faces])
+        for degree in np.unique(face_degrees):
+            degree_faces = np.array(
+                [face for face in faces if len(face) == degree], dtype=np.intp)
+            # (particles, faces, degree, 3)
+            face_verts = rotated_vertices[:, degree_faces]
+            normals = np.cross(face_verts[:, :, 1] - face_verts[:, :, 0],
+                               face_verts[:, :, -1] - face_verts[:, :, 0])
+            normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+
+            # cull back faces
+            visible = np.logical_not(normals[..., 2] < 0)
+            face_verts = face_verts[visible]
+            normals = normals[visible]
+            zorders = np.min(face_verts[..., 2], axis=-1)
+
+            light_dots = -np.dot(normals, directional_light.T)
+            light = ambient_light + np.sum(
+                np.where(light_dots > 0, light_dots, 0), axis=-1)
+
+            lit_colors = np.repeat(
+                shape_colors[:, np.newaxis], len(degree_faces), axis=1)[visible]
+            lit_colors[:, :3] *= light[:, np.newaxis]
+
+            if outline > 0:
+                outline_verts = face_verts.copy()
+                face_verts = geometry.insetPolygons(
+                    face_verts.reshape((-1, 3)), face_verts.shape[0]*[degree],
+                    outline).reshape(face_verts.shape)
+                outline_verts[..., :2] += np.sign(outline_verts[..., :2])*aa_pixel_size
+
+            face_verts[..., :2] += np.sign(face_verts[..., :2])*aa_pixel_size
+
+            if outline > 0:
+                # outlines are drawn as polygons that trace the outer
+                # edge and then, in reverse order, the inner (inset)
+                # edge, joined by a zero-width bridge that cancels out
+                inner_verts = np.roll(face_verts[:, ::-1], 1, axis=1)
+                outline_verts = np.concatenate(
+                    [outline_verts, outline_verts[:, :1],
+                     inner_verts, inner_verts[:, :1]], axis=1)
+
+                # draw each outline immediately after its face
+                vertices = [verts for pair in zip(face_verts[..., :2], outline_verts[..., :2])
+                            for verts in pair]
+                zorders = np.repeat(zorders, 2)
+                lit_colors = np.repeat(lit_colors, 2, axis=0)
+                lit_colors[1::2] *= (0, 0, 0, 1)
+            else:
+                vertices = face_verts[..., :2]
+
+            result.append(Polygons(
+                zorders=zorders, colors=lit_colors, vertices=vertices))
+
+        return result
@@ -1,11 +1,10 @@
 from matplotlib.path import Path
-from matplotlib.patches import PathPatch
 import numpy as np
 
 from ... import math
 from ... import mesh
 from ... import draw
-from .internal import PatchUser
+from .internal import PatchUser, Paths
 
 class Lines(draw.Lines, PatchUser):
     __doc__ = draw.Lines.__doc__
@@ -33,7 +32,6 @@ class Lines(draw.Lines, PatchUser):
         # angle of the vector perpendicular to each line segment
         angles = np.arctan2(perps[:, 1], perps[:, 0]) + np.pi
         angles[np.logical_not(np.isfinite(angles))] = 0
-        angles_degrees = angles*180/np.pi
 
         # construct rectangles with offset vertices
         rectangles = [start_points[:, :2] - perps, end_points[:, :2] - perps,
@@ -45,39 +43,33 @@ class Lines(draw.Lines, PatchUser):
                 elt += np.sign(elt)*aa_pixel_size
                 elt += midpoints[:, :2]
 
-        patches = []
-        for (z, angle, width, start, end, a, b, c, d) in zip(
-                zs, angles_degrees, widths[:, 0], start_points[:, :2],
-                end_points[:, :2], *rectangles):
-            arc = Path.arc(angle, angle + 180)
-            commands = [Path.MOVETO, Path.LINETO]
-            vertices = [a, b]
-
-            for (pos, cmd) in arc.iter_segments():
-                cmd = cmd if cmd != Path.MOVETO else Path.LINETO
-                if cmd == Path.STOP:
-                    continue
-                pos = pos.reshape((-1, 2))*width*0.5
-                commands.extend(pos.shape[0]*[cmd])
-                vertices.extend(end[np.newaxis] + pos)
-
-            commands.append(Path.LINETO)
-            vertices.append(c)
-
-            commands.append(Path.LINETO)
-            vertices.append(d)
-            for (pos, cmd) in arc.iter_segments():
-                cmd = cmd if cmd != Path.MOVETO else Path.LINETO
-                if cmd == Path.STOP:
-                    continue
-                pos = pos.reshape((-1, 2))*width*0.5
-                commands.extend(pos.shape[0]*[cmd])
-                vertices.extend(start[np.newaxis] - pos)
-
-            commands.append(Path.CLOSEPOLY)
-            vertices.append(a)
-
-            path = Path(vertices, commands)
-            patches.append(PathPatch(path, zorder=z))
-
-        return [(patches, colors)]
+        # unit half-circle cap, rotated to each segment's orientation
+        (arc_vertices, arc_codes) = _unit_arc()
+        cosines, sines = np.cos(angles), np.sin(angles)
+        rotations = np.array([[cosines, -sines], [sines, cosines]]).transpose((2, 0, 1))
+        arcs = np.einsum('nij,vj->nvi', rotations, arc_vertices)
+        arcs *= 0.5*widths[:, np.newaxis]
+
+        (a, b, c, d) = [elt[:, np.newaxis] for elt in rectangles]
+        vertices = np.concatenate([
+            a, b, end_points[:, np.newaxis, :2] + arcs,
+            c, d, start_points[:, np.newaxis, :2] - arcs, a], axis=1)
+        codes = np.concatenate([
+            [Path.MOVETO, Path.LINETO], arc_codes,
+            [Path.LINETO, Path.LINETO], arc_codes, [Path.CLOSEPOLY]]).astype(Path.code_type)
+
+        paths = [Path(verts, codes) for verts in vertices]
+        return [Paths(zorders=zs, colors=colors, paths=paths)]
+
+def _unit_arc():
+    """Return the vertices and path codes of a unit half-circle arc (as
+    a continuation of an existing path)."""
+    vertices, codes = [], []
+    for (pos, cmd) in Path.arc(0, 180).iter_segments():
+        cmd = cmd if cmd != Path.MOVETO else Path.LINETO
+        if cmd == Path.STOP:
+            continue
+        pos = pos.reshape((-1, 2))
+        codes.extend(pos.shape[0]*[cmd])
+        vertices.extend(pos)
+    return np.array(vertices), np.array(codes, dtype=Path.code_type)
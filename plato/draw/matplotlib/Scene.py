@@ -1,10 +1,10 @@
 import contextlib
 
 import matplotlib.pyplot as pp
-from matplotlib.collections import PatchCollection
 import numpy as np
 
 from ... import draw
+from .internal import render_sorted_items
 
 @contextlib.contextmanager
 def manage_matplotlib_interactive():
@@ -75,22 +75,7 @@ class Scene(draw.Scene):
         return (figure, axes)
 
     def _render_patches(self, patches, axes):
-        if not patches:
-            return
-
-        all_patches = []
-        all_colors = []
-        for (p, c) in patches:
-            all_patches.extend(p)
-            all_colors.append(c)
-
-        all_colors = np.concatenate(all_colors, axis=0)
-
-        sort_indices = np.argsort([patch.zorder for patch in all_patches])
-        collection = PatchCollection([all_patches[i] for i in sort_indices])
-        collection.set_facecolor(all_colors[sort_indices])
-        axes.add_collection(collection)
-
+        render_sorted_items(patches, axes)
         patches.clear()
 
     def show(self, figure=None, axes=None):
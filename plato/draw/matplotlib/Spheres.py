@@ -1,13 +1,12 @@
 import itertools
 
-from matplotlib.patches import Circle
 import numpy as np
 
 from ... import math
 from ... import draw
 from ... import mesh
 from ...draw import internal
-from .internal import PatchUser
+from .internal import Circles, PatchUser
 
 @internal.ShapeDecorator
 class Spheres(draw.Spheres, PatchUser):
@@ -21,9 +20,6 @@ class Spheres(draw.Spheres, PatchUser):
 
     def _render_patches(self, axes, aa_pixel_size=0, rotation=(1, 0, 0, 0),
                ambient_light=0, directional_light=(-.1, -.25, -1), **kwargs):
-        result = []
-        colors = []
-
         rotation = np.asarray(rotation)
         directional_light = np.atleast_2d(directional_light)[0]
         light_magnitude = np.linalg.norm(directional_light)
@@ -34,30 +30,22 @@ class Spheres(draw.Spheres, PatchUser):
 
         rotated_positions = math.quatrot(rotation[np.newaxis], positions)
 
-        patches = []
-        for level_fraction in np.linspace(1, 0, self.light_levels + 1, endpoint=False):
-            # base values for radius=1
-            offset = -light_normal*level_fraction
-
-            these_colors = shape_colors.copy()
-            light_level = level_fraction*(1 - np.abs(light_normal[2])) + (1 - level_fraction)*1
-            these_colors[:, :3] *= ambient_light + light_level*light_magnitude
-            these_colors.clip(0, 1, these_colors)
-            colors.append(these_colors)
-
-            for (position, (radius,), color, index) in zip(
-                    rotated_positions, radii, these_colors, itertools.count()):
-                zorder = (position[2] - offset[2]*radius)
-                patch = Circle(position[:2] + (offset[:2] + light_normal[:2])*radius,
-                               radius*level_fraction, zorder=zorder,
-                               color=color)
-
-                # TODO fix clipping
-                # if level_fraction < 1:
-                #     patch.set_clip_path(patches[index])
-
-                patches.append(patch)
-
-        result.append((patches, np.concatenate(colors, axis=0)))
-
-        return result
+        # draw a circle for each (light level, particle) pair, with
+        # brighter levels being smaller and shifted toward the light
+        level_fractions = np.linspace(
+            1, 0, self.light_levels + 1, endpoint=False)[:, np.newaxis]
+        # base values for radius=1
+        offsets = -light_normal[np.newaxis, :]*level_fractions
+
+        light_levels = level_fractions*(1 - np.abs(light_normal[2])) + (1 - level_fractions)*1
+        colors = np.repeat(shape_colors[np.newaxis], len(level_fractions), axis=0)
+        colors[:, :, :3] *= ambient_light + light_levels[:, :, np.newaxis]*light_magnitude
+
+        zorders = rotated_positions[np.newaxis, :, 2] - offsets[:, np.newaxis, 2]*radii[:, 0]
+        centers = (rotated_positions[np.newaxis, :, :2] +
+                   (offsets[:, np.newaxis, :2] + light_normal[:2])*radii[np.newaxis])
+        circle_radii = radii[np.newaxis, :, 0]*level_fractions
+
+        return [Circles(
+            zorders=zorders.reshape(-1), colors=colors.reshape((-1, 4)),
+            offsets=centers.reshape((-1, 2)), radii=circle_radii.reshape(-1))]
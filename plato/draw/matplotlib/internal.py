@@ -1,19 +1,134 @@
-from matplotlib.collections import PatchCollection
+from collections import OrderedDict
+
+from matplotlib.collections import (
+    EllipseCollection, PatchCollection, PathCollection, PolyCollection)
 import numpy as np
 
-class PatchUser:
-    def render(self, axes, **kwargs):
-        patches = self._render_patches(axes, **kwargs)
+def _take(values, indices):
+    if isinstance(values, np.ndarray):
+        return values[indices]
+    return [values[i] for i in indices]
+
+def _concatenate(values):
+    if (all(isinstance(v, np.ndarray) for v in values) and
+            len({v.shape[1:] for v in values}) == 1):
+        return np.concatenate(values, axis=0)
+    return [elt for v in values for elt in v]
+
+class DepthSortedItems:
+    """Base class for a group of 2D items (for example, circles or
+    polygons) that are drawn with a common type of matplotlib
+    collection. Each item has a z-order (for sorting items relative
+    to those of other primitives) and an RGBA color.
+
+    Subclasses list their per-item quantities, which are either numpy
+    arrays or lists, in `_FIELDS` and implement `make_collection`.
+    """
+    _FIELDS = ('zorders', 'colors')
+
+    def __init__(self, **kwargs):
+        for name in self._FIELDS:
+            setattr(self, name, kwargs[name])
+        self.zorders = np.asarray(self.zorders, dtype=np.float64).reshape(-1)
+        self.colors = np.clip(self.colors, 0, 1)
+
+    def __len__(self):
+        return len(self.zorders)
+
+    @classmethod
+    def concatenate(cls, groups):
+        """Merge several groups of items of this type into one."""
+        return cls(**{name: _concatenate([getattr(group, name) for group in groups])
+                      for name in cls._FIELDS})
+
+    def take(self, indices):
+        """Select a subset of the items in this group."""
+        return type(self)(**{name: _take(getattr(self, name), indices)
+                             for name in self._FIELDS})
+
+    def make_collection(self, axes):
+        raise NotImplementedError()
+
+class Circles(DepthSortedItems):
+    """Circles, specified by their centers and radii in data units."""
+    _FIELDS = DepthSortedItems._FIELDS + ('offsets', 'radii')
+
+    def make_collection(self, axes):
+        widths = 2*np.asarray(self.radii).reshape(-1)
+        collection = EllipseCollection(
+            widths, widths, np.zeros_like(widths), units='xy',
+            offsets=self.offsets, offset_transform=axes.transData)
+        collection.set_facecolor(self.colors)
+        return collection
 
-        all_patches = []
-        all_colors = []
-        for (p, c) in patches:
-            all_patches.extend(p)
-            all_colors.append(c)
+class Polygons(DepthSortedItems):
+    """Simple polygons, given as an (N, V, 2) array or a list of (V_i, 2)
+    arrays of vertices."""
+    _FIELDS = DepthSortedItems._FIELDS + ('vertices',)
 
-        all_colors = np.concatenate(all_colors, axis=0)
+    def make_collection(self, axes):
+        collection = PolyCollection(self.vertices, closed=True)
+        collection.set_facecolor(self.colors)
+        return collection
 
-        collection = PatchCollection(all_patches)
-        collection.set_facecolor(all_colors)
+class Paths(DepthSortedItems):
+    """Arbitrary matplotlib Path objects (possibly with holes)."""
+    _FIELDS = DepthSortedItems._FIELDS + ('paths',)
 
+    def make_collection(self, axes):
+        collection = PathCollection(self.paths)
+        collection.set_facecolor(self.colors)
+        return collection
+
+class Patches(DepthSortedItems):
+    """Matplotlib patch objects."""
+    _FIELDS = DepthSortedItems._FIELDS + ('patches',)
+
+    def make_collection(self, axes):
+        collection = PatchCollection(self.patches)
+        collection.set_facecolor(self.colors)
+        return collection
+
+def render_sorted_items(items, axes):
+    """Add depth-sorted groups of items to a set of axes.
+
+    Items from all groups are sorted together by z-order. Consecutive
+    runs of items of the same type are then drawn using a single
+    collection each, so that large numbers of items of a single type
+    are drawn efficiently.
+
+    :param items: list of DepthSortedItems objects or (patches, colors) tuples
+    :param axes: matplotlib Axes object to draw within
+    """
+    groups = OrderedDict()
+    for item in items:
+        if isinstance(item, tuple):
+            (patches, colors) = item
+            item = Patches(
+                patches=list(patches), colors=colors,
+                zorders=[patch.zorder for patch in patches])
+        if len(item):
+            groups.setdefault(type(item), []).append(item)
+
+    if not groups:
+        return
+
+    groups = [cls.concatenate(group) for (cls, group) in groups.items()]
+    zorders = np.concatenate([group.zorders for group in groups])
+    group_indices = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+    local_indices = np.concatenate([np.arange(len(group)) for group in groups])
+
+    # stable, so that items with equal z-orders are drawn in the order given
+    sort_indices = np.argsort(zorders, kind='stable')
+    group_indices = group_indices[sort_indices]
+    local_indices = local_indices[sort_indices]
+
+    breaks = np.flatnonzero(np.diff(group_indices)) + 1
+    for (start, end) in zip([0] + breaks.tolist(), breaks.tolist() + [len(sort_indices)]):
+        group = groups[group_indices[start]]
+        collection = group.take(local_indices[start:end]).make_collection(axes)
         axes.add_collection(collection)
+
+class PatchUser:
+    def render(self, axes, **kwargs):
+        render_sorted_items(self._render_patches(axes, **kwargs), axes)
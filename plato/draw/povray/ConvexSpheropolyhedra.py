@@ -4,6 +4,7 @@ from ... import draw
 from ... import mesh as pmesh
 from ... import geometry
 from ... import math as pmath
+from .internal import format_rows, rotation_matrices
 
 class ConvexSpheropolyhedra(draw.ConvexSpheropolyhedra):
     __doc__ = draw.ConvexSpheropolyhedra.__doc__
@@ -13,49 +14,31 @@ class ConvexSpheropolyhedra(draw.ConvexSpheropolyhedra):
         rotation = np.asarray(rotation)
         (positions, orientations, colors) = pmesh.unfoldProperties([
             self.positions, self.orientations, self.colors])
-        quat_magnitude = np.linalg.norm(orientations, axis=-1, keepdims=True)
 
-        lines = []
         decomp = geometry.convexDecomposition(self.vertices)
+        edges = np.array(sorted(decomp.edges), dtype=np.uint32).reshape((-1, 2))
         mesh = pmesh.convexSpheropolyhedronMesh(self.vertices, self.radius)
-        meshStr = 'mesh2 {{vertex_vectors {{{} {}}} ' \
-                  'face_indices {{{} {}}}}}'.format(
-                      len(mesh.image), ' '.join('<{},{},{}>'.format(*v)
-                                                for v in mesh.image),
-                      len(mesh.indices), ' '.join('<{},{},{}>'.format(*v)
-                                                  for v in mesh.indices))
-        edges = ['cylinder {{<{0[0]},{0[1]},{0[2]}> <{1[0]},{1[1]},{1[2]}> '
-                 '{2}}}'.format(
-                     decomp.vertices[i], decomp.vertices[j],
-                     np.asscalar(self.radius))
-                 for (i, j) in decomp.edges]
-        spheres = ['sphere {{<{0[0]},{0[1]},{0[2]}> {1}}}'.format(
-            v, np.asscalar(self.radius)) for v in decomp.vertices]
         shapeName = 'spoly{}'.format(name_suffix)
-        shapedef = '#declare {} = union {{\n{}\n}}'.format(
-            shapeName, '\n'.join(elt for elt in [meshStr] + edges + spheres))
-        lines.append(shapedef)
-
-        qs = pmath.quatquat(rotation[np.newaxis, :], orientations/quat_magnitude)
-        rotmat = np.array([[1 - 2*qs[:, 2]**2 - 2*qs[:, 3]**2,
-                            2*(qs[:, 1]*qs[:, 2] - qs[:, 3]*qs[:, 0]),
-                            2*(qs[:, 1]*qs[:, 3] + qs[:, 2]*qs[:, 0])],
-                           [2*(qs[:, 1]*qs[:, 2] + qs[:, 3]*qs[:, 0]),
-                            1 - 2*qs[:, 1]**2 - 2*qs[:, 3]**2,
-                            2*(qs[:, 2]*qs[:, 3] - qs[:, 1]*qs[:, 0])],
-                           [2*(qs[:, 1]*qs[:, 3] - qs[:, 2]*qs[:, 0]),
-                            2*(qs[:, 1]*qs[:, 0] + qs[:, 2]*qs[:, 3]),
-                            1 - 2*qs[:, 1]**2 - 2*qs[:, 2]**2]])
-        rotmat = rotmat.transpose([2, 1, 0]).reshape((-1, 9))
-        rotmat[:] *= quat_magnitude[:, 0, np.newaxis]**2
 
+        yield '#declare {} = union {{'.format(shapeName)
+        yield 'mesh2 {{vertex_vectors {{{}'.format(len(mesh.image))
+        yield from format_rows('<%g,%g,%g>', mesh.image)
+        yield '}} face_indices {{{}'.format(len(mesh.indices))
+        yield from format_rows('<%d,%d,%d>', mesh.indices)
+        yield '}}'
+        yield from format_rows(
+            'cylinder {<%g,%g,%g> <%g,%g,%g> %g}',
+            decomp.vertices[edges[:, 0]], decomp.vertices[edges[:, 1]],
+            self.radius)
+        yield from format_rows(
+            'sphere {<%g,%g,%g> %g}', decomp.vertices, self.radius)
+        yield '}'
+
+        rotmat = rotation_matrices(rotation, orientations)
         positions = pmath.quatrot(rotation[np.newaxis, :], positions)
         positions += translation
 
-        for (p, m, c) in zip(positions, rotmat, colors[:, :3]):
-            args = [shapeName] + m.tolist() + p.tolist() + c.tolist()
-            lines.append('object {{{} matrix <{},{},{},{},{},{},{},{},{},'
-                         '{},{},{}> pigment {{color <{},{},{}>}}}}'.format(
-                             *args))
-
-        return lines
+        yield from format_rows(
+            'object {' + shapeName + ' matrix <%g,%g,%g,%g,%g,%g,%g,%g,%g,'
+            '%g,%g,%g> pigment {color <%g,%g,%g>}}',
+            rotmat, positions, colors[:, :3])
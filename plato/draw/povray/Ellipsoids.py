@@ -2,6 +2,7 @@ import numpy as np
 import rowan
 
 from ... import draw, mesh
+from .internal import format_rows
 
 class Ellipsoids(draw.Ellipsoids):
     __doc__ = draw.Ellipsoids.__doc__
@@ -15,14 +16,9 @@ class Ellipsoids(draw.Ellipsoids):
             rotation, rowan.normalize(orientations))
         rotations = np.degrees(rowan.to_euler(orientations))
 
-        lines = []
-        for (pos, rot, col, alpha) in zip(
-                positions, rotations, colors[:, :3], 1 - colors[:, 3]):
-            lines.append('sphere {{ '
-                         '0, 1 scale<{a}, {b}, {c}> '
-                         'rotate <{rot[2]}, {rot[1]}, {rot[0]}> '
-                         'translate <{pos[0]}, {pos[1]}, {pos[2]}> '
-                         'pigment {{ color <{col[0]}, {col[1]}, {col[2]}> transmit {alpha} }} '
-                         '}}'.format(a=self.a, b=self.b, c=self.c,
-                                     pos=pos, rot=rot, col=col, alpha=alpha))
-        return lines
+        yield from format_rows(
+            'sphere { 0, 1 scale<%g, %g, %g> rotate <%g, %g, %g> '
+            'translate <%g, %g, %g> '
+            'pigment { color <%g, %g, %g> transmit %g } }',
+            self.a, self.b, self.c, rotations[:, ::-1], positions,
+            colors[:, :3], 1 - colors[:, 3])
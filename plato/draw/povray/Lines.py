@@ -5,6 +5,7 @@ import numpy as np
 from ... import draw
 from ..internal import ShapeDecorator, ShapeAttribute
 from ... import math as pmath
+from .internal import format_rows
 
 @ShapeDecorator
 class Lines(draw.Lines):
@@ -18,28 +19,20 @@ class Lines(draw.Lines):
     def render(self, rotation=(1, 0, 0, 0), translation=(0, 0, 0), **kwargs):
         rotation = np.asarray(rotation)
 
-        lines = []
-
         start_points = pmath.quatrot(rotation[np.newaxis, :], self.start_points)
         start_points += translation
         end_points = pmath.quatrot(rotation[np.newaxis, :], self.end_points)
         end_points += translation
 
-        for (start, end, width, color, a) in zip(start_points,
-                                                 end_points,
-                                                 self.widths/2,
-                                                 self.colors[:, :3],
-                                                 1 - self.colors[:, 3]):
-            if self.cap_mode:
-                args = start.tolist() + [width] + end.tolist() + [width] + \
-                       color.tolist() + [a]
-                lines.append('sphere_sweep {{linear_spline 2, <{},{},{}>, {}, '
-                             '<{},{},{}>, {} pigment {{color <{},{},{}> transmit '
-                             '{}}} }}'.format(*args))
-            else:
-                args = start.tolist() + end.tolist() + [width] + \
-                       color.tolist() + [a]
-                lines.append('cylinder {{<{},{},{}> <{},{},{}> {} pigment {{color '
-                             '<{},{},{}> transmit {}}} }}'.format(*args))
-
-        return lines
+        if self.cap_mode:
+            yield from format_rows(
+                'sphere_sweep {linear_spline 2, <%g,%g,%g>, %g, <%g,%g,%g>, %g '
+                'pigment {color <%g,%g,%g> transmit %g} }',
+                start_points, self.widths/2, end_points, self.widths/2,
+                self.colors[:, :3], 1 - self.colors[:, 3])
+        else:
+            yield from format_rows(
+                'cylinder {<%g,%g,%g> <%g,%g,%g> %g pigment {color '
+                '<%g,%g,%g> transmit %g} }',
+                start_points, end_points, self.widths/2,
+                self.colors[:, :3], 1 - self.colors[:, 3])
@@ -3,72 +3,103 @@ import numpy as np
 from ... import draw
 from ... import math as pmath
 from ... import mesh
+from .internal import format_rows, rotation_matrices
 
 class Mesh(draw.Mesh):
-    __doc__ = draw.Mesh.__doc__
+    __doc__ = (draw.Mesh.__doc__ or '') + """
+
+    In povray, the mesh is declared once and instanced for each
+    replica when *shape_color_fraction* is 0 or 1. For fractions
+    between 0 and 1, the blended vertex colors must be baked into the
+    mesh, so a separate copy of the mesh is declared for each unique
+    shape color; with distinct colors for every replica, the size of
+    the povray source then grows with the number of replicas times
+    the size of the mesh.
+    """
 
     def render(self, rotation=(1, 0, 0, 0), name_suffix='',
                translation=(0, 0, 0), **kwargs):
-        lines = []
+        rotation = np.asarray(rotation)
 
         verts = self.vertices
         vertex_colors = self.colors
         if len(vertex_colors) < len(verts):
             vertex_colors = np.tile(
                 vertex_colors, (int(np.ceil(len(verts)/len(vertex_colors))), 1))
+        vertex_colors = vertex_colors[:len(verts)]
 
         (positions, orientations, shape_colors) = mesh.unfoldProperties([
             self.positions, self.orientations, self.shape_colors])
         if len(shape_colors) < len(positions):
             shape_colors = np.tile(
                 shape_colors, (int(np.ceil(len(positions)/len(shape_colors))), 1))
+        shape_colors = shape_colors[:len(positions)]
 
-        blended_colors = (self.shape_color_fraction*shape_colors[:, np.newaxis, :] +
-                          (1 - self.shape_color_fraction)*vertex_colors[np.newaxis, :, :])
-
-        vertex_vectors = ' '.join('<{},{},{}>'.format(*v) for v in verts)
-        face_indices = ', '.join('<{},{},{}>,{},{},{}'.format(*(2*list(v)))
-                                 for v in self.indices)
+        rotmats = rotation_matrices(rotation, orientations)
+        positions = pmath.quatrot(rotation[np.newaxis, :], positions)
+        positions += translation
 
         vertex_normals = mesh.computeNormals_(verts, self.indices)
-        vertex_normal_text = ' '.join('<{},{},{}>'.format(*v) for v in vertex_normals)
+        shape_color_fraction = float(self.shape_color_fraction)
+        baseName = 'mesh{}'.format(name_suffix)
+        objectTemplate = ('object {{{}'
+                          ' matrix <%g,%g,%g,%g,%g,%g,%g,%g,%g,%g,%g,%g>{}}}')
 
-        quat_magnitude = np.linalg.norm(orientations, axis=-1, keepdims=True)
-        qs = pmath.quatquat(rotation[np.newaxis, :], orientations/quat_magnitude)
-        rotmats = np.array([[1 - 2*qs[:, 2]**2 - 2*qs[:, 3]**2,
-                            2*(qs[:, 1]*qs[:, 2] - qs[:, 3]*qs[:, 0]),
-                            2*(qs[:, 1]*qs[:, 3] + qs[:, 2]*qs[:, 0])],
-                           [2*(qs[:, 1]*qs[:, 2] + qs[:, 3]*qs[:, 0]),
-                            1 - 2*qs[:, 1]**2 - 2*qs[:, 3]**2,
-                            2*(qs[:, 2]*qs[:, 3] - qs[:, 1]*qs[:, 0])],
-                           [2*(qs[:, 1]*qs[:, 3] - qs[:, 2]*qs[:, 0]),
-                            2*(qs[:, 1]*qs[:, 0] + qs[:, 2]*qs[:, 3]),
-                            1 - 2*qs[:, 1]**2 - 2*qs[:, 2]**2]])
-        rotmats = rotmats.transpose([2, 1, 0]).reshape((-1, 9))
-        rotmats *= quat_magnitude[:, 0, np.newaxis]**2
+        if shape_color_fraction >= 1:
+            # colors come entirely from the shape: declare a single
+            # untextured mesh and give each replica a texture
+            yield from self._declare_mesh(baseName, verts, vertex_normals)
+            yield from format_rows(
+                objectTemplate.format(
+                    baseName, ' texture {pigment {color rgb <%g,%g,%g> transmit %g}}'),
+                rotmats, positions, shape_colors[:, :3], 1 - shape_colors[:, 3])
+            return
 
-        positions = pmath.quatrot(rotation[np.newaxis, :], positions)
-        positions += translation
+        # otherwise, declare one textured mesh for each unique shape color
+        if shape_color_fraction > 0:
+            (unique_colors, color_indices) = np.unique(
+                shape_colors, axis=0, return_inverse=True)
+            color_indices = color_indices.reshape(-1)
+        else:
+            unique_colors = np.zeros((1, 4), dtype=np.float32)
+            color_indices = np.zeros(len(positions), dtype=np.intp)
+
+        for (i, shape_color) in enumerate(unique_colors):
+            filt = color_indices == i
+            if not np.any(filt):
+                continue
 
-        for (pos, rotmat, color) in zip(positions, rotmats, blended_colors):
+            shapeName = '{}_{}'.format(baseName, i)
+            blended_colors = (shape_color_fraction*shape_color[np.newaxis, :] +
+                              (1 - shape_color_fraction)*vertex_colors)
+            yield from self._declare_mesh(
+                shapeName, verts, vertex_normals, blended_colors)
+            yield from format_rows(
+                objectTemplate.format(shapeName, ''), rotmats[filt], positions[filt])
 
-            texture_list = ' '.join('texture{{pigment{{rgb <{},{},{}> '
-                                    'transmit {}}}}}'.format(
-                                        *(list(v[:3])+[1 - v[3]]))
-                                    for v in color)
-            print(len(verts), len(color))
-            meshStr = 'mesh2 {{vertex_vectors {{{} {}}} ' \
-                      'normal_vectors {{{}, {}}} ' \
-                      'texture_list {{{} {}}} ' \
-                      'face_indices {{{} {}}} ' \
-                      'matrix <{},{},{},{},{},{},{},{},{},' \
-                      '{},{},{}>}}'.format(
-                          len(verts), vertex_vectors,
-                          len(verts), vertex_normal_text,
-                          len(verts), texture_list,
-                          len(self.indices), face_indices,
-                          *(rotmat.tolist() + pos.tolist())
-                      )
-            lines.append(meshStr)
+    def _declare_mesh(self, name, vertices, normals, vertex_colors=None):
+        yield '#declare {} = mesh2 {{vertex_vectors {{{},'.format(name, len(vertices))
+        yield from format_rows('<%g,%g,%g>', vertices)
+        yield '}} normal_vectors {{{},'.format(len(vertices))
+        yield from format_rows('<%g,%g,%g>', normals)
 
-        return lines
+        if vertex_colors is None:
+            yield '}} face_indices {{{},'.format(len(self.indices))
+            yield from format_rows('<%d,%d,%d>', self.indices)
+        else:
+            yield '}} texture_list {{{},'.format(len(vertex_colors))
+            yield from format_rows(
+                'texture{pigment{rgb <%g,%g,%g> transmit %g}}',
+                vertex_colors[:, :3], 1 - vertex_colors[:, 3])
+            # texture indices are given after each triangle, so
+            # separate triangles with commas
+            yield '}} face_indices {{{},'.format(len(self.indices))
+            chunk = None
+            for next_chunk in format_rows(
+                    '<%d,%d,%d>,%d,%d,%d,', np.tile(self.indices, (1, 2))):
+                if chunk is not None:
+                    yield chunk
+                chunk = next_chunk
+            if chunk is not None:
+                yield chunk[:-1]
+        yield '}}'
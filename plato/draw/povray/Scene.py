@@ -1,13 +1,37 @@
+from collections import namedtuple
+import concurrent.futures
+import logging
 import multiprocessing
 import os
 import subprocess
 import tempfile
+import time
 
 import numpy as np
 
 from ... import draw
 from ... import math
 from ... import __version__
+from .internal import tile_regions
+
+logger = logging.getLogger(__name__)
+
+PovrayTile = namedtuple('PovrayTile', ['start_row', 'end_row', 'start_column',
+                                       'end_column', 'seconds'])
+
+def _render_tile(command, region, output):
+    (start_row, end_row, start_column, end_column) = region
+    command = command + [
+        '+O{}'.format(output), '+SR{}'.format(start_row), '+ER{}'.format(end_row),
+        '+SC{}'.format(start_column), '+EC{}'.format(end_column)]
+
+    start = time.perf_counter()
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    if result.returncode:
+        raise RuntimeError('povray failed to render tile {}:\n{}'.format(
+            region, result.stderr))
+    return PovrayTile(*region, time.perf_counter() - start)
 
 class Scene(draw.Scene):
     __doc__ = (draw.Scene.__doc__ or '') + """
@@ -18,33 +42,50 @@ class Scene(draw.Scene):
     * *directional_light*: Add directional lights. The given value indicates the magnitude*direction normal vector.
     * *multithreading*: Enable multithreaded rendering. The given value indicates the number of threads to use.
     * *transparent_background*: Render with a transparent background when calling save() or show()
+    * *tiled_rendering*: Split the image into regions that are rendered by separate povray processes in parallel, then stitched together. The given value indicates the number of processes to run at once (default: the number of CPUs). Takes optional 'tiles' (number of regions, default: 4 per process) and 'mode' ('rows' or 'rectangles') arguments. Requires pillow. The region and rendering time of each tile from the most recent tiled save() are stored as a list of :py:class:`PovrayTile` objects in the scene's *tile_timings* attribute.
     """
 
+    tile_timings = None
+
     def render(self):
         """Render all the shapes in this scene.
 
         :returns: povray string representing the entire scene
         """
-        lines = []
+        return '\n'.join(self.render_chunks())
 
+    def render_chunks(self):
+        """Render all the shapes in this scene, piece by piece.
+
+        :returns: generator of strings which, joined by newlines, form the povray source of the entire scene
+        """
         size_pixels = np.round(self.size_pixels).astype(np.int32)
-        lines.append('// povray +W{} +H{}'.format(*size_pixels))
-        lines.append('// generated by plato v{}'.format(__version__))
+        yield '// povray +W{} +H{}'.format(*size_pixels)
+        yield '// generated by plato v{}'.format(__version__)
 
         background = (1, 1, 1)
-        lines.append('background {{color rgb <{},{},{}>}}'.format(*background))
+        yield 'background {{color rgb <{},{},{}>}}'.format(*background)
 
-        lines.extend(self.render_camera())
+        yield from self.render_camera()
 
-        lines.extend(self.render_lights())
+        yield from self.render_lights()
 
-        shapeIndex = 0
         for i, prim in enumerate(self._primitives):
-            lines.extend(prim.render(
+            yield from prim.render(
                 translation=self.translation, rotation=self.rotation,
-                name_suffix=i))
+                name_suffix=i)
+
+    def write(self, target):
+        """Write the povray source of this scene to a file-like object.
 
-        return '\n'.join(lines)
+        The scene is written incrementally as each primitive is
+        rendered, rather than being assembled into a single string.
+
+        :param target: file-like object (opened in text mode) to write into
+        """
+        for chunk in self.render_chunks():
+            target.write(chunk)
+            target.write('\n')
 
     def render_camera(self):
         (width, height) = self.size/self.zoom
@@ -139,7 +180,6 @@ class Scene(draw.Scene):
         :param filename: target filename to save the result into. If filename ends in .pov, save the povray source, otherwise call povray to render the image
         """
         (width, height) = self.size_pixels
-        povstring = self.render()
 
         if 'antialiasing' in self.enabled_features:
             antialiasing = self.get_feature_config('antialiasing').get('value', .3)
@@ -160,37 +200,130 @@ class Scene(draw.Scene):
 
         if filename.endswith('.pov'):
             with open(filename, 'w') as f:
-                f.write(povstring)
+                self.write(f)
+            return 0
+        elif 'tiled_rendering' in self.enabled_features:
+            config = self.get_feature_config('tiled_rendering')
+            processes = config.get('value', multiprocessing.cpu_count())
+            self.tile_timings = self.call_povray_tiled(
+                self.render_chunks(), filename, width, height, antialiasing,
+                transparent_background, processes,
+                config.get('tiles', None), config.get('mode', 'rows'))
             return 0
         else:
             return self.call_povray(
-                povstring, filename, width, height, antialiasing, threads,
-                transparent_background)
+                self.render_chunks(), filename, width, height, antialiasing,
+                threads, transparent_background)
 
     @staticmethod
-    def call_povray(contents, filename, width, height, antialiasing=None,
-                    threads=None, transparent_background=False):
-        povfile = filename + '.pov'
+    def _write_povfile(contents, povfile):
         with open(povfile, 'w') as f:
-            f.write(contents)
+            if isinstance(contents, str):
+                f.write(contents)
+            else:
+                for chunk in contents:
+                    f.write(chunk)
+                    f.write('\n')
 
-        command = ['povray', '+I{}'.format(povfile), '+O{}'.format(filename),
+    @staticmethod
+    def _povray_command(povfile, width, height, antialiasing=None,
+                        transparent_background=False):
+        command = ['povray', '+I{}'.format(povfile),
                    '+W{}'.format(width), '+H{}'.format(height)]
 
         if antialiasing:
             command.append('+A{}'.format(antialiasing))
 
-        if threads:
-            command.append('+WT{}'.format(threads))
-
         if transparent_background:
             command.append('+UA')
 
+        return command
+
+    @classmethod
+    def call_povray(cls, contents, filename, width, height, antialiasing=None,
+                    threads=None, transparent_background=False):
+        """Render povray source into an image file.
+
+        :param contents: povray source, either as a single string or an iterable of strings that will be written separated by newlines
+        """
+        povfile = filename + '.pov'
+        cls._write_povfile(contents, povfile)
+
+        command = cls._povray_command(
+            povfile, width, height, antialiasing, transparent_background)
+        command.append('+O{}'.format(filename))
+
+        if threads:
+            command.append('+WT{}'.format(threads))
+
         try:
             return subprocess.check_call(command)
         finally:
             os.remove(povfile)
 
+    @classmethod
+    def call_povray_tiled(cls, contents, filename, width, height,
+                          antialiasing=None, transparent_background=False,
+                          processes=None, tiles=None, mode='rows'):
+        """Render povray source into an image file by rendering regions
+        of the image in separate, concurrently-running povray
+        processes and stitching the results together.
+
+        :param contents: povray source, either as a single string or an iterable of strings that will be written separated by newlines
+        :param processes: Number of povray processes to run at once (default: the number of CPUs)
+        :param tiles: Number of regions to split the image into (default: 4 per process)
+        :param mode: 'rows' or 'rectangles'; see :py:func:`tile_regions`
+        :returns: list of PovrayTile objects indicating the region and rendering time of each tile
+        """
+        try:
+            import PIL.Image
+        except ImportError:
+            raise RuntimeError('Could not import PIL. PIL (pillow) is required for tiled povray rendering.')
+
+        processes = processes or multiprocessing.cpu_count()
+        tiles = tiles or 4*processes
+        (width, height) = (int(width), int(height))
+        regions = tile_regions(width, height, tiles, mode)
+
+        povfile = filename + '.pov'
+        cls._write_povfile(contents, povfile)
+
+        command = cls._povray_command(
+            povfile, width, height, antialiasing, transparent_background)
+        command.extend(['+FN', '+WT1', '-D'])
+
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                outputs = [os.path.join(tempdir, 'tile_{}.png'.format(i))
+                           for i in range(len(regions))]
+
+                # each tile is rendered by its own povray process, so
+                # threads suffice to keep the pool of processes busy
+                with concurrent.futures.ThreadPoolExecutor(processes) as pool:
+                    timings = list(pool.map(
+                        _render_tile, len(regions)*[command], regions, outputs))
+
+                image_mode = 'RGBA' if transparent_background else 'RGB'
+                image = PIL.Image.new(image_mode, (width, height))
+                for (region, output) in zip(regions, outputs):
+                    (start_row, end_row, start_column, end_column) = region
+                    box = (start_column - 1, start_row - 1, end_column, end_row)
+                    with PIL.Image.open(output) as tile:
+                        tile = tile.convert(image_mode)
+                        # depending on the povray version, partial
+                        # renders are either cropped or full-size
+                        if tile.size == (width, height):
+                            tile = tile.crop(box)
+                        image.paste(tile, box[:2])
+                image.save(filename)
+        finally:
+            os.remove(povfile)
+
+        for tile in timings:
+            logger.info('Rendered rows {}-{}, columns {}-{} in {:.2f}s'.format(*tile))
+
+        return timings
+
     def _repr_png_(self):
         with tempfile.NamedTemporaryFile(suffix='.png') as temp:
             self.save(temp.name)
@@ -3,29 +3,32 @@ import numpy as np
 from ... import draw
 from ... import math
 from ... import mesh
+from .internal import format_rows, rotation_matrices
 
 class SphereUnions(draw.SphereUnions):
     __doc__ = draw.SphereUnions.__doc__
 
-    def render(self, rotation=(1, 0, 0, 0), translation=(0, 0, 0), **kwargs):
+    def render(self, rotation=(1, 0, 0, 0), name_suffix='',
+               translation=(0, 0, 0), **kwargs):
         rotation = np.asarray(rotation)
 
         (positions, orientations) = mesh.unfoldProperties([
             self.positions, self.orientations])
 
-        positions = np.tile(positions[:, np.newaxis, :], (1, len(self.points), 1))
-        positions += math.quatrot(orientations[:, np.newaxis], self.points[np.newaxis])
+        rotmat = rotation_matrices(rotation, orientations)
+        positions = math.quatrot(rotation[np.newaxis, :], positions)
         positions += translation
 
-        radii = np.repeat(self.radii[np.newaxis, :], len(positions),axis=0)
-        colors = np.repeat(self.colors[np.newaxis, :], len(positions), axis=0)
+        (points, radii, colors) = mesh.unfoldProperties([
+            self.points, self.radii, self.colors])
 
-        colors_reshaped = colors.reshape(-1,4)
+        shapeName = 'sphereunion{}'.format(name_suffix)
+        yield '#declare {} = union {{'.format(shapeName)
+        yield from format_rows(
+            'sphere {<%g,%g,%g> %g pigment {color <%g,%g,%g> transmit %g}}',
+            points, radii, colors[:, :3], 1 - colors[:, 3])
+        yield '}'
 
-        lines = []
-        for (p, r, c, a) in zip(positions.reshape((-1, 3)), radii.flatten(), colors_reshaped[:, :3],
-                                1 - colors_reshaped[:, 3]):
-            args = p.tolist() + [r] + c.tolist() + [a]
-            lines.append('sphere {{<{},{},{}> {} pigment {{color '
-                         '<{},{},{}> transmit {}}}}}'.format(*args))
-        return lines
+        yield from format_rows(
+            'object {' + shapeName + ' matrix <%g,%g,%g,%g,%g,%g,%g,%g,%g,'
+            '%g,%g,%g>}', rotmat, positions)
@@ -3,6 +3,7 @@ import numpy as np
 from ... import draw
 from ... import math
 from ... import mesh
+from .internal import format_rows
 
 class Spheres(draw.Spheres):
     __doc__ = draw.Spheres.__doc__
@@ -15,10 +16,6 @@ class Spheres(draw.Spheres):
         positions = math.quatrot(rotation[np.newaxis, :], positions)
         positions += translation
 
-        lines = []
-        for (p, r, c, a) in zip(positions, radii[:, 0], colors[:, :3],
-                                1 - colors[:, 3]):
-            args = p.tolist() + [r] + c.tolist() + [a]
-            lines.append('sphere {{<{},{},{}> {} pigment {{color '
-                         '<{},{},{}> transmit {}}}}}'.format(*args))
-        return lines
+        yield from format_rows(
+            'sphere {<%g,%g,%g> %g pigment {color <%g,%g,%g> transmit %g}}',
+            positions, radii[:, 0], colors[:, :3], 1 - colors[:, 3])
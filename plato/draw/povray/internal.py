@@ -0,0 +1,75 @@
+import numpy as np
+
+from ... import math as pmath
+
+ROWS_PER_CHUNK = 4096
+
+def format_rows(template, *columns, precision=8, rows_per_chunk=ROWS_PER_CHUNK):
+    """Format per-particle quantities into povray source, in bulk.
+
+    Each row of the given columns is formatted using the %-style
+    `template`; `%g` conversions are printed with the given number of
+    significant digits. Rather than returning a single (potentially
+    very large) string, this generator yields strings of up to
+    `rows_per_chunk` newline-separated rows at a time.
+
+    :param template: %-style format string for a single row
+    :param columns: Arrays (or scalars, which are broadcast) of shape (N,) or (N, k) whose rows are concatenated to fill in the template
+    :param precision: Number of significant digits to print for `%g` conversions
+    :param rows_per_chunk: Number of rows to format into each yielded string
+    """
+    template = template.replace('%g', '%.{}g'.format(precision))
+
+    columns = [np.asarray(column, dtype=np.float64) for column in columns]
+    N = max([len(column) for column in columns if column.ndim] or [1])
+    columns = [column.reshape((len(column), -1)) if column.ndim else column.reshape((1, 1))
+               for column in columns]
+    table = np.concatenate(
+        [np.broadcast_to(column, (N, column.shape[1])) for column in columns], axis=1)
+
+    for start in range(0, N, rows_per_chunk):
+        chunk = table[start:start + rows_per_chunk]
+        yield '\n'.join(len(chunk)*[template]) % tuple(chunk.ravel().tolist())
+
+def rotation_matrices(rotation, orientations):
+    """Compute the flattened, row-major rotation matrices (scaled by
+    the squared quaternion magnitude) for a set of orientation
+    quaternions after a global rotation."""
+    quat_magnitude = np.linalg.norm(orientations, axis=-1, keepdims=True)
+    qs = pmath.quatquat(np.asarray(rotation)[np.newaxis, :], orientations/quat_magnitude)
+    rotmat = np.array([[1 - 2*qs[:, 2]**2 - 2*qs[:, 3]**2,
+                        2*(qs[:, 1]*qs[:, 2] - qs[:, 3]*qs[:, 0]),
+                        2*(qs[:, 1]*qs[:, 3] + qs[:, 2]*qs[:, 0])],
+                       [2*(qs[:, 1]*qs[:, 2] + qs[:, 3]*qs[:, 0]),
+                        1 - 2*qs[:, 1]**2 - 2*qs[:, 3]**2,
+                        2*(qs[:, 2]*qs[:, 3] - qs[:, 1]*qs[:, 0])],
+                       [2*(qs[:, 1]*qs[:, 3] - qs[:, 2]*qs[:, 0]),
+                        2*(qs[:, 1]*qs[:, 0] + qs[:, 2]*qs[:, 3]),
+                        1 - 2*qs[:, 1]**2 - 2*qs[:, 2]**2]])
+    rotmat = rotmat.transpose([2, 1, 0]).reshape((-1, 9))
+    rotmat *= quat_magnitude[:, 0, np.newaxis]**2
+    return rotmat
+
+def tile_regions(width, height, tiles, mode='rows'):
+    """Split an image into regions to be rendered independently.
+
+    :param width: Width of the image, in pixels
+    :param height: Height of the image, in pixels
+    :param tiles: Approximate number of regions to generate
+    :param mode: 'rows' to split the image into horizontal bands, or 'rectangles' to split it into a grid of (roughly square) rectangles
+    :returns: list of (start_row, end_row, start_column, end_column) tuples, using povray's 1-based, inclusive pixel indexing
+    """
+    if mode == 'rows':
+        (nx, ny) = (1, tiles)
+    elif mode == 'rectangles':
+        nx = max(1, int(round(np.sqrt(tiles*width/height))))
+        ny = max(1, int(np.ceil(tiles/nx)))
+    else:
+        raise ValueError('Unknown tile mode: {}'.format(mode))
+
+    rows = np.linspace(0, height, min(ny, height) + 1).astype(np.int64)
+    columns = np.linspace(0, width, min(nx, width) + 1).astype(np.int64)
+
+    return [(int(r0) + 1, int(r1), int(c0) + 1, int(c1))
+            for (r0, r1) in zip(rows[:-1], rows[1:])
+            for (c0, c1) in zip(columns[:-1], columns[1:])]
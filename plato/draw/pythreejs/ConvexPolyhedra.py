@@ -2,24 +2,24 @@ import numpy as np
 
 from ... import draw
 from ... import mesh
-from .internal import ThreeJSPrimitive
+from .internal import InstancedThreeJSPrimitive
 
-class ConvexPolyhedra(draw.ConvexPolyhedra, ThreeJSPrimitive):
+class ConvexPolyhedra(draw.ConvexPolyhedra, InstancedThreeJSPrimitive):
     __doc__ = draw.ConvexPolyhedra.__doc__
 
-    def update_arrays(self):
-        if not self._dirty_attributes:
-            return
+    _MESH_ATTRIBUTES = frozenset(['vertices'])
 
+    def _get_mesh(self):
         vertices = self.vertices
         if len(vertices) < 4:
             vertices = np.concatenate([vertices,
                 [(-1, -1, -1), (1, 1, -1), (1, -1, 1), (-1, 1, 1)]], axis=0)
 
         poly_mesh = mesh.convexPolyhedronMesh(vertices)
-        (positions, orientations, colors, images, normals) = mesh.unfoldProperties(
-            [self.positions, self.orientations, self.colors],
-            [poly_mesh.image, poly_mesh.normal])
+        return (poly_mesh.image, poly_mesh.normal, poly_mesh.indices)
 
-        self._finalize_primitive_arrays(
-            positions, orientations, colors, images, normals, poly_mesh.indices)
+    def _get_instances(self):
+        (positions, orientations, colors) = mesh.unfoldProperties(
+            [self.positions, self.orientations, self.colors])
+        scales = np.ones_like(positions)
+        return (positions, orientations, scales, colors)
@@ -2,24 +2,24 @@ import numpy as np
 
 from ... import draw
 from ... import mesh
-from .internal import ThreeJSPrimitive
+from .internal import InstancedThreeJSPrimitive
 
-class ConvexSpheropolyhedra(draw.ConvexSpheropolyhedra, ThreeJSPrimitive):
+class ConvexSpheropolyhedra(draw.ConvexSpheropolyhedra, InstancedThreeJSPrimitive):
     __doc__ = draw.ConvexSpheropolyhedra.__doc__
 
-    def update_arrays(self):
-        if not self._dirty_attributes:
-            return
+    _MESH_ATTRIBUTES = frozenset(['vertices', 'radius'])
 
+    def _get_mesh(self):
         vertices = self.vertices
         if len(vertices) < 4:
             vertices = np.concatenate([vertices,
                 [(-1, -1, -1), (1, 1, -1), (1, -1, 1), (-1, 1, 1)]], axis=0)
 
         gen_mesh = mesh.convexSpheropolyhedronMesh(vertices, self.radius)
-        (positions, orientations, colors, images, normals) = mesh.unfoldProperties(
-            [self.positions, self.orientations, self.colors],
-            [gen_mesh.image, gen_mesh.normal])
+        return (gen_mesh.image, gen_mesh.normal, gen_mesh.indices)
 
-        self._finalize_primitive_arrays(
-            positions, orientations, colors, images, normals, gen_mesh.indices)
+    def _get_instances(self):
+        (positions, orientations, colors) = mesh.unfoldProperties(
+            [self.positions, self.orientations, self.colors])
+        scales = np.ones_like(positions)
+        return (positions, orientations, scales, colors)
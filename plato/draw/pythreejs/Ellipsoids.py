@@ -5,11 +5,11 @@ import numpy as np
 from ... import draw
 from ...geometry import fibonacciPositions
 from ... import mesh
-from .internal import ThreeJSPrimitive
+from .internal import InstancedThreeJSPrimitive
 from ..internal import ShapeAttribute, ShapeDecorator
 
 @ShapeDecorator
-class Ellipsoids(draw.Ellipsoids, ThreeJSPrimitive):
+class Ellipsoids(draw.Ellipsoids, InstancedThreeJSPrimitive):
     __doc__ = draw.Ellipsoids.__doc__
 
     _ATTRIBUTES = draw.Ellipsoids._ATTRIBUTES + list(
@@ -18,20 +18,19 @@ class Ellipsoids(draw.Ellipsoids, ThreeJSPrimitive):
          'Number of vertices used to render ellipsoid')
     ]))
 
-    def update_arrays(self):
-        if not self._dirty_attributes:
-            return
+    _MESH_ATTRIBUTES = frozenset(['vertex_count', 'a', 'b', 'c'])
 
+    def _get_mesh(self):
         vertices = fibonacciPositions(self.vertex_count, self.a, self.b, self.c)
 
         (vertices, indices) = mesh.convexHull(vertices)
-        (positions, orientations, colors, images) = mesh.unfoldProperties(
-            [self.positions, self.orientations, self.colors],
-            [vertices])
-
-        # these are incorrect normals, but this looks to be the most
-        # straightforward way to have the normals get serialized
-        normals = images.copy()
-
-        self._finalize_primitive_arrays(
-            positions, orientations, colors, images, normals, indices)
+        # the normal of an ellipsoid is the gradient of x^2/a^2 + ...
+        normals = vertices/np.array([self.a, self.b, self.c], dtype=np.float32)**2
+        normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+        return (vertices, normals, indices)
+
+    def _get_instances(self):
+        (positions, orientations, colors) = mesh.unfoldProperties(
+            [self.positions, self.orientations, self.colors])
+        scales = np.ones_like(positions)
+        return (positions, orientations, scales, colors)
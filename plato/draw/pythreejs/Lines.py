@@ -3,21 +3,19 @@ import rowan
 
 from ... import draw
 from ... import geometry
-from .internal import ThreeJSPrimitive
+from ... import mesh
+from .internal import InstancedThreeJSPrimitive
 
-class Lines(draw.Lines, ThreeJSPrimitive):
+class Lines(draw.Lines, InstancedThreeJSPrimitive):
     __doc__ = draw.Lines.__doc__
 
-    def update_arrays(self):
-        if not self._dirty_attributes:
-            return
-
+    def _get_mesh(self):
         # TODO make number of facets a configurable attribute
         thetas = np.linspace(0, 2*np.pi, 10, endpoint=False)
 
-        # to begin, pretend we are constructing a unit circle in the
-        # xy plane; multiply xy by each line radius and z by each line
-        # length before rotating and translating appropriately
+        # unit-radius, unit-length cylinder along the z axis, to be
+        # scaled by each line's width and length and then rotated and
+        # translated appropriately
         image = np.array([np.cos(thetas), np.sin(thetas), np.zeros_like(thetas)]).T
         image = np.concatenate([image, image + (0, 0, 1)], axis=0)
 
@@ -38,8 +36,16 @@ class Lines(draw.Lines, ThreeJSPrimitive):
             len(thetas) + cap_indices
         ], axis=0)
 
+        normals = image*(1, 1, 0)
+
+        return (image, normals, image_indices)
+
+    def _get_instances(self):
+        (start_points, end_points, widths, colors) = mesh.unfoldProperties(
+            [self.start_points, self.end_points, self.widths, self.colors])
+
         # normal vectors for each Line segment
-        normals = self.end_points - self.start_points
+        normals = end_points - start_points
         lengths = np.linalg.norm(normals, axis=-1, keepdims=True)
         normals /= lengths
 
@@ -48,23 +54,7 @@ class Lines(draw.Lines, ThreeJSPrimitive):
         quats = rowan.vector_vector_rotation(
             np.array([0, 0, 1.])[np.newaxis, :], normals)
 
-        # Nlines*Nvertices*3
-        vertices = np.tile(image[np.newaxis], (len(quats), 1, 1))
-        # set xy according to line width
-        vertices[:, :, :2] *= self.widths[:, np.newaxis, np.newaxis]*0.5
-        # set z according to line length
-        vertices[:, :, 2] *= lengths[:, np.newaxis, 0]
-        # rotate appropriately
-        vertices = rowan.rotate(quats[:, np.newaxis], vertices)
-        # translation by start_points will happen in _finalize_primitive_arrays
-
-        # these are incorrect normals, but this looks to be the most
-        # straightforward way to have the normals get serialized
-        normals = vertices - self.start_points[:, np.newaxis]
-
-        colors = np.tile(self.colors[:, np.newaxis], (1, len(image), 1))
-
-        positions = np.tile(self.start_points[:, np.newaxis], (1, len(image), 1))
+        # set xy according to line width and z according to line length
+        scales = np.concatenate([0.5*widths, 0.5*widths, lengths], axis=-1)
 
-        self._finalize_primitive_arrays(
-            positions, None, colors, vertices, normals, image_indices)
+        return (start_points, quats, scales, colors)
@@ -5,11 +5,11 @@ import numpy as np
 from ... import draw
 from ...geometry import fibonacciPositions
 from ... import mesh
-from .internal import ThreeJSPrimitive
+from .internal import InstancedThreeJSPrimitive
 from ..internal import ShapeAttribute, ShapeDecorator
 
 @ShapeDecorator
-class Spheres(draw.Spheres, ThreeJSPrimitive):
+class Spheres(draw.Spheres, InstancedThreeJSPrimitive):
     __doc__ = draw.Spheres.__doc__
 
     _ATTRIBUTES = draw.Spheres._ATTRIBUTES + list(
@@ -18,22 +18,19 @@ class Spheres(draw.Spheres, ThreeJSPrimitive):
          'Number of vertices used to render sphere')
     ]))
 
-    def update_arrays(self):
-        if not self._dirty_attributes:
-            return
+    _MESH_ATTRIBUTES = frozenset(['vertex_count'])
 
+    def _get_mesh(self):
+        # unit-diameter sphere, to be scaled by each diameter
         vertices = fibonacciPositions(self.vertex_count)
 
         (vertices, indices) = mesh.convexHull(vertices)
-        (positions, colors, diameters, images) = mesh.unfoldProperties(
-            [self.positions, self.colors, self.diameters],
-            [vertices])
-
-        images *= diameters
-
-        # these are incorrect normals, but this looks to be the most
-        # straightforward way to have the normals get serialized
-        normals = images.copy()
-
-        self._finalize_primitive_arrays(
-            positions, None, colors, images, normals, indices)
+        normals = vertices/np.linalg.norm(vertices, axis=-1, keepdims=True)
+        return (vertices, normals, indices)
+
+    def _get_instances(self):
+        (positions, colors, diameters) = mesh.unfoldProperties(
+            [self.positions, self.colors, self.diameters])
+        orientations = np.tile([1, 0, 0, 0], (len(positions), 1))
+        scales = np.tile(diameters, (1, 3))
+        return (positions, orientations, scales, colors)
@@ -3,10 +3,17 @@ The `pythreejs <https://github.com/jupyter-widgets/pythreejs>`_
 backend renders scenes using `three.js <https://threejs.org/>`_
 and is ideal for viewing scenes within Jupyter notebooks.
 
+Primitives consisting of many copies of a single shape (such as
+`ConvexPolyhedra`, `Spheres`, and `Lines`) are drawn using instanced
+rendering: the shape mesh is only sent to the browser once, and
+subsequent updates only send per-shape positions, orientations,
+sizes, and colors.
+
 .. note::
 
-    To enable translucency in the pythreejs backend, a primitive must have the
-    same value of alpha (less than 1) for all colors.
+    To enable translucency for `Mesh` primitives in the pythreejs
+    backend, a primitive must have the same value of alpha (less than
+    1) for all colors.
 
 """
 
@@ -3,12 +3,57 @@ import pythreejs
 
 from ... import math
 
+INSTANCED_VERTEX_SHADER = """
+attribute vec3 instance_offset;
+attribute vec4 instance_orientation;
+attribute vec3 instance_scale;
+attribute vec4 instance_color;
+
+varying vec3 v_normal;
+varying vec4 v_color;
+
+// rotate a vector by a (w, x, y, z) unit quaternion
+vec3 rotate(vec4 q, vec3 v)
+{
+    return v + 2.0*cross(q.yzw, cross(q.yzw, v) + q.x*v);
+}
+
+void main()
+{
+    vec3 vertex = rotate(instance_orientation, instance_scale*position) + instance_offset;
+    v_normal = normalize(normalMatrix*rotate(instance_orientation, normal/instance_scale));
+    v_color = instance_color;
+    gl_Position = projectionMatrix*modelViewMatrix*vec4(vertex, 1.0);
+}
+"""
+
+INSTANCED_FRAGMENT_SHADER = """
+#include <common>
+#include <lights_pars_begin>
+
+varying vec3 v_normal;
+varying vec4 v_color;
+
+void main()
+{
+    vec3 normal = normalize(v_normal);
+    vec3 light = ambientLightColor;
+#if NUM_DIR_LIGHTS > 0
+    for(int i = 0; i < NUM_DIR_LIGHTS; i++)
+        light += directionalLights[i].color*max(dot(normal, directionalLights[i].direction), 0.0);
+#endif
+    gl_FragColor = vec4(v_color.rgb*light, v_color.a);
+}
+"""
+
 class ThreeJSPrimitive:
     @property
     def threejs_primitive(self):
         try:
             return self._threejs_primitive
         except AttributeError:
+            # last array sent for each attribute; see _sync_attributes
+            self._threejs_arrays = {}
             self._threejs_primitive = self._make_threejs_primitive()
             self.update_arrays()
         return self._threejs_primitive
@@ -24,6 +69,53 @@ class ThreeJSPrimitive:
     def update_arrays(self):
         pass
 
+    def _sync_attributes(self, arrays, instanced=False):
+        """Sync a set of arrays to the attributes of this primitive's geometry.
+
+        Attribute objects persist between updates. Each array is only
+        sent if it differs from the last array sent for its attribute,
+        and a new attribute object is only created if the shape or
+        type of the array changes.
+
+        :param arrays: dictionary of attribute name -> array
+        :param instanced: if True, create per-instance (rather than per-vertex) attributes
+        :returns: set of names of the attributes that were sent
+        """
+        geometry = self.threejs_primitive.geometry
+        sent_arrays = self._threejs_arrays
+        attributes = dict(geometry.attributes)
+
+        result = set()
+        for (name, array) in arrays.items():
+            previous = sent_arrays.get(name)
+            if previous is not None and name in attributes and \
+                    previous.shape == array.shape and previous.dtype == array.dtype:
+                if np.array_equal(previous, array):
+                    continue
+                # replacing the array of an existing attribute only
+                # sends the new array
+                if instanced:
+                    attributes[name].data.array = array
+                else:
+                    attributes[name].array = array
+            elif instanced:
+                # pythreejs InstancedBufferAttribute objects do not
+                # support multi-component items, but interleaved buffers do
+                buffer = pythreejs.InstancedInterleavedBuffer(array, meshPerAttribute=1)
+                attributes[name] = pythreejs.InterleavedBufferAttribute(
+                    buffer, itemSize=array.shape[-1])
+            else:
+                attributes[name] = pythreejs.BufferAttribute(array)
+
+            sent_arrays[name] = array.copy()
+            result.add(name)
+
+        if any(attributes[name] is not geometry.attributes.get(name)
+               for name in result):
+            geometry.attributes = attributes
+
+        return result
+
     def _finalize_primitive_arrays(self, positions, orientations, colors,
                                    images, normals, indices):
         if orientations is not None:
@@ -47,15 +139,82 @@ class ThreeJSPrimitive:
             prim.material.depthWrite = False
             prim.material.opacity = colors[0, 3]
 
-        attribs = dict(position=pythreejs.BufferAttribute(images.astype(np.float32).reshape((-1, 3))),
-                       color=pythreejs.BufferAttribute(colors),
-                       index=pythreejs.BufferAttribute(indices))
+        arrays = dict(position=images.astype(np.float32).reshape((-1, 3)),
+                      color=colors, index=indices)
         if normals is not None:
-            attribs['normal'] = pythreejs.BufferAttribute(normals.astype(np.float32).reshape((-1, 3)))
+            arrays['normal'] = normals.astype(np.float32).reshape((-1, 3))
+
+        sent = self._sync_attributes(arrays)
+
+        if sent & {'position', 'index', 'normal'}:
+            prim.geometry.exec_three_obj_method('computeVertexNormals')
+            prim.geometry.exec_three_obj_method('normalizeNormals')
+
+        self._dirty_attributes.clear()
+
+class InstancedThreeJSPrimitive(ThreeJSPrimitive):
+    """Base class for primitives that consist of many rotated, scaled,
+    translated, and colored copies of a single mesh.
+
+    The mesh is sent to the browser once (and again only when one of
+    the attributes in `_MESH_ATTRIBUTES` changes) and drawn using
+    instanced rendering; other updates only send the per-instance
+    arrays.
+    """
+
+    # names of attributes that change the instanced mesh
+    _MESH_ATTRIBUTES = frozenset()
+
+    def _make_threejs_primitive(self):
+        geometry = pythreejs.InstancedBufferGeometry()
+        # three.js fills in the light uniforms for materials with lights enabled
+        uniforms = {name: dict(uniform) for (name, uniform)
+                    in pythreejs.UniformsLib['lights'].items()}
+        material = pythreejs.ShaderMaterial(
+            vertexShader=INSTANCED_VERTEX_SHADER,
+            fragmentShader=INSTANCED_FRAGMENT_SHADER,
+            uniforms=uniforms, lights=True)
+        result = pythreejs.Mesh(geometry, material)
+
+        return result
+
+    def _get_mesh(self):
+        """Return the (vertices, normals, indices) of the mesh to instance."""
+        raise NotImplementedError()
+
+    def _get_instances(self):
+        """Return the (positions, orientations, scales, colors) of each instance."""
+        raise NotImplementedError()
+
+    def update_arrays(self):
+        if not self._dirty_attributes:
+            return
+
+        prim = self.threejs_primitive
+
+        if 'position' not in prim.geometry.attributes or \
+                self._dirty_attributes & self._MESH_ATTRIBUTES:
+            (vertices, normals, indices) = self._get_mesh()
+            self._sync_attributes(dict(
+                position=vertices.astype(np.float32).reshape((-1, 3)),
+                normal=normals.astype(np.float32).reshape((-1, 3)),
+                index=np.asarray(indices, dtype=np.uint32).reshape((-1,))))
+
+        (positions, orientations, scales, colors) = self._get_instances()
+        orientations = orientations/np.linalg.norm(orientations, axis=-1, keepdims=True)
+
+        instance_arrays = dict(
+            instance_offset=positions, instance_orientation=orientations,
+            instance_scale=scales, instance_color=colors)
+        instance_arrays = {name: np.ascontiguousarray(array, dtype=np.float32)
+                           for (name, array) in instance_arrays.items()}
 
-        prim.geometry.attributes = attribs
+        # alpha is applied per-instance by the shader
+        transparent = bool(np.any(colors[:, 3] < 1))
+        prim.material.transparent = transparent
+        prim.material.depthWrite = not transparent
 
-        prim.geometry.exec_three_obj_method('computeVertexNormals')
-        prim.geometry.exec_three_obj_method('normalizeNormals')
+        prim.geometry.maxInstancedCount = len(positions)
+        self._sync_attributes(instance_arrays, instanced=True)
 
         self._dirty_attributes.clear()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from ... import draw
+from ... import geometry
+from ... import math
+from ... import mesh
+from .internal import directional_lighting, segment_distances, triangle_fragments
+
+class ConvexPolyhedra(draw.ConvexPolyhedra):
+    __doc__ = draw.ConvexPolyhedra.__doc__
+
+    def render(self, framebuffer, rotation=(1, 0, 0, 0), ambient_light=0,
+               directional_light=(-.1, -.25, -1), **kwargs):
+        rotation = np.asarray(rotation)
+
+        (vertices, faces) = geometry.convexHull(self.vertices)
+        vertices = np.asarray(vertices, dtype=np.float64)
+        triangle_indices = np.array(
+            list(geometry.fanTriangleIndices(faces)), dtype=np.intp).reshape((-1, 3))
+        triangle_faces = np.repeat(
+            np.arange(len(faces)), [len(face) - 2 for face in faces])
+
+        (positions, orientations, colors) = mesh.unfoldProperties([
+            self.positions, self.orientations, self.colors])
+
+        rotated_positions = math.quatrot(rotation[np.newaxis], positions)
+        vertex_orientations = math.quatquat(rotation[np.newaxis], orientations)
+        rotated_vertices = math.quatrot(
+            vertex_orientations[:, np.newaxis], vertices[np.newaxis, :])
+        rotated_vertices += rotated_positions[:, np.newaxis]
+
+        # (particles, faces, 3) normal of each face
+        face_starts = np.array([face[0] for face in faces])
+        face_seconds = np.array([face[1] for face in faces])
+        face_lasts = np.array([face[-1] for face in faces])
+        normals = np.cross(
+            rotated_vertices[:, face_seconds] - rotated_vertices[:, face_starts],
+            rotated_vertices[:, face_lasts] - rotated_vertices[:, face_starts])
+        normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+        light = directional_lighting(normals, ambient_light, directional_light)
+
+        # cull back faces
+        (particles, triangles) = np.nonzero(
+            np.logical_not(normals[:, triangle_faces, 2] < 0))
+        triangle_vertices = rotated_vertices[
+            particles[:, np.newaxis], triangle_indices[triangles]]
+        projected = framebuffer.project(triangle_vertices)
+
+        # edges of each face, in the local coordinates of the shape
+        # (padded by repeating the last edge of each face)
+        outline = self.outline
+        max_degree = max(len(face) for face in faces)
+        edge_indices = np.array([
+            list(face) + (max_degree - len(face))*[face[-1]] for face in faces])
+        edge_ends = np.array([
+            list(np.roll(face, -1)) + (max_degree - len(face))*[face[0]] for face in faces])
+        edge_starts = vertices[edge_indices]
+        edge_deltas = vertices[edge_ends] - edge_starts
+
+        for (indices, weights, pixels) in triangle_fragments(framebuffer, projected):
+            depths = np.sum(weights*triangle_vertices[indices, :, 2], axis=-1)
+
+            visible = framebuffer.resolve(pixels, depths, indices)
+            indices = indices[visible]
+            fragment_faces = triangle_faces[triangles[indices]]
+
+            fragment_colors = colors[particles[indices]]
+            fragment_colors[:, :3] *= light[particles[indices], fragment_faces, np.newaxis]
+            if outline > 0:
+                points = np.einsum('nv,nvi->ni', weights[visible],
+                                   vertices[triangle_indices[triangles[indices]]])
+                distances = segment_distances(
+                    points, fragment_faces, edge_starts, edge_deltas)
+                fragment_colors[distances < outline, :3] = 0
+            framebuffer.colors[pixels[visible]] = fragment_colors
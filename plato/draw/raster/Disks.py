@@ -0,0 +1,27 @@
+import numpy as np
+
+from ... import draw
+from ... import mesh
+from .internal import disk_fragments
+
+class Disks(draw.Disks):
+    __doc__ = draw.Disks.__doc__
+
+    def render(self, framebuffer, **kwargs):
+        (positions, radii, colors) = mesh.unfoldProperties([
+            self.positions, self.radii, self.colors])
+        radii = radii[:, 0]
+
+        outline = self.outline
+        centers = framebuffer.project(positions)
+
+        for (indices, dx, dy, pixels) in disk_fragments(
+                framebuffer, centers, radii*framebuffer.scale):
+            visible = framebuffer.resolve(pixels, np.zeros(len(pixels)), indices)
+            indices = indices[visible]
+
+            fragment_colors = colors[indices]
+            if outline > 0:
+                distances = np.sqrt(dx[visible]**2 + dy[visible]**2)*radii[indices]
+                fragment_colors[distances > radii[indices] - outline, :3] = 0
+            framebuffer.colors[pixels[visible]] = fragment_colors
@@ -0,0 +1,27 @@
+import numpy as np
+
+from ... import draw
+from ... import math
+from ... import mesh
+from .internal import capsule_fragments
+
+class Lines(draw.Lines):
+    __doc__ = draw.Lines.__doc__
+
+    def render(self, framebuffer, rotation=(1, 0, 0, 0), **kwargs):
+        rotation = np.asarray(rotation)
+
+        (start_points, end_points, widths, colors) = mesh.unfoldProperties([
+            self.start_points, self.end_points, self.widths, self.colors])
+        radii = 0.5*widths[:, 0]
+
+        start_points = math.quatrot(rotation[np.newaxis], start_points)
+        end_points = math.quatrot(rotation[np.newaxis], end_points)
+
+        for (indices, t, distances, pixels) in capsule_fragments(
+                framebuffer, framebuffer.project(start_points),
+                framebuffer.project(end_points), radii*framebuffer.scale):
+            depths = (1 - t)*start_points[indices, 2] + t*end_points[indices, 2]
+
+            visible = framebuffer.resolve(pixels, depths, indices)
+            framebuffer.colors[pixels[visible]] = colors[indices[visible]]
@@ -0,0 +1,44 @@
+import numpy as np
+
+from ... import draw
+from ... import geometry
+from ... import mesh
+from .internal import segment_distances, triangle_fragments
+
+class Polygons(draw.Polygons):
+    __doc__ = draw.Polygons.__doc__
+
+    def render(self, framebuffer, **kwargs):
+        (positions, orientations, colors) = mesh.unfoldProperties([
+            self.positions, self.orientations, self.colors])
+        angles = 2*np.arctan2(orientations[:, 3], orientations[:, 0])
+        scale_factors = np.linalg.norm(orientations, axis=-1)**2
+
+        vertices = np.asarray(self.vertices, dtype=np.float64)
+        triangle_indices = geometry.Polygon(vertices).triangleIndices
+        local_triangles = vertices[triangle_indices]
+
+        # (particles, triangles, 3, 2) array of triangle vertices
+        (cosines, sines) = (np.cos(angles), np.sin(angles))
+        rotations = np.array([[cosines, -sines], [sines, cosines]]).transpose((2, 0, 1))
+        rotations *= scale_factors[:, np.newaxis, np.newaxis]
+        triangles = np.einsum('nij,tvj->ntvi', rotations, local_triangles)
+        triangles += positions[:, np.newaxis, np.newaxis]
+        triangles = framebuffer.project(triangles).reshape((-1, 3, 2))
+
+        outline = self.outline
+        edge_starts = vertices[np.newaxis]
+        edge_deltas = np.roll(edge_starts, -1, axis=1) - edge_starts
+
+        for (indices, weights, pixels) in triangle_fragments(framebuffer, triangles):
+            visible = framebuffer.resolve(pixels, np.zeros(len(pixels)), indices)
+            (particles, shape_triangles) = np.divmod(indices[visible], len(local_triangles))
+
+            fragment_colors = colors[particles]
+            if outline > 0:
+                points = np.einsum('nv,nvi->ni', weights[visible],
+                                   local_triangles[shape_triangles])
+                distances = segment_distances(
+                    points, np.zeros(len(points), dtype=np.intp), edge_starts, edge_deltas)
+                fragment_colors[distances < outline, :3] = 0
+            framebuffer.colors[pixels[visible]] = fragment_colors
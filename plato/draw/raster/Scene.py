@@ -0,0 +1,62 @@
+import numpy as np
+
+from ... import draw
+from .internal import Framebuffer
+
+class Scene(draw.Scene):
+    __doc__ = (draw.Scene.__doc__ or '') + """
+    This Scene supports the following features:
+
+    * *ambient_light*: Enable trivial ambient lighting. The given value indicates the magnitude of the light (in [0, 1]).
+    * *antialiasing*: Enable antialiasing by supersampling each pixel. The given value indicates the number of samples to take along each dimension of a pixel (default 2).
+    * *directional_light*: Add directional lights. The given value indicates the magnitude*direction normal vector.
+    * *transparent_background*: Render with a transparent background
+    """
+
+    def render(self):
+        """Render all the shapes in this Scene.
+
+        :returns: (height, width, 4) numpy array of RGBA uint8 pixel values, with the top row of the image first
+        """
+        supersample = 1
+        if 'antialiasing' in self.enabled_features:
+            supersample = self.get_feature_config('antialiasing').get('value', 2)
+            supersample = 2 if supersample is True else max(1, int(supersample))
+
+        background = (1, 1, 1, 1)
+        if 'transparent_background' in self.enabled_features:
+            background = (1, 1, 1, 0)
+
+        (width, height) = np.round(self.size_pixels).astype(np.int64)*supersample
+        framebuffer = Framebuffer(
+            width, height, self.zoom*self.pixel_scale*supersample,
+            self.translation, background)
+
+        kwargs = dict(rotation=self.rotation, ambient_light=0)
+
+        if 'ambient_light' in self.enabled_features:
+            kwargs['ambient_light'] = self.get_feature_config('ambient_light').get('value', .25)
+
+        feature_cfg = self.get_feature_config('directional_light')
+        if feature_cfg is not None:
+            lights = feature_cfg.get('value', (.25, .5, -1))
+            kwargs['directional_light'] = np.atleast_2d(lights).astype(np.float32)
+
+        for (i, prim) in enumerate(self._primitives):
+            framebuffer.primitive_index = i
+            prim.render(framebuffer, **kwargs)
+
+        return framebuffer.image(supersample)
+
+    def save(self, filename):
+        """Render and save an image of this Scene. Requires pillow.
+
+        :param filename: target filename to save the image into
+        """
+        from PIL import Image
+        Image.fromarray(self.render(), mode='RGBA').save(filename)
+
+    def _ipython_display_(self):
+        import IPython.display
+        from PIL import Image
+        return IPython.display.display(Image.fromarray(self.render(), mode='RGBA'))
@@ -0,0 +1,38 @@
+import numpy as np
+
+from ... import draw
+from ... import math
+from ... import mesh
+from .internal import directional_lighting, disk_fragments
+
+class Spheres(draw.Spheres):
+    __doc__ = draw.Spheres.__doc__
+
+    def render(self, framebuffer, rotation=(1, 0, 0, 0), ambient_light=0,
+               directional_light=(-.1, -.25, -1), **kwargs):
+        rotation = np.asarray(rotation)
+
+        (positions, radii, colors) = mesh.unfoldProperties([
+            self.positions, self.radii, self.colors])
+        radii = radii[:, 0]
+
+        rotated_positions = math.quatrot(rotation[np.newaxis], positions)
+
+        # draw front to back so hidden fragments are discarded early
+        order = np.argsort(-rotated_positions[:, 2], kind='stable')
+        (rotated_positions, radii, colors) = (
+            rotated_positions[order], radii[order], colors[order])
+        centers = framebuffer.project(rotated_positions)
+
+        for (indices, dx, dy, pixels) in disk_fragments(
+                framebuffer, centers, radii*framebuffer.scale):
+            dz = np.sqrt(np.maximum(0, 1 - dx**2 - dy**2))
+            depths = rotated_positions[indices, 2] + radii[indices]*dz
+
+            visible = framebuffer.resolve(pixels, depths, indices)
+            normals = np.array([dx[visible], dy[visible], dz[visible]]).T
+            light = directional_lighting(normals, ambient_light, directional_light)
+
+            fragment_colors = colors[indices[visible]]
+            fragment_colors[:, :3] *= light[:, np.newaxis]
+            framebuffer.colors[pixels[visible]] = fragment_colors
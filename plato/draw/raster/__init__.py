@@ -0,0 +1,22 @@
+"""
+The raster backend renders scenes into images in software, using
+only numpy. Shapes are rasterized in large, vectorized batches and
+resolved using a depth buffer, so it requires no openGL context,
+display, or external programs, making it useful for generating
+previews of large systems in batch jobs.
+
+`Scene.render()` returns the image as a numpy array of RGBA values,
+and `Scene.save()` writes it into an image file (using pillow).
+Shapes are opaque: transparency is not blended between overlapping
+shapes.
+"""
+
+from .Scene import Scene
+
+from .Arrows2D import Arrows2D
+from .Box import Box
+from .ConvexPolyhedra import ConvexPolyhedra
+from .Disks import Disks
+from .Lines import Lines
+from .Polygons import Polygons
+from .Spheres import Spheres
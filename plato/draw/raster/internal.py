@@ -0,0 +1,234 @@
+import numpy as np
+
+# ratio between successive bounding box size classes in Framebuffer.box_fragments
+_BOX_SIZE_RATIO = 1.25
+
+class Framebuffer:
+    """Depth-buffered RGBA image that primitives are rasterized into.
+
+    Fragment coordinates are given in pixel units, with (0, 0) at the
+    bottom left corner of the image and pixel centers at half-integer
+    coordinates. Larger depth values are closer to the viewer.
+
+    :param width: Width of the image, in pixels
+    :param height: Height of the image, in pixels
+    :param scale: Number of pixels per scene unit length
+    :param translation: Translation of the scene (only the x and y components are used)
+    :param background: RGBA color of pixels that are not covered by any fragment
+    :param max_fragments: Maximum number of candidate fragments to process at once
+    """
+    def __init__(self, width, height, scale, translation=(0, 0, 0),
+                 background=(1, 1, 1, 1), max_fragments=1 << 21):
+        self.width = int(width)
+        self.height = int(height)
+        self.scale = float(scale)
+        self.translation = np.asarray(translation, dtype=np.float64)[:2]
+        self.max_fragments = int(max_fragments)
+
+        count = self.width*self.height
+        self.depth = np.full(count, -np.inf, dtype=np.float64)
+        # drawing order of the fragment stored in each pixel, used to
+        # break ties between fragments at equal depth
+        self.order = np.full(count, -1, dtype=np.int64)
+        # index of the primitive currently being drawn (see resolve)
+        self.primitive_index = 0
+        self.colors = np.tile(np.asarray(background, dtype=np.float32), (count, 1))
+
+    def project(self, positions):
+        """Convert (..., 2) or (..., 3) scene coordinates into (..., 2)
+        pixel coordinates."""
+        positions = np.asarray(positions, dtype=np.float64)
+        result = (positions[..., :2] + self.translation)*self.scale
+        result += (0.5*self.width, 0.5*self.height)
+        return result
+
+    def box_fragments(self, lower, upper):
+        """Generate candidate fragments covering a set of bounding boxes.
+
+        Boxes are grouped into classes of similar size so that the
+        candidate pixels of many boxes can be enumerated at once.
+
+        :param lower: (N, 2) array of lower box corners, in pixel coordinates
+        :param upper: (N, 2) array of upper box corners, in pixel coordinates
+        :returns: generator of (indices, x, y, pixels) chunks, where `indices` is the box index of each fragment, `x` and `y` are the pixel coordinates of the fragment center, and `pixels` is the flat index of the pixel in the image
+        """
+        limits = (self.width, self.height)
+        finite = np.all(np.isfinite(lower) & np.isfinite(upper), axis=-1)
+        lower = np.where(finite[:, np.newaxis], lower, 0)
+        upper = np.where(finite[:, np.newaxis], upper, 0)
+        lower = np.clip(np.floor(lower), 0, limits).astype(np.int64)
+        upper = np.clip(np.ceil(upper), 0, limits).astype(np.int64)
+        extents = upper - lower
+        valid = np.flatnonzero(np.all(extents > 0, axis=-1))
+        if not len(valid):
+            return
+
+        extents = extents[valid]
+        classes = np.ceil(_BOX_SIZE_RATIO**np.ceil(
+            np.log(extents)/np.log(_BOX_SIZE_RATIO)) - 1e-6).astype(np.int64)
+        classes = np.maximum(classes, extents)
+        (classes, class_indices) = np.unique(classes, axis=0, return_inverse=True)
+        class_indices = class_indices.reshape(-1)
+
+        for (class_index, (box_width, box_height)) in enumerate(classes):
+            boxes = valid[class_indices == class_index]
+            (dy, dx) = np.divmod(np.arange(box_width*box_height), box_width)
+            boxes_per_chunk = max(1, self.max_fragments//(box_width*box_height))
+
+            for start in range(0, len(boxes), boxes_per_chunk):
+                chunk = boxes[start:start + boxes_per_chunk]
+                x = lower[chunk, 0, np.newaxis] + dx
+                y = lower[chunk, 1, np.newaxis] + dy
+                inside = np.logical_and(x < upper[chunk, 0, np.newaxis],
+                                        y < upper[chunk, 1, np.newaxis])
+                indices = np.repeat(chunk, box_width*box_height).reshape(x.shape)[inside]
+                (x, y) = (x[inside], y[inside])
+                yield (indices, x + 0.5, y + 0.5, y*self.width + x)
+
+    def resolve(self, pixels, depths, indices=None):
+        """Depth-test a set of fragments and update the depth buffer.
+
+        Fragments at equal depth are resolved in favor of the fragment
+        drawn later, as given by `primitive_index` and then by the
+        index of the item each fragment belongs to, so that flat (2D)
+        primitives are drawn in order.
+
+        :param pixels: flat pixel index of each fragment
+        :param depths: depth of each fragment
+        :param indices: index of the item (within the current primitive) of each fragment
+        :returns: indices of the fragments (at most one per pixel) that are visible
+        """
+        orders = np.full(len(pixels), self.primitive_index << 32, dtype=np.int64)
+        if indices is not None:
+            orders += indices
+
+        # discard fragments that are already hidden before sorting
+        order = np.flatnonzero(self._in_front(pixels, depths, orders))
+        order = order[np.lexsort((orders[order], depths[order], pixels[order]))]
+        sorted_pixels = pixels[order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = sorted_pixels[1:] != sorted_pixels[:-1]
+        order = order[last]
+
+        order = order[self._in_front(pixels[order], depths[order], orders[order])]
+        self.depth[pixels[order]] = depths[order]
+        self.order[pixels[order]] = orders[order]
+        return order
+
+    def _in_front(self, pixels, depths, orders):
+        current = self.depth[pixels]
+        return np.logical_or(depths > current, np.logical_and(
+            depths == current, orders >= self.order[pixels]))
+
+    def image(self, supersample=1):
+        """Return the contents of this buffer as an image.
+
+        :param supersample: Number of buffer pixels (along each dimension) to average into each image pixel
+        :returns: (height, width, 4) array of RGBA uint8 values, with the top row first
+        """
+        result = self.colors.reshape((self.height, self.width, 4))
+        if supersample > 1:
+            result = result.reshape((
+                self.height//supersample, supersample,
+                self.width//supersample, supersample, 4)).mean(axis=(1, 3))
+        result = np.clip(result[::-1], 0, 1)
+        return np.round(result*255).astype(np.uint8)
+
+def disk_fragments(framebuffer, centers, radii):
+    """Generate the fragments covered by a set of disks.
+
+    :param framebuffer: Framebuffer object to generate fragments for
+    :param centers: (N, 2) array of disk centers, in pixel coordinates
+    :param radii: (N,) array of disk radii, in pixels
+    :returns: generator of (indices, dx, dy, pixels) chunks, where `dx` and `dy` are the displacements of each fragment from its disk center, relative to the disk radius
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    for (indices, x, y, pixels) in framebuffer.box_fragments(
+            centers - radii[:, np.newaxis], centers + radii[:, np.newaxis]):
+        dx = (x - centers[indices, 0])/radii[indices]
+        dy = (y - centers[indices, 1])/radii[indices]
+        inside = dx**2 + dy**2 <= 1
+        yield (indices[inside], dx[inside], dy[inside], pixels[inside])
+
+def triangle_fragments(framebuffer, triangles):
+    """Generate the fragments covered by a set of triangles.
+
+    :param framebuffer: Framebuffer object to generate fragments for
+    :param triangles: (N, 3, 2) array of triangle vertices, in pixel coordinates
+    :returns: generator of (indices, weights, pixels) chunks, where `weights` is an (M, 3) array of the barycentric coordinates of each fragment
+    """
+    (origin_x, origin_y) = triangles[:, 0].T
+    (edge_1x, edge_1y) = (triangles[:, 1] - triangles[:, 0]).T
+    (edge_2x, edge_2y) = (triangles[:, 2] - triangles[:, 0]).T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse_areas = 1./(edge_1x*edge_2y - edge_1y*edge_2x)
+
+    for (indices, x, y, pixels) in framebuffer.box_fragments(
+            np.min(triangles, axis=1), np.max(triangles, axis=1)):
+        dx = x - origin_x[indices]
+        dy = y - origin_y[indices]
+        inverse_area = inverse_areas[indices]
+        w1 = (dx*edge_2y[indices] - dy*edge_2x[indices])*inverse_area
+        w2 = (edge_1x[indices]*dy - edge_1y[indices]*dx)*inverse_area
+        with np.errstate(invalid='ignore'):
+            inside = (w1 >= 0) & (w2 >= 0) & (w1 + w2 <= 1)
+        (w1, w2) = (w1[inside], w2[inside])
+        weights = np.array([1 - w1 - w2, w1, w2]).T
+        yield (indices[inside], weights, pixels[inside])
+
+def capsule_fragments(framebuffer, starts, ends, radii):
+    """Generate the fragments covered by a set of capsules (line
+    segments with rounded caps).
+
+    :param framebuffer: Framebuffer object to generate fragments for
+    :param starts: (N, 2) array of segment start points, in pixel coordinates
+    :param ends: (N, 2) array of segment end points, in pixel coordinates
+    :param radii: (N,) array of capsule radii, in pixels
+    :returns: generator of (indices, t, distances, pixels) chunks, where `t` is the fraction of the way along the segment closest to each fragment and `distances` is the distance of each fragment from the segment, relative to the capsule radius
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    deltas = ends - starts
+    with np.errstate(divide='ignore'):
+        inverse_lengths_squared = 1./np.sum(deltas**2, axis=-1)
+    inverse_lengths_squared[np.logical_not(np.isfinite(inverse_lengths_squared))] = 0
+
+    for (indices, x, y, pixels) in framebuffer.box_fragments(
+            np.minimum(starts, ends) - radii[:, np.newaxis],
+            np.maximum(starts, ends) + radii[:, np.newaxis]):
+        dx = x - starts[indices, 0]
+        dy = y - starts[indices, 1]
+        delta = deltas[indices]
+        t = (dx*delta[:, 0] + dy*delta[:, 1])*inverse_lengths_squared[indices]
+        t = np.clip(t, 0, 1)
+        distances = np.sqrt((dx - t*delta[:, 0])**2 + (dy - t*delta[:, 1])**2)/radii[indices]
+        inside = distances <= 1
+        yield (indices[inside], t[inside], distances[inside], pixels[inside])
+
+def segment_distances(points, groups, starts, deltas):
+    """Compute the distance from each point to the nearest of a group
+    of line segments.
+
+    :param points: (N, D) array of points
+    :param groups: (N,) array of the index of the group of segments to use for each point
+    :param starts: (G, K, D) array of segment start points for each group (groups with fewer than K segments can repeat segments)
+    :param deltas: (G, K, D) array of segment vectors (end - start) for each group
+    :returns: (N,) array of minimum distances
+    """
+    with np.errstate(divide='ignore'):
+        inverse_lengths_squared = 1./np.sum(deltas**2, axis=-1)
+    inverse_lengths_squared[np.logical_not(np.isfinite(inverse_lengths_squared))] = 0
+
+    result = np.full(len(points), np.inf)
+    for k in range(starts.shape[1]):
+        delta = points - starts[groups, k]
+        segment = deltas[groups, k]
+        t = np.sum(delta*segment, axis=-1)*inverse_lengths_squared[groups, k]
+        t = np.clip(t, 0, 1)
+        distances = np.linalg.norm(delta - t[:, np.newaxis]*segment, axis=-1)
+        result = np.minimum(result, distances)
+    return result
+
+def directional_lighting(normals, ambient_light, directional_light):
+    """Compute the (ambient + directional) light level for a set of normal vectors."""
+    light_dots = -np.dot(normals, np.atleast_2d(directional_light).T)
+    return ambient_light + np.sum(np.maximum(light_dots, 0), axis=-1)
@@ -482,6 +482,7 @@ class Canvas(vispy.app.Canvas):
 
     def __init__(self, scene, **kwargs):
         self._fbos = {}
+        self._render_fbo = None
         self._programs = {}
         self._textures = {}
         self._webgl = 'webgl' in vispy.app.use_app().backend_name
@@ -515,6 +516,24 @@ class Canvas(vispy.app.Canvas):
 
         vispy.gloo.set_viewport(0, 0, *size)
 
+    def render(self, alpha=True):
+        """Render the canvas to an offscreen buffer and return the image
+        array. The framebuffer is kept and reused by later calls."""
+        self.set_current()
+        size = tuple(self.physical_size[::-1])
+
+        if self._render_fbo is None or self._render_fbo.color_buffer.shape[:2] != size:
+            self._render_fbo = gloo.FrameBuffer(
+                color=gloo.RenderBuffer(size), depth=gloo.RenderBuffer(size))
+
+        with self._render_fbo:
+            self.events.draw()
+            result = self._render_fbo.read()
+
+        if not alpha:
+            result = result[..., :3]
+        return result
+
     def on_draw(self, *args, **kwargs):
         self.set_current()
 
@@ -186,27 +186,15 @@ class ConvexPolyhedra(draw.ConvexPolyhedra, GLPrimitive):
             self._gl_attributes['outline_delta'] = outline_delta
 
         try:
-            for name in self._dirty_attributes:
-                if name == 'vertices':
-                    for quantity in ['image', 'normal', 'indices', 'outline_delta']:
-                        self._gl_vertex_arrays[quantity][:] = self._gl_attributes[quantity][np.newaxis]
-                        self._dirty_vertex_attribs.add(quantity)
-                else:
-                    self._gl_vertex_arrays[name][:] = self._attributes[name]
-                    self._dirty_vertex_attribs.add(name)
+            self._update_shape_vertex_arrays()
         except (ValueError, KeyError):
             shape_ids = np.arange(len(self), dtype=np.uint32).view(np.uint8).reshape((-1, 4))
             shape_ids = shape_ids.astype(np.float32)/255
 
-            vertex_arrays = mesh.unfoldProperties(
+            self._finalize_mesh_array_updates(
                 [shape_ids, self.positions, self.orientations, self.colors],
-                [self._gl_attributes[name] for name in ['image', 'normal', 'outline_delta']])
-
-            unfolded_shape = vertex_arrays[0].shape[:-1]
-            indices = (np.arange(unfolded_shape[0])[:, np.newaxis, np.newaxis]*unfolded_shape[1] +
-                       self._gl_attributes['indices'])
-            indices = indices.reshape((-1, 3))
-
-            self._finalize_array_updates(indices, vertex_arrays)
+                [self._gl_attributes[name] for name in ['image', 'normal', 'outline_delta']],
+                self._gl_attributes['indices'])
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
@@ -181,3 +181,4 @@ class DiskUnions(draw.DiskUnions, GLPrimitive):
             self._finalize_array_updates(indices, vertex_arrays)
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
@@ -2,7 +2,6 @@ import itertools
 
 import numpy as np
 
-from ... import mesh
 from .internal import GLPrimitive, GLShapeDecorator
 from .Spheres import Spheres
 from ... import draw
@@ -146,9 +145,7 @@ class Ellipsoids(draw.Ellipsoids, GLPrimitive):
 
     def update_arrays(self):
         try:
-            for name in self._dirty_attributes:
-                self._gl_vertex_arrays[name][:] = self._attributes[name]
-                self._dirty_vertex_attribs.add(name)
+            self._update_shape_vertex_arrays()
         except (ValueError, KeyError):
             # vertices for a square patch
             image = np.array([[-1, -1], [-1, 1], [1, -1], [1, 1]], dtype=np.float32)
@@ -156,15 +153,9 @@ class Ellipsoids(draw.Ellipsoids, GLPrimitive):
             shape_ids = np.arange(len(self), dtype=np.uint32).view(np.uint8).reshape((-1, 4))
             shape_ids = shape_ids.astype(np.float32)/255
 
-            vertex_arrays = mesh.unfoldProperties(
+            self._finalize_mesh_array_updates(
                 [shape_ids, self.positions, self.orientations, self.colors],
-                [image])
-
-            unfolded_shape = vertex_arrays[0].shape[:-1]
-            indices = (np.arange(unfolded_shape[0])[:, np.newaxis, np.newaxis]*unfolded_shape[1] +
-                       np.array([(0, 2, 3), (3, 1, 0)], dtype=np.uint32))
-            indices = indices.reshape((-1, 3))
-
-            self._finalize_array_updates(indices, vertex_arrays)
+                [image], np.array([(0, 2, 3), (3, 1, 0)], dtype=np.uint32))
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
@@ -2,7 +2,6 @@ import itertools
 
 import numpy as np
 
-from ... import mesh
 from .internal import GLPrimitive, GLShapeDecorator
 from ... import draw
 from ..internal import ShapeAttribute
@@ -181,9 +180,7 @@ class Lines(draw.Lines, GLPrimitive):
 
     def update_arrays(self):
         try:
-            for name in self._dirty_attributes:
-                self._gl_vertex_arrays[name][:] = self._attributes[name]
-                self._dirty_vertex_attribs.add(name)
+            self._update_shape_vertex_arrays()
         except (ValueError, KeyError):
             # vertices for a unit square. This square will be
             # transformed in order for us to draw our line. x and y
@@ -201,18 +198,12 @@ class Lines(draw.Lines, GLPrimitive):
             shape_ids = np.arange(len(self), dtype=np.uint32).view(np.uint8).reshape((-1, 4))
             shape_ids = shape_ids.astype(np.float32)/255
 
-            vertex_arrays = mesh.unfoldProperties(
+            self._finalize_mesh_array_updates(
                 [shape_ids, self.start_points, self.end_points, self.colors, self.widths],
-                [vertices])
-
-            unfolded_shape = vertex_arrays[0].shape[:-1]
-            indices = (np.arange(unfolded_shape[0])[:, np.newaxis, np.newaxis]*unfolded_shape[1] +
-                       np.array([[0, 1, 2], [2, 3, 0], [0, 4, 1], [2, 5, 3]], dtype=np.uint32))
-            indices = indices.reshape((-1, 3))
-
-            self._finalize_array_updates(indices, vertex_arrays)
+                [vertices], np.array([[0, 1, 2], [2, 3, 0], [0, 4, 1], [2, 5, 3]], dtype=np.uint32))
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
 
     def render_planes(self):
         # Not currently supported, but we shouldn't error out in the middle of rendering
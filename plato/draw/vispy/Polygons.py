@@ -3,7 +3,6 @@ import itertools
 import numpy as np
 
 from ... import geometry
-from ... import mesh
 from .internal import GLPrimitive, GLShapeDecorator
 from ... import draw
 from ..internal import ShapeAttribute
@@ -106,12 +105,7 @@ class Polygons(draw.Polygons, GLPrimitive):
             self._gl_attributes['indices'] = self._gl_attributes['triangulation'].outer.triangleIndices
 
         try:
-            for name in self._dirty_attributes:
-                if name == 'vertices':
-                    raise ValueError
-                else:
-                    self._gl_vertex_arrays[name][:] = self._attributes[name]
-                    self._dirty_vertex_attribs.add(name)
+            self._update_shape_vertex_arrays()
         except (ValueError, KeyError):
             vertices = self._gl_attributes['triangulation'].outer.vertices
             outline_vertices = self._gl_attributes['triangulation'].inner.vertices
@@ -119,18 +113,12 @@ class Polygons(draw.Polygons, GLPrimitive):
             shape_ids = np.arange(len(self), dtype=np.uint32).view(np.uint8).reshape((-1, 4))
             shape_ids = shape_ids.astype(np.float32)/255
 
-            vertex_arrays = mesh.unfoldProperties(
+            self._finalize_mesh_array_updates(
                 [shape_ids, self.positions, self.orientations, self.colors],
-                [vertices, outline_vertices])
-
-            unfolded_shape = vertex_arrays[0].shape[:-1]
-            indices = (np.arange(unfolded_shape[0])[:, np.newaxis, np.newaxis]*unfolded_shape[1] +
-                       self._gl_attributes['indices'])
-            indices = indices.reshape((-1, 3))
-
-            self._finalize_array_updates(indices, vertex_arrays)
+                [vertices, outline_vertices], self._gl_attributes['indices'])
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
 
     def render_generic(self, *args, **kwargs):
         try:
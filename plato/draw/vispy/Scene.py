@@ -193,6 +193,7 @@ class Scene(draw.Scene):
 
         for prim in self._primitives:
             prim.camera = self.camera
+            prim._pixels_per_unit = self._zoom*self._pixel_scale
 
     def save(self, filename):
         """Render and save an image of this Scene.
@@ -154,6 +154,7 @@ class SpherePoints(draw.SpherePoints, GLPrimitive):
             self._dirty_vertex_attribs.add('shape_id')
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
 
     @property
     def points(self):
@@ -259,3 +259,4 @@ class SphereUnions(draw.SphereUnions, GLPrimitive):
             self._finalize_array_updates(indices, vertex_arrays)
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
@@ -143,37 +143,39 @@ class Spheropolygons(draw.Spheropolygons, GLPrimitive):
         draw.Spheropolygons.__init__(self, *args, **kwargs)
 
     def update_arrays(self):
-        if 'vertices' in self._dirty_attributes:
+        # choose the number of points in each rounded corner based on
+        # the rounding radius as it appears on screen
+        granularity = mesh.spheropolygonGranularity(
+            self.radius*self._pixels_per_unit)
+        remesh = ('vertices' in self._dirty_attributes or
+                  granularity != self._gl_attributes.get('granularity', None))
+
+        if remesh:
             vertices = self.vertices
             if len(vertices) < 3:
                 thetas = np.linspace(0, 2*np.pi, 3, endpoint=False)
                 vertices = np.array([np.cos(thetas), np.sin(thetas)], dtype=np.float32).T
 
-            mesh_ = mesh.spheropolygonMesh(vertices, 1, granularity=2)
+            mesh_ = mesh.spheropolygonMesh(vertices, 1, granularity=granularity)
+            self._gl_attributes['granularity'] = granularity
             self._gl_attributes['image'] = mesh_.image.astype(np.float32)
             self._gl_attributes['inner_image'] = mesh_.innerImage.astype(np.float32)
             self._gl_attributes['indices'] = mesh_.indices
 
-        try:
-            for name in self._dirty_attributes:
-                if name == 'vertices':
-                    raise ValueError
-                else:
-                    self._gl_vertex_arrays[name][:] = self._attributes[name]
-                    self._dirty_vertex_attribs.add(name)
-        except (ValueError, KeyError):
+        if not remesh:
+            try:
+                self._update_shape_vertex_arrays()
+            except (ValueError, KeyError):
+                remesh = True
+
+        if remesh:
             shape_ids = np.arange(len(self), dtype=np.uint32).view(np.uint8).reshape((-1, 4))
             shape_ids = shape_ids.astype(np.float32)/255
 
-            vertex_arrays = mesh.unfoldProperties(
+            self._finalize_mesh_array_updates(
                 [shape_ids, self.positions, self.orientations, self.colors],
-                [self._gl_attributes['image'], self._gl_attributes['inner_image']])
-
-            unfolded_shape = vertex_arrays[0].shape[:-1]
-            indices = (np.arange(unfolded_shape[0])[:, np.newaxis, np.newaxis]*unfolded_shape[1] +
-                       self._gl_attributes['indices'])
-            indices = indices.reshape((-1, 3))
-
-            self._finalize_array_updates(indices, vertex_arrays)
+                [self._gl_attributes['image'], self._gl_attributes['inner_image']],
+                self._gl_attributes['indices'])
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
@@ -142,3 +142,4 @@ class Voronoi(draw.Voronoi, GLPrimitive):
             self._finalize_array_updates(indices, vertex_arrays)
 
         self._dirty_attributes.clear()
+        self._dirty_subsets.clear()
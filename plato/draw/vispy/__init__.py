@@ -33,12 +33,31 @@ keys rotate the system in 15 degree increments. The same functionality
 is mapped to the I (up), J (left), K (down), and L (right) keys. X, Y,
 and Z directly snap the scene to look down the x, y, or z axes,
 respectively.
+
+**Instanced rendering:** Primitives consisting of many copies of a
+single mesh (such as `ConvexPolyhedra`) are drawn using instanced
+rendering when the openGL target supports it, so that the mesh is only
+stored once on the GPU. The default ES 2.0 subset of openGL used by
+vispy does not; select the full desktop openGL target before showing
+any scenes to enable it::
+
+  import vispy.gloo
+  vispy.gloo.gl.use_gl('gl+')
+
+Otherwise (and in notebooks using webGL), per-shape quantities are
+replicated onto every vertex of every shape.
+
+**Offscreen rendering:** For rendering many frames on machines without
+a display, select an offscreen vispy backend (EGL or OSMesa) with
+:py:func:`use_offscreen_backend` before creating any scenes, then use
+:py:func:`render_frames` or :py:func:`save_frames`.
 """
 
 import vispy
 vispy.set_log_level('warning')
 
 from .Scene import Scene
+from .offscreen import render_frames, save_frames, use_offscreen_backend
 
 from .Box import Box
 from .Arrows2D import Arrows2D
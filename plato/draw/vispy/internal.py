@@ -11,6 +11,16 @@ from ..Scene import DEFAULT_DIRECTIONAL_LIGHTS
 
 ATTRIBUTE_DOCSTRING_HEADER = '\n\nThis primitive has the following opengl-specific attributes:'
 
+# names of the vertex attributes holding each per-shape quantity
+SHAPE_VERTEX_ATTRIBUTES = dict(
+    positions='position', orientations='orientation', colors='color',
+    shape_colors='shape_color', radii='radius', start_points='start_point',
+    end_points='end_point', widths='width')
+
+# maximum number of separate ranges to upload for a partially-modified
+# vertex attribute before uploading a single range spanning all of them
+MAX_SUBSET_UPLOADS = 64
+
 class GLPrimitive:
     def __init__(self):
         # hold intermediate computations wrt convex hull/meshes
@@ -19,9 +29,19 @@ class GLPrimitive:
         # hold unfolded vertex attrib arrays
         self._gl_vertex_arrays = {}
         self._dirty_vertex_attribs = set()
+        # map vertex attribute names to lists of modified shape indices
+        self._dirty_vertex_subsets = {}
+        # persistent vertex buffers, indexed by (name, index chunk)
+        self._gl_buffers = {}
+        # names of vertex arrays that are bound once per instance
+        # (rather than once per vertex) when using instanced rendering
+        self._gl_instance_attribs = set()
         self._gl_uniforms = {}
         self._dirty_uniforms = set()
         self._shader_substitutions = {}
+        # number of pixels per unit length in the scene, set by the
+        # Scene; used by primitives that adapt their mesh resolution
+        self._pixels_per_unit = 1
 
         self._color_programs = []
         self._pick_programs = []
@@ -72,26 +92,35 @@ class GLPrimitive:
     def render_generic(self, programs, make_program_function, config={}):
         self.update_arrays()
 
+        to_bind = set(self._dirty_vertex_attribs)
         for _ in range(len(programs), len(self._gl_vertex_arrays['indices'])):
             try:
                 programs.append(make_program_function(config))
             except KeyError:
                 # we were missing some shader code
                 continue
-            self._dirty_vertex_attribs.update(self._gl_vertex_arrays)
+            to_bind.update(self._gl_vertex_arrays)
             self._dirty_uniforms.update(self._gl_uniforms)
+        to_bind.discard('indices')
 
         for name in self._dirty_vertex_attribs:
-            if name == 'indices':
-                continue
+            if name != 'indices':
+                self._upload_vertex_array(name)
 
+        for (name, shape_indices) in self._dirty_vertex_subsets.items():
+            if name not in self._dirty_vertex_attribs:
+                self._upload_vertex_subset(name, np.concatenate(shape_indices))
+
+        for name in to_bind:
             for program_set in self._all_program_sets:
-                for (program, (scat, _)) in zip(
-                        program_set, self._gl_vertex_arrays['indices']):
-                    reshaped = self._gl_vertex_arrays[name]
-                    reshaped = reshaped.reshape((-1, reshaped.shape[-1]))
-                    program[name] = reshaped[scat]
+                for (chunk, program) in enumerate(program_set):
+                    if name in self._gl_instance_attribs:
+                        program[name] = self._gl_buffers[name, None]
+                    elif (name, chunk) in self._gl_buffers:
+                        program[name] = self._gl_buffers[name, chunk]
+
         self._dirty_vertex_attribs.clear()
+        self._dirty_vertex_subsets.clear()
 
         for name in self._dirty_uniforms:
             for program in itertools.chain(*self._all_program_sets):
@@ -108,6 +137,91 @@ class GLPrimitive:
         for (program, (_, buf)) in zip(programs, self._gl_vertex_arrays['indices']):
             program.draw('triangles', indices=buf)
 
+    def _upload_vertex_array(self, name):
+        """Send the full contents of a vertex array to its buffer(s)."""
+        reshaped = self._gl_vertex_arrays[name]
+        reshaped = np.ascontiguousarray(reshaped.reshape((-1, reshaped.shape[-1])))
+
+        if name in self._gl_instance_attribs:
+            # a single buffer, advanced once per instance, is shared
+            # among all index chunks
+            chunks = [(None, reshaped)]
+        else:
+            chunks = [(chunk, reshaped[scat]) for (chunk, (scat, _)) in
+                      enumerate(self._gl_vertex_arrays['indices'])]
+
+        for (chunk, data) in chunks:
+            buf = self._gl_buffers.get((name, chunk), None)
+            if buf is None:
+                divisor = 1 if chunk is None else None
+                self._gl_buffers[name, chunk] = gloo.VertexBuffer(data, divisor=divisor)
+            else:
+                buf.set_data(data)
+
+    def _upload_vertex_subset(self, name, shape_indices):
+        """Send the portions of a vertex array belonging to the given
+        shapes to its buffer(s)."""
+        array = self._gl_vertex_arrays[name]
+        vertices_per_shape = int(np.prod(array.shape[1:-1]))
+        reshaped = array.reshape((-1, array.shape[-1]))
+
+        rows = (np.unique(shape_indices)[:, np.newaxis]*vertices_per_shape +
+                np.arange(vertices_per_shape)).reshape(-1)
+
+        if name in self._gl_instance_attribs:
+            chunks = [(None, np.arange(len(reshaped)))]
+        else:
+            chunks = [(chunk, scat) for (chunk, (scat, _)) in
+                      enumerate(self._gl_vertex_arrays['indices'])]
+
+        for (chunk, scat) in chunks:
+            # location of each modified vertex within this chunk
+            locations = np.searchsorted(scat, rows)
+            present = locations < len(scat)
+            present[present] = scat[locations[present]] == rows[present]
+            locations = locations[present]
+            if not len(locations):
+                continue
+
+            # upload contiguous runs of modified vertices, or a single
+            # range spanning all of them if they are too fragmented
+            breaks = np.where(np.diff(locations) != 1)[0] + 1
+            if len(breaks) >= MAX_SUBSET_UPLOADS:
+                runs = [np.arange(locations[0], locations[-1] + 1)]
+            else:
+                runs = np.split(locations, breaks)
+
+            buf = self._gl_buffers[name, chunk]
+            for run in runs:
+                data = np.ascontiguousarray(reshaped[scat[run]])
+                buf.set_subdata(data, offset=int(run[0]))
+
+    def _update_shape_vertex_arrays(self):
+        """Copy modified per-shape quantities into the existing vertex arrays.
+
+        Raises a KeyError or ValueError if any modified quantity
+        requires the vertex arrays to be rebuilt.
+        """
+        for name in self._dirty_attributes:
+            if not self._ATTRIBUTES_BY_NAME[name].per_shape:
+                raise KeyError(name)
+            gl_name = SHAPE_VERTEX_ATTRIBUTES[name]
+            target = self._gl_vertex_arrays[gl_name]
+            value = self._attributes[name]
+            value = value.reshape(
+                (len(value),) + (1,)*(target.ndim - 2) + target.shape[-1:])
+
+            subsets = self._dirty_subsets.get(name, None)
+            if subsets is None:
+                target[:] = value
+                self._dirty_vertex_attribs.add(gl_name)
+            else:
+                if len(value) != len(target):
+                    raise ValueError(name)
+                indices = np.concatenate(subsets)
+                target[indices] = value[indices]
+                self._dirty_vertex_subsets.setdefault(gl_name, []).append(indices)
+
     def render_color(self):
         self.render_generic(self._color_programs, self.make_color_program)
 
@@ -146,7 +260,60 @@ class GLPrimitive:
             self._gl_uniforms['transparency_mode'] = 0
             self._dirty_uniforms.add('transparency_mode')
 
-    def _finalize_array_updates(self, indices, vertex_arrays):
+    @property
+    def _instancing(self):
+        """Whether instanced rendering is available for this primitive.
+
+        Instancing requires vertex buffer divisors, which are
+        unavailable in webgl and the default ES 2.0 subset of openGL
+        that vispy uses (select the 'gl+' target via
+        `vispy.gloo.gl.use_gl('gl+')` to enable them).
+        """
+        return (not self._webgl and hasattr(gloo.VertexBuffer, 'divisor') and
+                hasattr(gloo.gl, 'glVertexAttribDivisor'))
+
+    def _finalize_mesh_array_updates(self, shape_arrays, mesh_arrays, mesh_indices):
+        """Update the vertex arrays of a primitive consisting of copies
+        of a single mesh.
+
+        If instanced rendering is available, the mesh is stored only
+        once and the per-shape arrays are bound once per instance;
+        otherwise, all quantities are unfolded onto each vertex of
+        each shape.
+
+        :param shape_arrays: List of per-shape quantities, in the same order as the first entries of `_vertex_attribute_names`
+        :param mesh_arrays: List of per-mesh-vertex quantities, in the same order as the remaining entries of `_vertex_attribute_names`
+        :param mesh_indices: (Nt, 3) triangle indices of the mesh
+        """
+        mesh_indices = np.asarray(mesh_indices).reshape((-1, 3))
+
+        if self._instancing:
+            shape_arrays = mesh.unfoldProperties(shape_arrays)
+            mesh_arrays = mesh.unfoldProperties(mesh_arrays)
+            instance_names = self._vertex_attribute_names[:len(shape_arrays)]
+            self._finalize_array_updates(
+                mesh_indices, shape_arrays + mesh_arrays, instance_names)
+        else:
+            vertex_arrays = mesh.unfoldProperties(shape_arrays, mesh_arrays)
+
+            unfolded_shape = vertex_arrays[0].shape[:-1]
+            indices = (np.arange(unfolded_shape[0])[:, np.newaxis, np.newaxis]*unfolded_shape[1] +
+                       mesh_indices)
+            indices = indices.reshape((-1, 3))
+
+            self._finalize_array_updates(indices, vertex_arrays)
+
+    def _finalize_array_updates(self, indices, vertex_arrays, instance_names=()):
+        instance_names = set(instance_names)
+        if instance_names != self._gl_instance_attribs:
+            # programs hold on to buffers with a fixed divisor, so
+            # switching between instanced and unfolded arrays
+            # requires new programs
+            for pset in self._all_program_sets:
+                pset.clear()
+            self._gl_instance_attribs = instance_names
+        self._gl_buffers.clear()
+
         indexDtype = np.uint16 if self._webgl else np.uint32
         maxIndex = 2**16 - 1 if self._webgl else 2**32 - 1
         self._gl_vertex_arrays['indices'] = [(scat, gloo.IndexBuffer(np.ascontiguousarray(ind, dtype=indexDtype)))
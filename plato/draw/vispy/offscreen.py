@@ -0,0 +1,95 @@
+"""Utilities for rendering vispy scenes without a display.
+
+Select an offscreen vispy backend once, before any vispy Scene is
+created, and then render frames from an iterator::
+
+  import plato.draw.vispy as draw
+  draw.use_offscreen_backend()
+
+  scene = draw.Scene(spheres, ...)
+
+  def frames():
+      for positions in trajectory:
+          yield {spheres: dict(positions=positions)}
+
+  for image in draw.render_frames(scene, frames()):
+      ...
+"""
+
+import os
+
+import vispy.app
+import vispy.io
+
+def use_offscreen_backend(backends=('egl', 'osmesa')):
+    """Select a vispy application backend that can render without a
+    display, such as EGL or OSMesa software contexts. Must be called
+    before any vispy Scene is created.
+
+    :param backends: Names of vispy backends to try, in order of preference
+    :returns: The name of the selected backend
+    """
+    if not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        # let mesa create EGL contexts with no window system at all
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    errors = []
+    for name in backends:
+        try:
+            return vispy.app.use_app(name).backend_name
+        except Exception as e:
+            errors.append('{}: {}'.format(name, e))
+
+    raise RuntimeError('No offscreen vispy backend could be loaded ({})'.format(
+        '; '.join(errors)))
+
+def _apply_frame_updates(scene, updates):
+    primitives = list(scene)
+    for (key, attributes) in updates.items():
+        prim = primitives[key] if isinstance(key, int) else key
+        for (name, value) in attributes.items():
+            setattr(prim, name, value)
+
+def render_frames(scene, frame_iterator, alpha=True):
+    """Render a sequence of frames of a scene into numpy arrays.
+
+    The same openGL context, framebuffer, and uploaded vertex buffers
+    are reused for each frame; only attributes that are modified
+    between frames are sent to the GPU again.
+
+    Each element of `frame_iterator` may either be None, in which case
+    the scene is rendered as-is (for example, if the iterator itself
+    modifies the scene before yielding), or a dictionary mapping
+    primitives (or their indices within the scene) to a dictionary of
+    attribute values to set for that frame.
+
+    This function is a generator, yielding an (height, width, 4)
+    (or (height, width, 3) if `alpha` is False) uint8 image array for
+    each frame.
+
+    :param scene: vispy :py:class:`Scene` to render
+    :param frame_iterator: Iterable of per-frame updates to the scene
+    :param alpha: If False, discard the alpha channel of the images
+    """
+    canvas = scene._canvas
+    for updates in frame_iterator:
+        if updates:
+            _apply_frame_updates(scene, updates)
+        yield canvas.render(alpha=alpha)
+
+def save_frames(scene, frame_iterator, filename_pattern='frame_{:05d}.png'):
+    """Render a sequence of frames of a scene into a series of PNG
+    images. Frames are given in the same way as for
+    :py:func:`render_frames`.
+
+    :param scene: vispy :py:class:`Scene` to render
+    :param frame_iterator: Iterable of per-frame updates to the scene
+    :param filename_pattern: Format string to generate the filename of each frame from its index
+    :returns: List of filenames that were written
+    """
+    filenames = []
+    for (i, image) in enumerate(render_frames(scene, frame_iterator)):
+        filename = filename_pattern.format(i)
+        vispy.io.write_png(filename, image)
+        filenames.append(filename)
+    return filenames
@@ -5,6 +5,7 @@ import numpy as np
 
 from ... import draw, mesh
 from ...draw import internal
+from .internal import encode_array, encode_colors
 
 LightInfo = collections.namedtuple(
     'LightInfo', ['normal', 'magnitude'])
@@ -17,25 +18,22 @@ class Disks(draw.Disks):
                **kwargs):
         # in the zdog coordinate system, x is to the right, y is down,
         # and z is toward you
-        lines = []
-
-        particles = zip(*mesh.unfoldProperties([
-            self.positions*(1, -1), self.diameters, self.colors*255]))
-        for i, (position, (diameter,), color) in enumerate(particles):
-            group_index = 'disk_{}_{}'.format(name_suffix, i)
-
-            (r, g, b) = map(int, color[:3])
-            color_str = '"rgba({}, {}, {}, {})"'.format(
-                r, g, b, color[3]/255)
-
-            lines.append("""
-            new Zdog.Shape({{
-                addTo: {illo_id},
-                translate: {{x: {pos[0]}, y: {pos[1]}}},
-                stroke: {diameter},
-                color: {color},
-            }});""".format(
-                group_index=group_index, illo_id=illo_id, pos=position,
-                diameter=diameter, color=color_str))
-
-        return lines
+        (positions, diameters, colors) = mesh.unfoldProperties([
+            self.positions*(1, -1), self.diameters, self.colors*255])
+
+        return ["""
+        (function() {{
+            let positions = {positions};
+            let diameters = {diameters};
+            let colors = {colors};
+            for(let i = 0; i < diameters.length; i++) {{
+                new Zdog.Shape({{
+                    addTo: {illo_id},
+                    translate: {{x: positions[2*i], y: positions[2*i + 1]}},
+                    stroke: diameters[i],
+                    color: rgba_string(colors, i),
+                }});
+            }}
+        }})();""".format(
+            positions=encode_array(positions), diameters=encode_array(diameters),
+            colors=encode_colors(colors), illo_id=illo_id)]
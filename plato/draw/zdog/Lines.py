@@ -1,5 +1,6 @@
 from ... import draw
 from ... import mesh
+from .internal import encode_array, encode_colors
 
 class Lines(draw.Lines):
     __doc__ = draw.Lines.__doc__
@@ -8,28 +9,29 @@ class Lines(draw.Lines):
                ambient_light=0.4, directional_light=[], **kwargs):
         # in the zdog coordinate system, x is to the right, y is down,
         # and z is toward you
-        lines = []
-
-        particles = zip(*mesh.unfoldProperties([
+        (starts, ends, widths, colors) = mesh.unfoldProperties([
             self.start_points*(1, -1, 1), self.end_points*(1, -1, 1),
-            self.widths, self.colors*255]))
-        for i, (start, end, (width,), color) in enumerate(particles):
-            path = ', '.join('{{x: {}, y: {}, z: {}}}'.format(*v) for v in [start, end])
-
-            (r, g, b) = map(int, color[:3])
-
-            # RGB components are 0-255, A component is a float 0-1
-            color_str = '"rgba({}, {}, {}, {})"'.format(r, g, b, color[3]/255)
-
-            lines.append("""
-            new Zdog.Shape({{
-                addTo: {illo_id},
-                color: {color},
-                path: [{path}],
-                stroke: {width},
-                closed: false,
-            }});
-            """.format(
-                illo_id=illo_id, color=color_str, path=path, width=width))
+            self.widths, self.colors*255])
 
-        return lines
+        return ["""
+        (function() {{
+            let starts = {starts};
+            let ends = {ends};
+            let widths = {widths};
+            let colors = {colors};
+            for(let i = 0; i < widths.length; i++) {{
+                new Zdog.Shape({{
+                    addTo: {illo_id},
+                    color: rgba_string(colors, i),
+                    path: [
+                        {{x: starts[3*i], y: starts[3*i + 1], z: starts[3*i + 2]}},
+                        {{x: ends[3*i], y: ends[3*i + 1], z: ends[3*i + 2]}},
+                    ],
+                    stroke: widths[i],
+                    closed: false,
+                }});
+            }}
+        }})();""".format(
+            starts=encode_array(starts), ends=encode_array(ends),
+            widths=encode_array(widths), colors=encode_colors(colors),
+            illo_id=illo_id)]
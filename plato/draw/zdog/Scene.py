@@ -8,6 +8,21 @@ let is_in_view = function(elt) {
     let bounding_rect = elt.getBoundingClientRect();
     return bounding_rect.bottom >= 0 && bounding_rect.top <= window.innerHeight;
 }
+
+// decode a base64-encoded (little-endian) array of the given typed array type
+let decode_array = function(data, array_type) {
+    let binary = atob(data);
+    let bytes = new Uint8Array(binary.length);
+    for(let i = 0; i < binary.length; i++)
+        bytes[i] = binary.charCodeAt(i);
+    return new array_type(bytes.buffer);
+}
+
+// format the i'th color of a Uint8Array of RGBA values as a CSS color
+let rgba_string = function(colors, i) {
+    return 'rgba(' + colors[4*i] + ', ' + colors[4*i + 1] + ', ' +
+        colors[4*i + 2] + ', ' + colors[4*i + 3]/255 + ')';
+}
 """
 
 class Scene(draw.Scene):
@@ -5,6 +5,7 @@ import numpy as np
 
 from ... import draw, mesh
 from ...draw import internal
+from .internal import encode_array, encode_colors
 
 LightInfo = collections.namedtuple(
     'LightInfo', ['normal', 'magnitude'])
@@ -23,8 +24,6 @@ class Spheres(draw.Spheres):
                ambient_light=0.4, directional_light=[], **kwargs):
         # in the zdog coordinate system, x is to the right, y is down,
         # and z is toward you
-        lines = []
-
         light_levels = np.linspace(0, 1, self.light_levels + 2)[1:-1]
 
         directional_light = np.atleast_2d(directional_light)
@@ -36,54 +35,62 @@ class Spheres(draw.Spheres):
 
             light_info.append(LightInfo(normal, mag))
 
-        particles = zip(*mesh.unfoldProperties([
-            self.positions*(1, -1, 1), self.diameters, self.colors*255]))
-        for i, (position, (diameter,), color) in enumerate(particles):
-            group_index = 'sphere_{}_{}'.format(name_suffix, i)
-
-            lines.append("""
-            let {group_index} = new Zdog.Group({{
-                addTo: {illo_id},
-                translate: {{x: {pos[0]}, y: {pos[1]}, z: {pos[2]}}},
-                updateSort: true,
-            }});""".format(
-                group_index=group_index, illo_id=illo_id, pos=position))
-
-            (r, g, b) = map(int, ambient_light*color[:3])
-            color_str = '"rgba({}, {}, {}, {})"'.format(r, g, b, color[3]/255)
-
-            lines.append("""
-            new Zdog.Shape({{
-                addTo: {group_index},
-                stroke: {diameter},
-                color: {color},
-            }});""".format(group_index=group_index, pos=position,
-                           diameter=diameter, color=color_str))
-
-            for (light, level_fraction) in itertools.product(
-                    light_info, light_levels):
-                offset = -0.5*diameter*(1 - level_fraction)*light.normal*(1, -1, 1)
-
-                this_color = color.copy()
-                light_level = 1 - level_fraction
-                this_color[:3] *= ambient_light + light_level*light.magnitude
-                this_color.clip(0, 255, this_color)
-
-                (r, g, b) = map(int, this_color[:3])
-
-                # RGB components are 0-255, A component is a float 0-1
-                color_str = '"rgba({}, {}, {}, {})"'.format(r, g, b, color[3]/255)
+        (positions, diameters, colors) = mesh.unfoldProperties([
+            self.positions*(1, -1, 1), self.diameters, self.colors*255])
+
+        # one shading shape per (light, level) pair, shared by all
+        # particles: offsets and strokes are relative to the diameter
+        offsets = []
+        stroke_fractions = []
+        # (particles, 1 + shading shapes, 4), starting with the base shape
+        shape_colors = [colors.copy()]
+        shape_colors[0][:, :3] = np.floor(ambient_light*colors[:, :3])
+        for (light, level_fraction) in itertools.product(
+                light_info, light_levels):
+            offsets.append(-0.5*(1 - level_fraction)*light.normal*(1, -1, 1))
+            stroke_fractions.append(level_fraction)
+
+            light_level = 1 - level_fraction
+            this_color = colors.copy()
+            this_color[:, :3] *= ambient_light + light_level*light.magnitude
+            this_color[:, :3] = np.floor(np.clip(this_color[:, :3], 0, 255))
+            shape_colors.append(this_color)
+        shape_colors = np.stack(shape_colors, axis=1)
+
+        return ["""
+        (function() {{
+            let offsets = {offsets};
+            let stroke_fractions = {stroke_fractions};
+            let positions = {positions};
+            let diameters = {diameters};
+            let colors = {colors};
+            let shapes_per_particle = stroke_fractions.length + 1;
+            for(let i = 0; i < diameters.length; i++) {{
+                let diameter = diameters[i];
+                let group = new Zdog.Group({{
+                    addTo: {illo_id},
+                    translate: {{x: positions[3*i], y: positions[3*i + 1], z: positions[3*i + 2]}},
+                    updateSort: true,
+                }});
 
-                lines.append("""
                 new Zdog.Shape({{
-                    addTo: {group_index},
-                    translate: {{x: {pos[0]}, y: {pos[1]}, z: {pos[2]}}},
-                    color: {color},
-                    stroke: {diameter},
-                    fill: true,
+                    addTo: group,
+                    stroke: diameter,
+                    color: rgba_string(colors, i*shapes_per_particle),
                 }});
-                """.format(
-                    group_index=group_index, pos=offset,
-                    diameter=diameter*level_fraction, color=color_str))
 
-        return lines
+                for(let j = 0; j < stroke_fractions.length; j++) {{
+                    new Zdog.Shape({{
+                        addTo: group,
+                        translate: {{x: diameter*offsets[3*j], y: diameter*offsets[3*j + 1], z: diameter*offsets[3*j + 2]}},
+                        color: rgba_string(colors, i*shapes_per_particle + j + 1),
+                        stroke: diameter*stroke_fractions[j],
+                        fill: true,
+                    }});
+                }}
+            }}
+        }})();""".format(
+            offsets=encode_array(offsets),
+            stroke_fractions=encode_array(stroke_fractions),
+            positions=encode_array(positions), diameters=encode_array(diameters),
+            colors=encode_colors(shape_colors), illo_id=illo_id)]
@@ -1,8 +1,42 @@
+import base64
+
 import numpy as np
 import rowan
 
 from ... import geometry, mesh
 
+TYPED_ARRAY_NAMES = {
+    np.dtype(np.float32): 'Float32Array',
+    np.dtype(np.uint8): 'Uint8Array',
+}
+
+def encode_array(array, dtype=np.float32):
+    """Return a javascript expression that evaluates to the (flattened)
+    contents of an array as a typed array.
+
+    The data are embedded as base64-encoded binary, which is much
+    more compact (and faster to generate) than javascript literals.
+    """
+    dtype = np.dtype(dtype)
+    array = np.ascontiguousarray(array, dtype=dtype.newbyteorder('<'))
+    data = base64.b64encode(array.tobytes()).decode('ascii')
+    return 'decode_array("{}", {})'.format(data, TYPED_ARRAY_NAMES[dtype])
+
+def encode_colors(colors):
+    """Return a javascript expression that evaluates to a Uint8Array of
+    RGBA colors, suitable for use with `rgba_string`.
+
+    :param colors: (..., 4) array of RGBA colors, scaled to [0, 255]
+    """
+    colors = np.clip(colors, 0, 255)
+    colors[..., 3] = np.round(colors[..., 3])
+    return encode_array(colors, np.uint8)
+
+def outline_color_string(colors, index):
+    """Return a javascript expression for a black color with the alpha
+    value of a color encoded by `encode_colors`."""
+    return "'rgba(0, 0, 0, ' + {}[4*({}) + 3]/255 + ')'".format(colors, index)
+
 class PolygonRenderer:
     def _get_path(self):
         return ', '.join('{{x: {}, y: {}}}'.format(*v)
@@ -13,8 +47,6 @@ class PolygonRenderer:
 
         # in the zdog coordinate system, x is to the right, y is down,
         # and z is toward you
-        lines = []
-
         stroke = stroke or 'false'
 
         path = self._get_path()
@@ -22,43 +54,42 @@ class PolygonRenderer:
         # account for clockwise positive rotation
         angles = -self.angles
 
-        particles = zip(*mesh.unfoldProperties([
-            self.positions*(1, -1),
-            angles, self.colors*255]))
-        for i, (position, angle, color) in enumerate(particles):
-            # RGB components are 0-255, A component is a float 0-1
-            (r, g, b) = map(int, color[:3])
-            color_str = '"rgba({}, {}, {}, {})"'.format(r, g, b, color[3]/255)
-            shape_name = 'polygon_{}_{}'.format(name_suffix, i)
-
-            lines.append("""
-            let {shape_name} = new Zdog.Shape({{
-                addTo: {illo_id},
-                rotate: {{z: {angle}}},
-                translate: {{x: {pos[0]}, y: {pos[1]}}},
-                color: {color_str},
-                path: [{path}],
-                fill: true,
-                stroke: {stroke},
-            }});""".format(
-                shape_name=shape_name, illo_id=illo_id, angle=angle,
-                pos=position, color_str=color_str, path=path, stroke=stroke))
-
-            if outline:
-                outline_color = '"rgba(0, 0, 0, {})"'.format(color[3]/255)
-                lines.append("""
+        (positions, angles, colors) = mesh.unfoldProperties([
+            self.positions*(1, -1), angles.reshape((-1, 1)), self.colors*255])
+
+        outline_snippet = ''
+        if outline:
+            outline_snippet = """
                 new Zdog.Shape({{
-                    addTo: {shape_name},
+                    addTo: shape,
                     color: {color},
-                    path: [{path}],
+                    path: path,
                     fill: false,
                     stroke: {stroke},
-                }});
-                """.format(
-                    shape_name=shape_name, color=outline_color,
-                    pos=position, path=path, stroke=outline))
-
-        return lines
+                }});""".format(
+                    color=outline_color_string('colors', 'i'), stroke=outline)
+
+        return ["""
+        (function() {{
+            let path = [{path}];
+            let positions = {positions};
+            let angles = {angles};
+            let colors = {colors};
+            for(let i = 0; i < angles.length; i++) {{
+                let shape = new Zdog.Shape({{
+                    addTo: {illo_id},
+                    rotate: {{z: angles[i]}},
+                    translate: {{x: positions[2*i], y: positions[2*i + 1]}},
+                    color: rgba_string(colors, i),
+                    path: path,
+                    fill: true,
+                    stroke: {stroke},
+                }});{outline}
+            }}
+        }})();""".format(
+            path=path, positions=encode_array(positions),
+            angles=encode_array(angles), colors=encode_colors(colors),
+            illo_id=illo_id, stroke=stroke, outline=outline_snippet)]
 
 class PolyhedronRenderer:
     def render(self, rotation=(1, 0, 0, 0), name_suffix='', illo_id='illo',
@@ -67,8 +98,6 @@ class PolyhedronRenderer:
 
         # in the zdog coordinate system, x is to the right, y is down,
         # and z is toward you
-        lines = []
-
         stroke = stroke or 'false'
 
         (vertices, faces) = geometry.convexHull(self.vertices)
@@ -83,70 +112,69 @@ class PolyhedronRenderer:
             face_normals.append(normal)
 
             path = ', '.join('{{x: {}, y: {}, z: {}}}'.format(*v) for v in vertices[face]*(1, -1, 1))
-            face_paths.append(path)
+            face_paths.append('[{}]'.format(path))
         face_normals = np.array(face_normals, dtype=np.float32)
 
         orientations_euler = rowan.to_euler(
             self.orientations, convention='xyz', axis_type='intrinsic')
 
-        particles = zip(*mesh.unfoldProperties([
+        (positions, orientations, eulers, colors) = mesh.unfoldProperties([
             self.positions*(1, -1, 1), self.orientations,
-            -orientations_euler, self.colors*255]))
-        for i, (position, orientation, eulers, color) in enumerate(particles):
-            group_index = 'convexPoly_{}_{}'.format(name_suffix, i)
-
-            # full rotation to apply to vectors from base orientation
-            # to final scene orientation
-            full_rotation = rowan.multiply(rotation, orientation)
-
-            lines.append("""
-            let {group_index} = new Zdog.Group({{
-                addTo: {illo_id},
-                rotate: {{x: {angle[0]}, y: {angle[1]}, z: {angle[2]}}},
-                translate: {{x: {pos[0]}, y: {pos[1]}, z: {pos[2]}}},
-                updateSort: true,
-            }});""".format(
-                group_index=group_index, illo_id=illo_id, angle=eulers,
-                pos=position))
-
-            for (face_path, normal) in zip(face_paths, face_normals):
-                rotated_normal = rowan.rotate(full_rotation, normal)
-
-                light = ambient_light
-                for direction in directional_light:
-                    light += max(0, -np.dot(rotated_normal, direction))
-                light = np.clip(light, 0, 1)
-
-                (r, g, b) = map(int, light*color[:3])
-
-                # RGB components are 0-255, A component is a float 0-1
-                face_color = '"rgba({}, {}, {}, {})"'.format(r, g, b, color[3]/255)
-
-                lines.append("""
-                new Zdog.Shape({{
-                    addTo: {group_index},
-                    color: {face_color},
-                    path: [{path}],
-                    fill: true,
-                    backface: true,
-                    stroke: {stroke},
-                }});
-                """.format(
-                    group_index=group_index, face_color=face_color, path=face_path,
-                    stroke=stroke))
-
-                if outline:
-                    outline_color = '"rgba(0, 0, 0, {})"'.format(color[3]/255)
-                    lines.append("""
+            -orientations_euler, self.colors*255])
+
+        # full rotation to apply to vectors from base orientation
+        # to final scene orientation
+        full_rotations = rowan.multiply(rotation, orientations)
+        rotated_normals = rowan.rotate(
+            full_rotations[:, np.newaxis], face_normals[np.newaxis])
+
+        directional_light = np.asarray(directional_light, dtype=np.float32).reshape((-1, 3))
+        light_dots = -np.dot(rotated_normals, directional_light.T)
+        light = ambient_light + np.sum(np.maximum(light_dots, 0), axis=-1)
+        light = np.clip(light, 0, 1)
+
+        # (particles, faces, 4)
+        face_colors = np.repeat(colors[:, np.newaxis], len(faces), axis=1)
+        face_colors[..., :3] = np.floor(light[..., np.newaxis]*colors[:, np.newaxis, :3])
+
+        outline_snippet = ''
+        if outline:
+            outline_snippet = """
                     new Zdog.Shape({{
-                        addTo: {group_index},
+                        addTo: group,
                         color: {color},
-                        path: [{path}],
+                        path: faces[j],
                         fill: false,
                         stroke: {stroke},
-                    }});
-                    """.format(
-                        group_index=group_index, color=outline_color, path=face_path,
-                        stroke=outline))
-
-        return lines
+                    }});""".format(
+                        color=outline_color_string('colors', 'i*faces.length + j'),
+                        stroke=outline)
+
+        return ["""
+        (function() {{
+            let faces = [{faces}];
+            let positions = {positions};
+            let eulers = {eulers};
+            let colors = {colors};
+            for(let i = 0; i < positions.length/3; i++) {{
+                let group = new Zdog.Group({{
+                    addTo: {illo_id},
+                    rotate: {{x: eulers[3*i], y: eulers[3*i + 1], z: eulers[3*i + 2]}},
+                    translate: {{x: positions[3*i], y: positions[3*i + 1], z: positions[3*i + 2]}},
+                    updateSort: true,
+                }});
+                for(let j = 0; j < faces.length; j++) {{
+                    new Zdog.Shape({{
+                        addTo: group,
+                        color: rgba_string(colors, i*faces.length + j),
+                        path: faces[j],
+                        fill: true,
+                        backface: true,
+                        stroke: {stroke},
+                    }});{outline}
+                }}
+            }}
+        }})();""".format(
+            faces=', '.join(face_paths), positions=encode_array(positions),
+            eulers=encode_array(eulers), colors=encode_colors(face_colors),
+            illo_id=illo_id, stroke=stroke, outline=outline_snippet)]
@@ -1,64 +1,188 @@
-from collections import defaultdict, namedtuple
+from collections import namedtuple, OrderedDict
+import functools
+import hashlib
+import sys
 
 import numpy as np
 
+GeometryCacheInfo = namedtuple(
+    'GeometryCacheInfo', ['hits', 'misses', 'entries', 'nbytes', 'max_bytes'])
+
+class GeometryCache:
+    """Least-recently-used cache for the results of geometric
+    computations, keyed by the content of their arguments.
+
+    Functions decorated with :py:meth:`memoize` (such as
+    :py:func:`convexHull` and :py:func:`plato.mesh.convexPolyhedronMesh`)
+    only recompute their result when called with arguments that
+    have not been seen recently, so rendering many frames of the same
+    shape only builds its geometry once. Results are copied as they
+    are stored and retrieved, so callers may freely modify them.
+
+    The shared instance is available as `plato.geometry.cache`::
+
+        plato.geometry.cache.max_bytes = 256*1024*1024
+        print(plato.geometry.cache.info())
+        plato.geometry.cache.clear()
+
+    :param max_bytes: Approximate memory budget for cached results, in bytes. Setting this to 0 disables caching.
+    """
+    def __init__(self, max_bytes=64*1024*1024):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        """Remove all cached results and reset the hit/miss statistics."""
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.hits = self.misses = 0
+
+    def info(self):
+        """Return a GeometryCacheInfo object with the number of cache
+        hits and misses, the number of cached results, and their
+        approximate size in bytes."""
+        return GeometryCacheInfo(
+            self.hits, self.misses, len(self._entries), self._nbytes,
+            self.max_bytes)
+
+    def memoize(self, function):
+        """Decorator to cache the results of a function using this
+        cache. The original function is available as the `uncached`
+        attribute of the result."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = _cacheKey(function, args, kwargs)
+
+            if key is None or self.max_bytes <= 0:
+                return function(*args, **kwargs)
+
+            try:
+                (result, _) = self._entries[key]
+                self._entries.move_to_end(key)
+                self.hits += 1
+            except KeyError:
+                self.misses += 1
+                result = function(*args, **kwargs)
+                self._insert(key, _copyResult(result))
+                return result
+
+            return _copyResult(result)
+
+        wrapper.uncached = function
+        return wrapper
+
+    def _insert(self, key, result):
+        size = _approximateSize(result)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (result, size)
+        self._nbytes += size
+
+        while self._nbytes > self.max_bytes:
+            (_, (_, evictedSize)) = self._entries.popitem(last=False)
+            self._nbytes -= evictedSize
+
+def _cacheKey(function, args, kwargs):
+    """Generate a hashable key from the contents of the given
+    arguments, or None if any argument can't be interpreted as a
+    numeric array."""
+    key = [function.__module__, function.__qualname__]
+    for (name, arg) in list(enumerate(args)) + sorted(kwargs.items()):
+        try:
+            arg = np.ascontiguousarray(arg)
+        except (TypeError, ValueError):
+            return None
+        if arg.dtype.hasobject:
+            return None
+
+        key.append((name, arg.dtype.str, arg.shape,
+                    hashlib.sha1(arg.reshape(-1).view(np.uint8)).digest()))
+    return tuple(key)
+
+def _copyResult(value):
+    """Copy the arrays and mutable containers of a result, so that
+    modifications by the caller do not affect cached values."""
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    elif isinstance(value, list):
+        return [_copyResult(elt) for elt in value]
+    elif isinstance(value, set):
+        return set(value)
+    elif isinstance(value, tuple) and hasattr(value, '_fields'):
+        return type(value)(*(_copyResult(elt) for elt in value))
+    elif isinstance(value, tuple):
+        return tuple(_copyResult(elt) for elt in value)
+    return value
+
+def _approximateSize(value):
+    if isinstance(value, np.ndarray):
+        # views do not report the size of their underlying buffer
+        return sys.getsizeof(value) + (value.nbytes if value.base is not None else 0)
+    elif isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_approximateSize(elt) for elt in value)
+    return sys.getsizeof(value)
+
+cache = GeometryCache()
+
+@cache.memoize
 def convexHull(vertices, tol=1e-6):
     """Returns an array of vertices and a list of faces (vertex
     indices) for the convex hull of the given set of vertice. Uses
     scipy's quickhull wrapper."""
     from scipy.spatial import cKDTree, ConvexHull
+    from scipy.sparse import coo_matrix
     from scipy.sparse.csgraph import connected_components
 
     hull = ConvexHull(vertices)
+    Ntri = len(hull.simplices)
     # Triangles in the same face will be defined by the same linear equalities
     dist = cKDTree(hull.equations)
-    trianglePairs = dist.query_pairs(tol)
+    trianglePairs = dist.query_pairs(tol, output_type='ndarray')
 
-    connectivity = np.zeros((len(hull.simplices), len(hull.simplices)), dtype=np.int32)
-
-    for (i, j) in trianglePairs:
-        connectivity[i, j] = connectivity[j, i] = 1
+    connectivity = coo_matrix(
+        (np.ones(len(trianglePairs), dtype=np.int32),
+         (trianglePairs[:, 0], trianglePairs[:, 1])), shape=(Ntri, Ntri))
 
     # connected_components returns (number of faces, cluster index for each input)
-    (_, joinTarget) = connected_components(connectivity, directed=False)
-    faces = defaultdict(list)
-    norms = defaultdict(list)
-    for (idx, target) in enumerate(joinTarget):
-        faces[target].append(idx)
-        norms[target] = hull.equations[idx][:3]
-
-    # a list of sets of all vertex indices in each face
-    faceVerts = [set(hull.simplices[faces[faceIndex]].flat) for faceIndex in sorted(faces)]
+    (Nfaces, joinTarget) = connected_components(connectivity, directed=False)
     # normal vector for each face
-    faceNorms = [norms[faceIndex] for faceIndex in sorted(faces)]
+    faceNorms = np.empty((Nfaces, 3), dtype=np.float64)
+    faceNorms[joinTarget] = hull.equations[:, :3]
 
-    # polygonal faces
-    polyFaces = []
-    for (norm, faceIndices) in zip(faceNorms, faceVerts):
-        face = np.array(list(faceIndices), dtype=np.uint32)
-        N = len(faceIndices)
+    # (face, vertex) index pairs for all unique vertices in each face,
+    # ordered by face index and then vertex index
+    Npoints = len(hull.points)
+    keys = np.unique(np.repeat(joinTarget, 3)*Npoints + hull.simplices.reshape(-1))
+    (pairFaces, pairVerts) = np.divmod(keys, Npoints)
+    faceCounts = np.bincount(pairFaces, minlength=Nfaces)
+    faceStarts = np.cumsum(faceCounts) - faceCounts
 
-        r = hull.points[face]
-        rcom = np.mean(r, axis=0)
+    r = hull.points[pairVerts]
+    rcom = np.array([np.bincount(pairFaces, weights=r[:, dim], minlength=Nfaces)
+                     for dim in range(3)]).T/faceCounts[:, np.newaxis]
 
-        # plane_{a, b}: basis vectors in the plane
-        plane_a = r[0] - rcom
-        plane_a /= np.sqrt(np.sum(plane_a**2))
-        plane_b = np.cross(norm, plane_a)
+    # plane_{a, b}: basis vectors in the plane of each face
+    plane_a = r[faceStarts] - rcom
+    plane_a /= np.linalg.norm(plane_a, axis=-1, keepdims=True)
+    plane_b = np.cross(faceNorms, plane_a)
 
-        dr = r - rcom[np.newaxis, :]
+    dr = r - rcom[pairFaces]
 
-        thetas = np.arctan2(dr.dot(plane_b), dr.dot(plane_a))
+    thetas = np.arctan2(np.sum(dr*plane_b[pairFaces], axis=-1),
+                        np.sum(dr*plane_a[pairFaces], axis=-1))
 
-        sortidx = np.argsort(thetas)
+    # sort by angle within each face
+    sortidx = np.lexsort((thetas, pairFaces))
 
-        face = face[sortidx]
-        polyFaces.append(face)
+    # polygonal faces
+    polyFaces = np.split(pairVerts[sortidx].astype(np.uint32), faceStarts[1:])
 
     return (hull.points, polyFaces)
 
 ConvexDecomposition = namedtuple('ConvexDecomposition', ['vertices', 'edges', 'faces'])
 
+@cache.memoize
 def convexDecomposition(vertices):
     """Decompose a convex polyhedron specified by a list of vertices into
     vertices, faces, and edges. Returns a ConvexDecomposition object.
@@ -119,36 +243,79 @@ def insetPolygon(vertices, distance):
     and is intended as a replacement for `Outline`. Vertices should be
     planar and specified in right-handed order.
 
+    To inset many polygons at once, see :py:func:`insetPolygons`.
+
     :param vertices: iterable of (x, y) or (x, y, z) vertex coordinates
     :param distance: Distance (width) to inset by
     """
     vertices = np.asarray(vertices)
+    return insetPolygons(vertices, [len(vertices)], distance)
+
+def insetPolygons(vertices, counts, distance, normals=None):
+    """Inset a collection of planar polygons at once (see
+    :py:func:`insetPolygon`).
+
+    Polygons are given in compressed (CSR-style) form: the vertices
+    of all polygons are concatenated into a single array, with the
+    number of vertices of each polygon given by counts. The
+    intersection point of each pair of adjacent inset edges is found
+    in closed form, so no per-vertex linear systems are solved.
+
+    :param vertices: (N, 2) or (N, 3) array of the vertices of all polygons
+    :param counts: (Np,) array of the number of vertices in each polygon
+    :param distance: Distance (width) to inset by
+    :param normals: (Np, 3) array of unit normal vectors of 3D polygons; if not given, they are computed from the vertices of each polygon
+    :returns: (N, 2) or (N, 3) array of inset vertices
+    """
+    vertices = np.asarray(vertices)
+    dtype = vertices.dtype if vertices.dtype.kind == 'f' else np.float64
     dimension = vertices.shape[1]
 
-    rijs = np.roll(vertices, -1, axis=0) - vertices
-    face_normal = np.cross(rijs[0], rijs[1])
-    face_normal /= np.linalg.norm(face_normal)
+    counts = np.asarray(counts, dtype=np.intp)
+    starts = np.cumsum(counts) - counts
+    polygons = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(len(vertices)) - starts[polygons]
+    prev = starts[polygons] + (local - 1) % counts[polygons]
+    next = starts[polygons] + (local + 1) % counts[polygons]
+
+    rijs = vertices[next] - vertices
     rijs_normal = rijs/np.linalg.norm(rijs, axis=-1, keepdims=True)
     if dimension == 3:
-        perps = np.cross([face_normal], rijs_normal)
+        if normals is None:
+            # sum of edge cross products (Newell's method), which is
+            # robust to collinear vertices
+            normals = np.add.reduceat(np.cross(vertices, vertices[next]), starts)
+            normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+        perps = np.cross(np.asarray(normals)[polygons], rijs_normal)
         perps /= np.linalg.norm(perps, axis=-1, keepdims=True)
     else:
         perps = np.dot(rijs_normal, [[0, 1], [-1, 0]])
 
-    # construct a linear system of equations Ax=b solving for the
-    # intersection point of each inset vertex
-    A = np.tile(rijs_normal[:, :, np.newaxis], (1, 1, 2))
-    A[:, :, 1] = np.roll(rijs_normal, 1, axis=0)
-    b = distance*(perps - np.roll(perps, 1, axis=0))
-
-    if dimension == 3:
-        lams = np.array([np.linalg.lstsq(a_, b_, rcond=-1)[0]
-                         for (a_, b_) in zip(A, b)], dtype=np.float32)
-    else:
-        lams = np.linalg.solve(A, b)
-
-    result = vertices - lams[..., 1, np.newaxis]*rijs_normal + distance*perps
-    return result
+    # closed-form least-squares solution (which is exact, for planar
+    # polygons) of the linear system Ax=b for the intersection point
+    # of each pair of inset edges, with A = [rijs_normal, prev_rijs_normal]
+    prev_rijs_normal = rijs_normal[prev]
+    b = distance*(perps - perps[prev])
+    cos_theta = np.sum(rijs_normal*prev_rijs_normal, axis=-1)
+    sin2_theta = 1 - cos_theta**2
+    # inset edges meeting at a collinear vertex do not intersect at a
+    # single point; such vertices are simply moved along the edge normal
+    parallel = sin2_theta <= 100*np.finfo(sin2_theta.dtype).eps
+    lams = (np.sum(prev_rijs_normal*b, axis=-1) -
+            cos_theta*np.sum(rijs_normal*b, axis=-1))/np.where(parallel, 1, sin2_theta)
+    lams[parallel] = 0
+
+    result = vertices - lams[:, np.newaxis]*rijs_normal + distance*perps
+    return result.astype(dtype, copy=False)
+
+def _fanIndices(starts, counts):
+    """Return (Nt, 3) triangle indices fanning out from the first vertex
+    of each polygon, given the start and size of each polygon."""
+    triCounts = np.maximum(counts - 2, 0)
+    triFaces = np.repeat(np.arange(len(counts)), triCounts)
+    local = np.arange(len(triFaces)) - (np.cumsum(triCounts) - triCounts)[triFaces] + 1
+    firsts = starts[triFaces]
+    return np.array([firsts, firsts + local, firsts + local + 1]).T
 
 def massProperties(vertices, faces=None, factor=1.):
     """Returns (mass, center of mass, moment of inertia tensor in (xx,
@@ -163,74 +330,133 @@ def massProperties(vertices, faces=None, factor=1.):
     For details on the 3D case, confer "Polyhedral Mass Properties
     (Revisited) by David Eberly, available at:
 
-    http://www.geometrictools.com/Documentation/PolyhedralMassProperties.pdf"""
-    vertices = np.array(vertices)
+    http://www.geometrictools.com/Documentation/PolyhedralMassProperties.pdf
+
+    To compute the properties of many shapes at once, see
+    :py:func:`batchMassProperties`."""
+    vertices = np.asarray(vertices, dtype=np.float64)
+
+    faceSizes = faceCounts = None
+    if faces is not None:
+        faceSizes = [len(face) for face in faces]
+        faceCounts = [len(faces)]
+        faces = np.concatenate(faces) if len(faces) else []
+
+    (masses, coms, moments) = batchMassProperties(
+        vertices, [len(vertices)], faces, faceSizes, faceCounts, factor)
+    return masses[0], coms[0], moments[0]
+
+def batchMassProperties(vertices, vertexCounts, faces=None, faceSizes=None,
+                        faceCounts=None, factor=1.):
+    """Returns (mass, center of mass, moment of inertia tensor) arrays
+    for a collection of shapes, in the same form as
+    :py:func:`massProperties`.
+
+    Shapes are given in compressed (CSR-style) form: the vertices of
+    all shapes are concatenated into a single array, with the number
+    of vertices of each shape given by vertexCounts. For 3D shapes,
+    the faces of all shapes are concatenated in the same way, and
+    face vertex indices are relative to the start of the shape they
+    belong to. If faces is not given, the vertices of each shape are
+    treated as a single polygon (which must be 2D to have any area).
+
+    :param vertices: (N, 2) or (N, 3) array of the vertices of all shapes
+    :param vertexCounts: (Ns,) array of the number of vertices of each shape
+    :param faces: Concatenated vertex indices of all faces of all shapes
+    :param faceSizes: Number of vertices in each face
+    :param faceCounts: (Ns,) array of the number of faces of each shape
+    :param factor: Factor (density) to scale each mass and moment of inertia by
+    :returns: ((Ns,) masses, (Ns, D) centers of mass, (Ns, 6) moments of inertia in (xx, xy, xz, yy, yz, zz) order)
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    vertexCounts = np.asarray(vertexCounts, dtype=np.intp)
+    vertexStarts = np.cumsum(vertexCounts) - vertexCounts
+    shapeCount = len(vertexCounts)
 
     # Specially handle 2D
-    if len(vertices[0]) == 2:
+    if vertices.shape[1] == 2:
+        shapes = np.repeat(np.arange(shapeCount), vertexCounts)
+        local = np.arange(len(vertices)) - vertexStarts[shapes]
+        shifted = vertices[vertexStarts[shapes] + (local + 1) % vertexCounts[shapes]]
+
         # First, calculate the center of mass and center the vertices
-        shifted = list(vertices[1:]) + [vertices[0]]
-        a_s = [(x1*y2 - x2*y1) for ((x1, y1), (x2, y2))
-               in zip(vertices, shifted)]
-        triangleCOMs = [(v0 + v1)/3 for (v0, v1) in zip(vertices, shifted)]
-        COM = np.sum([a*com for (a, com) in zip(a_s, triangleCOMs)],
-                     axis=0)/np.sum(a_s)
-        vertices -= COM
-
-        shifted = list(vertices[1:]) + [vertices[0]]
+        a_s = vertices[:, 0]*shifted[:, 1] - shifted[:, 0]*vertices[:, 1]
+        twiceAreas = np.bincount(shapes, a_s, minlength=shapeCount)
+        COMs = np.array([np.bincount(shapes, a_s*(vertices[:, i] + shifted[:, i])/3,
+                                     minlength=shapeCount) for i in range(2)]).T
+        COMs /= twiceAreas[:, np.newaxis]
+        vertices = vertices - COMs[shapes]
+        shifted = shifted - COMs[shapes]
+        a_s = vertices[:, 0]*shifted[:, 1] - shifted[:, 0]*vertices[:, 1]
+
         f = lambda x1, x2: x1*x1 + x1*x2 + x2*x2
-        Ixyfs = [(f(y1, y2), f(x1, x2)) for ((x1, y1), (x2, y2))
-                 in zip(vertices, shifted)]
+        Ix = np.bincount(shapes, a_s*f(vertices[:, 1], shifted[:, 1]),
+                         minlength=shapeCount)/12.
+        Iy = np.bincount(shapes, a_s*f(vertices[:, 0], shifted[:, 0]),
+                         minlength=shapeCount)/12.
 
-        Ix = sum(I*a for ((I, _), a) in zip(Ixyfs, a_s))/12.
-        Iy = sum(I*a for ((_, I), a) in zip(Ixyfs, a_s))/12.
+        I = np.zeros((shapeCount, 6))
+        (I[:, 0], I[:, 3], I[:, 5]) = (Ix, Iy, Ix + Iy)
 
-        I = np.array([Ix, 0, 0, Iy, 0, Ix + Iy])
+        return twiceAreas/2*factor, COMs, factor*I
 
-        return area(vertices)*factor, COM, factor*I
+    if faces is None:
+        (faces, faceSizes, faceCounts) = (
+            np.arange(len(vertices)) - np.repeat(vertexStarts, vertexCounts),
+            vertexCounts, np.ones(shapeCount, dtype=np.intp))
+
+    faces = np.asarray(faces, dtype=np.intp)
+    faceSizes = np.asarray(faceSizes, dtype=np.intp)
+    faceCounts = np.asarray(faceCounts, dtype=np.intp)
+    faceShapes = np.repeat(np.arange(shapeCount), faceCounts)
+    faces = faces + np.repeat(vertexStarts[faceShapes], faceSizes)
+    faceStarts = np.cumsum(faceSizes) - faceSizes
+    triangles = faces[_fanIndices(faceStarts, faceSizes)].reshape((-1, 3))
+    shapes = np.repeat(faceShapes, np.maximum(faceSizes - 2, 0))
 
     # multiplicative factors
     factors = 1./np.array([6, 24, 24, 24, 60, 60, 60, 120, 120, 120])
 
-    # order: 1, x, y, z, x^2, y^2, z^2, xy, yz, zx
-    intg = np.zeros(10)
-
-    for (v0, v1, v2) in fanTriangles(vertices, faces):
-        # (xi, yi, zi) = vi
-        abc1 = v1 - v0
-        abc2 = v2 - v0
-        d = np.cross(abc1, abc2)
-
-        temp0 = v0 + v1
-        f1 = temp0 + v2
-        temp1 = v0*v0
-        temp2 = temp1 + v1*temp0
-        f2 = temp2 + v2*f1
-        f3 = v0*temp1 + v1*temp2 + v2*f2
-        g0 = f2 + v0*(f1 + v0)
-        g1 = f2 + v1*(f1 + v1)
-        g2 = f2 + v2*(f1 + v2)
-
-        intg[0] += d[0]*f1[0]
-        intg[1:4] += d*f2
-        intg[4:7] += d*f3
-        intg[7] += d[0]*(v0[1]*g0[0] + v1[1]*g1[0] + v2[1]*g2[0])
-        intg[8] += d[1]*(v0[2]*g0[1] + v1[2]*g1[1] + v2[2]*g2[1])
-        intg[9] += d[2]*(v0[0]*g0[2] + v1[0]*g1[2] + v2[0]*g2[2])
+    # (xi, yi, zi) = vi
+    (v0, v1, v2) = (vertices[triangles[:, i]] for i in range(3))
+    abc1 = v1 - v0
+    abc2 = v2 - v0
+    d = np.cross(abc1, abc2)
+
+    temp0 = v0 + v1
+    f1 = temp0 + v2
+    temp1 = v0*v0
+    temp2 = temp1 + v1*temp0
+    f2 = temp2 + v2*f1
+    f3 = v0*temp1 + v1*temp2 + v2*f2
+    g0 = f2 + v0*(f1 + v0)
+    g1 = f2 + v1*(f1 + v1)
+    g2 = f2 + v2*(f1 + v2)
 
+    # order: 1, x, y, z, x^2, y^2, z^2, xy, yz, zx
+    terms = np.empty((len(triangles), 10))
+    terms[:, 0] = d[:, 0]*f1[:, 0]
+    terms[:, 1:4] = d*f2
+    terms[:, 4:7] = d*f3
+    terms[:, 7] = d[:, 0]*(v0[:, 1]*g0[:, 0] + v1[:, 1]*g1[:, 0] + v2[:, 1]*g2[:, 0])
+    terms[:, 8] = d[:, 1]*(v0[:, 2]*g0[:, 1] + v1[:, 2]*g1[:, 1] + v2[:, 2]*g2[:, 1])
+    terms[:, 9] = d[:, 2]*(v0[:, 0]*g0[:, 2] + v1[:, 0]*g1[:, 2] + v2[:, 0]*g2[:, 2])
+
+    intg = np.array([np.bincount(shapes, column, minlength=shapeCount)
+                     for column in terms.T]).T
     intg *= factors
 
-    mass = intg[0]
-    com = intg[1:4]/mass
+    mass = intg[:, 0]
+    com = intg[:, 1:4]/mass[:, np.newaxis]
 
-    moment = np.zeros(6)
+    moment = np.zeros((shapeCount, 6))
 
-    moment[0] = intg[5] + intg[6] - mass*np.sum(com[1:]**2)
-    moment[1] = -(intg[7] - mass*com[0]*com[1])
-    moment[2] = -(intg[9] - mass*com[0]*com[2])
-    moment[3] = intg[4] + intg[6] - mass*np.sum(com[[0, 2]]**2)
-    moment[4] = -(intg[8] - mass*com[1]*com[2])
-    moment[5] = intg[4] + intg[5] - mass*np.sum(com[:2]**2)
+    moment[:, 0] = intg[:, 5] + intg[:, 6] - mass*np.sum(com[:, 1:]**2, axis=-1)
+    moment[:, 1] = -(intg[:, 7] - mass*com[:, 0]*com[:, 1])
+    moment[:, 2] = -(intg[:, 9] - mass*com[:, 0]*com[:, 2])
+    moment[:, 3] = intg[:, 4] + intg[:, 6] - mass*np.sum(com[:, [0, 2]]**2, axis=-1)
+    moment[:, 4] = -(intg[:, 8] - mass*com[:, 1]*com[:, 2])
+    moment[:, 5] = intg[:, 4] + intg[:, 5] - mass*np.sum(com[:, :2]**2, axis=-1)
 
     return mass*factor, com, moment*factor
 
@@ -241,6 +467,160 @@ def twiceTriangleArea(p0, p1, p2):
     p2 = p2 - p0;
     return p1[0]*p2[1] - p2[0]*p1[1];
 
+def _triangleCrosses(vertices, i, j, k):
+    """Returns twice the signed area of each triangle (i, j, k), given
+    as arrays of indices into vertices."""
+    (ij, ik) = (vertices[j] - vertices[i], vertices[k] - vertices[i])
+    return ij[..., 0]*ik[..., 1] - ij[..., 1]*ik[..., 0]
+
+def _blockedEars(vertices, candidates, prev, next, blockers, sortKeys, maxPairs=1 << 20):
+    """Returns a mask of which candidate ear vertices have a blocking
+    vertex of the same polygon strictly inside their ear triangle.
+
+    sortKeys orders vertices by polygon, then x coordinate, so that
+    only blockers within the x extent of each triangle are tested.
+    """
+    result = np.zeros(len(candidates), dtype=bool)
+    blockers = blockers[np.argsort(sortKeys[blockers], kind='stable')]
+    blockerKeys = sortKeys[blockers]
+
+    triangles = np.array([prev[candidates], candidates, next[candidates]])
+    keys = sortKeys[triangles]
+    lower = np.searchsorted(blockerKeys, np.min(keys, axis=0), 'left')
+    upper = np.searchsorted(blockerKeys, np.max(keys, axis=0), 'right')
+    pairCounts = upper - lower
+    pairEnds = np.cumsum(pairCounts)
+
+    start = 0
+    while start < len(candidates):
+        # process candidates in chunks of about maxPairs pairs
+        stop = np.searchsorted(pairEnds, pairEnds[start] - pairCounts[start] + maxPairs)
+        stop = min(len(candidates), max(start + 1, stop))
+        counts = pairCounts[start:stop]
+        pairs = np.repeat(np.arange(start, stop), counts)
+        offsets = np.arange(len(pairs)) - np.repeat(np.cumsum(counts) - counts, counts)
+        points = blockers[np.repeat(lower[start:stop], counts) + offsets]
+
+        (i, j, k) = triangles[:, pairs]
+        inside = np.logical_and.reduce([
+            _triangleCrosses(vertices, i, j, points) > 0,
+            _triangleCrosses(vertices, j, k, points) > 0,
+            _triangleCrosses(vertices, k, i, points) > 0,
+            points != i, points != k])
+        result[pairs[inside]] = True
+        start = stop
+
+    return result
+
+def triangulatePolygons(polygons):
+    """Triangulate a set of simple 2D polygons at once.
+
+    Polygons are triangulated by ear clipping, which is performed on
+    all polygons (and on many non-adjacent ears of each polygon)
+    simultaneously. Only reflex vertices are tested for containment
+    in candidate ears, and convex polygons are simply fanned out from
+    their first vertex. Resulting triangles are wound counterclockwise
+    regardless of the orientation of each polygon.
+
+    :param polygons: iterable of (N, 2) arrays of polygon vertices (with N >= 3 for each polygon)
+    :returns: list of (N - 2, 3) uint32 arrays of vertex indices into each polygon
+    """
+    polygons = [np.asarray(vertices, dtype=np.float64).reshape((-1, 2))
+                for vertices in polygons]
+    if not polygons:
+        return []
+    counts = np.array([len(vertices) for vertices in polygons], dtype=np.int64)
+    if np.any(counts < 3):
+        raise RuntimeError('Trying to triangulate a polygon with no area')
+
+    vertices = np.concatenate(polygons)
+    starts = np.cumsum(counts) - counts
+    polygonIndices = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(len(vertices)) - starts[polygonIndices]
+
+    # link each vertex to its neighbors, such that each polygon is
+    # traversed counterclockwise
+    shifted = np.roll(vertices, -1, axis=0)
+    shifted[starts + counts - 1] = vertices[starts]
+    crosses = vertices[:, 0]*shifted[:, 1] - shifted[:, 0]*vertices[:, 1]
+    clockwise = (np.add.reduceat(crosses, starts) < 0)[polygonIndices]
+    forward = starts[polygonIndices] + (local + 1) % counts[polygonIndices]
+    backward = starts[polygonIndices] + (local - 1) % counts[polygonIndices]
+    next = np.where(clockwise, backward, forward)
+    prev = np.where(clockwise, forward, backward)
+
+    # (polygon, triangle) pairs found in each ear-clipping pass
+    resultPolygons = []
+    resultTriangles = []
+
+    # convex polygons are simply fanned out from their first vertex
+    crosses = _triangleCrosses(vertices, prev, np.arange(len(vertices)), next)
+    convex = np.bincount(polygonIndices, crosses <= 0, minlength=len(counts)) == 0
+    fanVertices = np.flatnonzero(convex[polygonIndices])
+    fanVertices = fanVertices[local[fanVertices] >= 2]
+    fans = np.array([starts[polygonIndices[fanVertices]],
+                     backward[fanVertices], fanVertices]).T
+    fans[clockwise[fanVertices]] = fans[clockwise[fanVertices]][:, [0, 2, 1]]
+    resultPolygons.append(polygonIndices[fanVertices])
+    resultTriangles.append(fans)
+
+    # order vertices by polygon, then by x coordinate
+    xs = vertices[:, 0] - np.min(vertices[:, 0])
+    sortKeys = polygonIndices*(2*np.max(xs) + 1) + xs
+
+    ringSizes = np.where(convex, 0, counts)
+    active = np.flatnonzero(~convex[polygonIndices])
+    randomState = np.random.RandomState(13)
+
+    while len(active):
+        activePolygons = polygonIndices[active]
+        crosses = _triangleCrosses(vertices, prev[active], active, next[active])
+
+        # only reflex (or degenerate) vertices can lie inside an ear
+        isBlocker = crosses <= 0
+        candidates = np.flatnonzero(~isBlocker)
+        ears = np.zeros(len(active), dtype=bool)
+        ears[candidates] = ~_blockedEars(
+            vertices, active[candidates], prev, next, active[isBlocker], sortKeys)
+
+        # clip a set of ears with no two adjacent to each other,
+        # using random priorities to break ties
+        isEar = np.zeros(len(vertices), dtype=bool)
+        isEar[active[ears]] = True
+        priorities = np.zeros(len(vertices))
+        priorities[active] = randomState.random_sample(len(active))
+        (before, after) = (prev[active], next[active])
+        clip = np.logical_and.reduce([
+            ears,
+            np.logical_or(~isEar[before], priorities[active] < priorities[before]),
+            np.logical_or(~isEar[after], priorities[active] < priorities[after])])
+
+        # if numerical problems leave a polygon without ears, clip
+        # its most convex vertex instead
+        stuck = np.bincount(activePolygons, clip, minlength=len(counts)) == 0
+        if np.any(stuck[activePolygons]):
+            order = np.lexsort((crosses, activePolygons))
+            last = np.ones(len(order), dtype=bool)
+            last[:-1] = activePolygons[order][1:] != activePolygons[order][:-1]
+            fallback = order[last]
+            clip[fallback[stuck[activePolygons[fallback]]]] = True
+
+        clipped = active[clip]
+        resultPolygons.append(polygonIndices[clipped])
+        resultTriangles.append(np.array([prev[clipped], clipped, next[clipped]]).T)
+        next[prev[clipped]] = next[clipped]
+        prev[next[clipped]] = prev[clipped]
+
+        ringSizes -= np.bincount(polygonIndices[clipped], minlength=len(counts))
+        active = active[~clip]
+        active = active[ringSizes[polygonIndices[active]] > 2]
+
+    resultPolygons = np.concatenate(resultPolygons)
+    resultTriangles = np.concatenate(resultTriangles).reshape((-1, 3))
+    order = np.argsort(resultPolygons, kind='stable')
+    resultTriangles = resultTriangles[order] - starts[resultPolygons[order], np.newaxis]
+    return np.split(resultTriangles.astype(np.uint32), np.cumsum(counts - 2)[:-1])
+
 ## Compute basic properties of a polygon, stored as a list of adjacent vertices
 #
 # ### Attributes:
@@ -293,67 +673,7 @@ class Polygon:
         triangles.
 
         """
-
-        if self.n == 3:
-            vertices = np.array(self.vertices)
-            cross = np.cross(vertices[1] - vertices[0], vertices[2] - vertices[0])
-            if cross > 0:
-                return np.array([[0, 1, 2]], dtype=np.uint32)
-            else:
-                return np.array([[0, 2, 1]], dtype=np.uint32)
-        elif self.n < 3:
-            raise RuntimeError('Trying to triangulate a polygon with no area')
-
-        result = [];
-        remaining = self.vertices + np.random.uniform(-1, 1, size=self.vertices.shape)*1e-6
-        remainingIndices = range(len(remaining))
-
-        # step around the shape and grab ears until only 4 vertices are left
-        while len(remaining) > 4:
-            signs = [];
-            for vert in (remaining[-1], remaining[1]):
-                arms1 = remaining[2:-2] - vert;
-                arms2 = vert - remaining[3:-1];
-                signs.append(np.sign(arms1[:, 1]*arms2[:, 0] -
-                                        arms2[:, 1]*arms1[:, 0]));
-            for rest in (remaining[2:-2], remaining[3:-1]):
-                arms1 = remaining[-1] - rest;
-                arms2 = rest - remaining[1];
-                signs.append(np.sign(arms1[:, 1]*arms2[:, 0] -
-                                        arms2[:, 1]*arms1[:, 0]));
-
-            cross = np.any(np.bitwise_and(signs[0] != signs[1],
-                                                signs[2] != signs[3]));
-            if not cross and twiceTriangleArea(remaining[-1], remaining[0],
-                                               remaining[1]) > 0.:
-                # triangle [-1, 0, 1] is a good one, cut it out
-                result.append((remainingIndices[-1], remainingIndices[0],
-                               remainingIndices[1]))
-                remaining = remaining[1:];
-                remainingIndices = remainingIndices[1:]
-            else:
-                remaining = np.roll(remaining, 1, axis=0);
-                remainingIndices = np.roll(remainingIndices, 1, axis=0)
-
-        # there must now be 0 or 1 concave vertices left; find the
-        # concave vertex (or a vertex) and fan out from it
-        vertices = remaining;
-        shiftedUp = vertices - np.roll(vertices, 1, axis=0);
-        shiftedBack = np.roll(vertices, -1, axis=0) - vertices;
-
-        # signed area for each triangle (i-1, i, i+1) for vertex i
-        areas = shiftedBack[:, 1]*shiftedUp[:, 0] - shiftedUp[:, 1]*shiftedBack[:, 0];
-
-        concave = np.where(areas < 0.)[0];
-
-        fan = (concave[0] if len(concave) else 0);
-        fanIndex = remainingIndices[fan]
-        remainingIndices = np.roll(remainingIndices, -fan, axis=0)[1:];
-
-        result.extend([(fanIndex, remainingIndices[0], remainingIndices[1]),
-                       (fanIndex, remainingIndices[1], remainingIndices[2])]);
-
-        return np.array(result, dtype=np.uint32);
+        return triangulatePolygons([self.vertices])[0]
 
 ## \internal Outline class for Polygon
 # is not meant to be called except by Polygon. Use at own discretion
@@ -1,39 +1,58 @@
 
-from collections import defaultdict, namedtuple
-from itertools import repeat
+from collections import namedtuple
 
 import numpy as np
 
-from .geometry import convexHull, insetPolygon, massProperties, Polygon
+from .geometry import (
+    _fanIndices, cache, convexHull, insetPolygons, massProperties, Polygon)
 
-def computeNormals_(vertices, indices):
-    # first, compute the normal for each face
-    expandedVertices = vertices[indices]
+def computeNormals_(vertices, indices, weighting='uniform'):
+    """Compute the normal vector of each vertex in a triangle mesh.
+
+    Each vertex normal is the normalized, weighted sum of the normals
+    of the faces adjacent to that vertex. Vertices that are not part
+    of any triangle are given a normal of (0, 0, 0).
+
+    :param vertices: (N, 3) array of vertex coordinates
+    :param indices: (Nt, 3) array of vertex indices for each triangle
+    :param weighting: Weight to give each adjacent face normal: 'uniform' (all faces weighted equally), 'area' (weighted by triangle area), or 'angle' (weighted by the interior angle of the triangle at the vertex)
+    """
+    vertices = np.asarray(vertices)
+    indices = np.asarray(indices, dtype=np.intp).reshape((-1, 3))
+
+    # first, compute the normal for each face; the magnitude of the
+    # cross product is twice the area of the triangle
+    expandedVertices = vertices[indices].astype(np.float64)
     faceNormals = np.cross(expandedVertices[:, 1, :] - expandedVertices[:, 0, :],
-                            expandedVertices[:, 2, :] - expandedVertices[:, 0, :])
-    faceNormals /= np.linalg.norm(faceNormals, axis=-1, keepdims=True)
-
-    # store the normals of faces adjacent to each vertex here
-    vertexFaceNormals = defaultdict(list)
-
-    for ((i, j, k), normal) in zip(indices, faceNormals):
-        vertexFaceNormals[i].append(normal)
-        vertexFaceNormals[j].append(normal)
-        vertexFaceNormals[k].append(normal)
-
-    # use the (normalized) mean normal of each adjacent face
-    # as the vertex normal
-    vertexNormals = []
-    for i in range(len(vertices)):
-        if vertexFaceNormals[i]:
-            normal = np.mean(vertexFaceNormals[i], axis=0)
-            normal /= np.linalg.norm(normal)
-        else:
-            normal = [0, 0, 0]
-        vertexNormals.append(normal)
-
-    normal = np.array(vertexNormals, dtype=np.float32)
-    return normal
+                           expandedVertices[:, 2, :] - expandedVertices[:, 0, :])
+    doubleAreas = np.linalg.norm(faceNormals, axis=-1)
+    unitNormals = faceNormals/np.where(doubleAreas > 0, doubleAreas, 1)[:, np.newaxis]
+
+    # weights for each (triangle, corner) pair
+    if weighting == 'uniform':
+        weights = np.ones(indices.shape)
+    elif weighting == 'area':
+        weights = np.repeat(doubleAreas[:, np.newaxis], 3, axis=1)
+    elif weighting == 'angle':
+        arms1 = np.roll(expandedVertices, -1, axis=1) - expandedVertices
+        arms2 = np.roll(expandedVertices, -2, axis=1) - expandedVertices
+        weights = np.arctan2(doubleAreas[:, np.newaxis],
+                             np.sum(arms1*arms2, axis=-1))
+    else:
+        raise ValueError('Unknown normal weighting: {}'.format(weighting))
+
+    # scatter-add the weighted face normals onto each vertex
+    flatIndices = indices.reshape(-1)
+    normal = np.empty((len(vertices), 3), dtype=np.float64)
+    for dim in range(3):
+        normal[:, dim] = np.bincount(
+            flatIndices, weights=(weights*unitNormals[:, np.newaxis, dim]).reshape(-1),
+            minlength=len(vertices))
+
+    lengths = np.linalg.norm(normal, axis=-1, keepdims=True)
+    normal /= np.where(lengths > 0, lengths, 1)
+
+    return normal.astype(np.float32)
 
 def unfoldProperties(*args):
     """Unfolds (i.e. replicates) groups of NxM properties (M is assumed to be 1
@@ -88,10 +107,38 @@ def unfoldProperties(*args):
 
     return result
 
+def _faceArrays(faces):
+    """Convert a list of polygonal faces (arrays of vertex indices) into
+    CSR-style arrays.
+
+    :returns: (flat, starts, counts, faceIndices, prev, next): the
+        concatenated vertex indices of all faces, the starting
+        position and number of vertices of each face within `flat`,
+        the face index of each element of `flat`, and the position
+        in `flat` of the previous and next vertex in the same face
+    """
+    counts = np.array([len(face) for face in faces], dtype=np.intp)
+    flat = np.concatenate(faces).astype(np.intp)
+    starts = np.cumsum(counts) - counts
+    faceIndices = np.repeat(np.arange(len(faces)), counts)
+    local = np.arange(len(flat)) - starts[faceIndices]
+    counts_ = counts[faceIndices]
+    prev = starts[faceIndices] + (local - 1)%counts_
+    next = starts[faceIndices] + (local + 1)%counts_
+    return (flat, starts, counts, faceIndices, prev, next)
+
+def _faceNormals(vertices, flat, starts):
+    """Unit normal of each face, from its first three vertices."""
+    (v0, v1, v2) = (vertices[flat[starts + i]] for i in range(3))
+    normals = np.cross(v1 - v0, v2 - v0)
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    return normals
+
 ConvexPolyhedronMesh = namedtuple(
     'ConvexPolyhedronMesh',
     ['image', 'normal', 'indices', 'face_centers', 'outline_delta'])
 
+@cache.memoize
 def convexPolyhedronMesh(vertices):
     """Generates a mesh (lists of per-vertex properties) of a convex
     polyhedron's image (tessellated vertices of the shape), normal
@@ -101,37 +148,22 @@ def convexPolyhedronMesh(vertices):
     (vertices, faces) = convexHull(vertices)
     vertices = vertices.astype(np.float32)
 
-    image = [[vertices[i] for i in face] for face in faces]
-    outline_image = [insetPolygon(vertices[face], 1.0) for face in faces]
-    outline_delta = [oimg - img for (oimg, img) in zip(outline_image, image)]
-
-    vidx = 0
-    indices = []
-    normal = []
-    face_centers = []
-    for face in faces:
-        verts = vertices[face[:3]]
-        cross = np.cross(verts[1] - verts[0], verts[2] - verts[0])
-        cross /= np.sqrt(np.sum(cross**2))
-        normal.extend(len(face)*[cross])
-        shiftedFace = list(range(vidx, vidx + len(face)))
-        indices.extend(list(zip(repeat(shiftedFace[0]), shiftedFace[1:], shiftedFace[2:])))
-        face_centers.extend(len(face)*[np.mean(vertices[face], axis=0)])
-        vidx += len(face)
-    indices = np.array(indices, dtype=np.uint16).reshape((-1, 3))
-    normal = np.array(normal, dtype=np.float32).reshape((-1, 3))
-    face_centers = np.array(face_centers, dtype=np.float32).reshape((-1, 3))
-
-    image = sum(image, [])
-    image = np.array(image, dtype=np.float32).reshape((-1, 3))
-
-    outline_delta = np.concatenate(outline_delta, axis=0)
+    (flat, starts, counts, faceIndices, _, _) = _faceArrays(faces)
+
+    image = vertices[flat]
+    faceNormals = _faceNormals(vertices, flat, starts)
+    normal = faceNormals[faceIndices]
+    indices = _fanIndices(starts, counts).astype(np.uint16)
+    face_centers = (np.add.reduceat(image, starts, axis=0)/
+                    counts[:, np.newaxis]).astype(np.float32)[faceIndices]
+    outline_delta = insetPolygons(image, counts, 1.0, faceNormals) - image
 
     return ConvexPolyhedronMesh(image, normal, indices, face_centers, outline_delta)
 
 ConvexSpheropolyhedronMesh = namedtuple('ConvexSpheropolyhedronMesh',
                         ['image', 'innerImage', 'normal', 'indices'])
 
+@cache.memoize
 def convexSpheropolyhedronMesh(vertices, radius=.5):
     """Generates a mesh (lists of per-vertex properties) of a convex
     spheropolyhedron's image (tessellated vertices of the inner shape
@@ -140,100 +172,91 @@ def convexSpheropolyhedronMesh(vertices, radius=.5):
     and triangle indices."""
     (vertices, faces) = convexHull(vertices)
 
-    edgeNormals = defaultdict(list)
-    vertexNormals = defaultdict(list)
-    temps = {}
-
-    for face in faces:
-        inners = vertices[face]
-        deltas = np.roll(inners, -1, axis=0) - inners
-        # deltas is normalized
-        deltas /= np.sqrt(np.sum(deltas**2, axis=1))[:, np.newaxis]
-
-        cross = np.cross(inners[1] - inners[0], inners[2] - inners[0])
-        cross /= np.sqrt(np.sum(cross**2))
-
-        temps[tuple(face)] = (inners, deltas, cross)
-
-        for vert in face:
-            vertexNormals[vert].append(cross)
-
-        for pair in (tuple(sorted(p)) for p in zip(face, np.roll(face, 1))):
-            edgeNormals[pair].append(cross)
-
-    avgEdgeNormals, avgVertNormals = {}, {}
-    for key in edgeNormals:
-        norm = np.mean(edgeNormals[key], axis=0)
-        norm /= np.sqrt(np.sum(norm**2))
-        avgEdgeNormals[key] = norm
-
-    for key in vertexNormals:
-        norm = np.mean(vertexNormals[key], axis=0)
-        norm /= np.sqrt(np.sum(norm**2))
-        avgVertNormals[key] = norm
-
-    capIndices = {}
-    image = []
-    innerImage = []
-    normal = []
-    indices = []
-    vidx = 0
-    for face in faces:
-        (inners, deltas, cross) = temps[tuple(face)]
-        shiftedInners = inners + radius*cross
-
-        # first triangulate the inner polygons of the face
-        faceInnerImage = list(inners)
-        faceImage = list(shiftedInners)
-        shiftedFace = list(range(vidx, vidx + len(face)))
-        faceIndices = list(zip(repeat(shiftedFace[0]), shiftedFace[1:], shiftedFace[2:]))
-
-        # next triangulate the "fins" that stick out of the face
-        finDeltas = np.array([avgEdgeNormals[tuple(sorted(p))] for p in zip(face, np.roll(face, -1))], dtype=np.float32)
-        finVertices = np.array([inners + radius*finDeltas,
-                                np.roll(inners, -1, axis=0) + radius*finDeltas], dtype=np.float32)
-
-        faceInnerImage.extend(list(inners) + list(np.roll(inners, -1, axis=0)))
-        faceImage.extend(list(finVertices.reshape((-1, 3))))
-
-        innerStart = vidx
-        firstFinStart = vidx + len(face)
-        secondFinStart = vidx + 2*len(face)
-
-        for (curInner, nextInner, curFin, nextFin) in zip(
-                range(innerStart, innerStart + len(face)),
-                np.roll(list(range(innerStart, innerStart + len(face))), -1),
-                range(firstFinStart, firstFinStart + len(face)),
-                range(secondFinStart, secondFinStart + len(face))):
-            faceIndices.append((curInner, curFin, nextFin))
-            faceIndices.append((curInner, nextFin, nextInner))
-
-        # finally triangulate the rounded caps
-        for vertidx in face:
-            if vertidx not in capIndices:
-                faceInnerImage.append(vertices[vertidx])
-                faceImage.append(vertices[vertidx] + radius*avgVertNormals[vertidx])
-                capIndices[vertidx] = vidx + 3*len(face)
-                vidx += 1
-
-        for (inner, curFin, nextFin, vertidx) in zip(
-                range(innerStart, innerStart + len(face)),
-                np.roll(list(range(secondFinStart, secondFinStart + len(face))), 1),
-                range(firstFinStart, firstFinStart + len(face)),
-                face):
-            faceIndices.append((inner, curFin, capIndices[vertidx]))
-            faceIndices.append((inner, capIndices[vertidx], nextFin))
-
-        image.extend(faceImage)
-        innerImage.extend(faceInnerImage)
-        normal.extend(len(faceImage)*[cross])
-        indices.extend(faceIndices)
-        vidx += len(face)*3
-
-    image = np.asarray(image, dtype=np.float32)
-    innerImage = np.asarray(innerImage, dtype=np.float32)
-    normal = np.asarray(normal, dtype=np.float32)
-    indices = np.asarray(indices, dtype=np.uint32)
+    (flat, starts, counts, faceIndices, prev, next) = _faceArrays(faces)
+    faceNormals = _faceNormals(vertices, flat, starts)
+    # face normal and size of the face for each element of flat
+    normals = faceNormals[faceIndices]
+    counts_ = counts[faceIndices]
+    local = np.arange(len(flat)) - starts[faceIndices]
+
+    # vertex normals: average of the normals of all adjacent faces
+    # (vertices inside the hull are not part of any face)
+    vertexNormals = np.array([np.bincount(flat, weights=normals[:, dim],
+                                          minlength=len(vertices))
+                              for dim in range(3)]).T
+    lengths = np.linalg.norm(vertexNormals, axis=-1, keepdims=True)
+    vertexNormals /= np.where(lengths > 0, lengths, 1)
+
+    # edge normals: average of the normals of the faces sharing each
+    # edge (from each vertex to the next one in the face)
+    edgeKeys = (np.minimum(flat, flat[next])*len(vertices) +
+                np.maximum(flat, flat[next]))
+    (_, edgeIndices) = np.unique(edgeKeys, return_inverse=True)
+    edgeIndices = edgeIndices.reshape(-1)
+    edgeNormals = np.array([np.bincount(edgeIndices, weights=normals[:, dim])
+                            for dim in range(3)]).T
+    edgeNormals /= np.linalg.norm(edgeNormals, axis=-1, keepdims=True)
+    finDeltas = edgeNormals[edgeIndices]
+
+    # each vertex gets a single rounded cap vertex, owned by the
+    # first face that contains it
+    (_, firstOccurrences) = np.unique(flat, return_index=True)
+    newCaps = np.zeros(len(flat), dtype=bool)
+    newCaps[firstOccurrences] = True
+    capCounts = np.bincount(faceIndices[newCaps], minlength=len(faces))
+
+    # each face consists of its (shifted) inner polygon, two sets of
+    # fin vertices, and the new cap vertices it owns
+    blockSizes = 3*counts + capCounts
+    blockStarts = np.cumsum(blockSizes) - blockSizes
+    blocks = blockStarts[faceIndices]
+    capRanks = np.cumsum(newCaps) - 1
+    capRanks -= (np.cumsum(capCounts) - capCounts)[faceIndices]
+    capDestinations = (blocks + 3*counts_ + capRanks)[newCaps]
+    capIndices = np.empty(len(vertices), dtype=np.intp)
+    capIndices[flat[newCaps]] = capDestinations
+
+    inners = vertices[flat]
+    nextInners = inners[next]
+    image = np.empty((np.sum(blockSizes), 3), dtype=np.float32)
+    innerImage = np.empty_like(image)
+    for (offset, img, inner) in [
+            (0, inners + radius*normals, inners),
+            (counts_, inners + radius*finDeltas, inners),
+            (2*counts_, nextInners + radius*finDeltas, nextInners)]:
+        image[blocks + offset + local] = img
+        innerImage[blocks + offset + local] = inner
+    image[capDestinations] = (vertices + radius*vertexNormals)[flat[newCaps]]
+    innerImage[capDestinations] = inners[newCaps]
+    normal = np.repeat(faceNormals, blockSizes, axis=0).astype(np.float32)
+
+    # triangles for each face: the face itself, then two triangles
+    # for each fin and two for each cap
+    fanIndices = _fanIndices(blockStarts, counts)
+    curInner = blocks + local
+    nextInner = blocks + (local + 1)%counts_
+    curFin = blocks + counts_ + local
+    nextFin = blocks + 2*counts_ + local
+    prevFin = blocks + 2*counts_ + (local - 1)%counts_
+    caps = capIndices[flat]
+    finIndices = np.stack([
+        np.array([curInner, curFin, nextFin]).T,
+        np.array([curInner, nextFin, nextInner]).T], axis=1)
+    capTriangles = np.stack([
+        np.array([curInner, prevFin, caps]).T,
+        np.array([curInner, caps, curFin]).T], axis=1)
+
+    fanCounts = counts - 2
+    triangleCounts = fanCounts + 4*counts
+    triangleStarts = np.cumsum(triangleCounts) - triangleCounts
+    indices = np.empty((np.sum(triangleCounts), 3), dtype=np.uint32)
+    fanFaces = np.repeat(np.arange(len(faces)), fanCounts)
+    indices[triangleStarts[fanFaces] + np.arange(len(fanFaces)) -
+            (np.cumsum(fanCounts) - fanCounts)[fanFaces]] = fanIndices
+    finStarts = (triangleStarts + fanCounts)[faceIndices] + 2*local
+    for i in range(2):
+        indices[finStarts + i] = finIndices[:, i]
+        indices[finStarts + 2*counts_ + i] = capTriangles[:, i]
 
     return ConvexSpheropolyhedronMesh(image, innerImage, normal, indices)
 
@@ -244,6 +267,7 @@ def spheropolygonMesh(vertices, radius=1.0, granularity=5):
     """Approximate a spheropolygon by adding rounding to the
     corners."""
     vertices = np.asarray(vertices, dtype=np.float32)
+    granularity = int(granularity)
 
     # Make 3D unit vectors drs from each vertex i to its neighbor i+1
     drs = np.roll(vertices, -1, axis=0) - vertices;
@@ -271,76 +295,98 @@ def spheropolygonMesh(vertices, radius=1.0, granularity=5):
     # thetas are the angles at which we'll place points for each
     # vertex; curves are the points on the approximate curves on the
     # corners.
-    thetas = np.zeros((vertices.shape[0], granularity));
+    fractions = np.arange(1, granularity + 1)/(granularity + 1)
+    thetas = theta1s[:, np.newaxis] + dthetas[:, np.newaxis]*fractions
     # increase the radius of each point by a factor to completely
     # enclose the rounded cap
     factors = 1./np.cos(dthetas/(granularity + 1))
     factors[dthetas > np.pi] = 1.
-    for i, (theta1, dtheta) in enumerate(zip(theta1s, dthetas)):
-        thetas[i] = theta1 + np.linspace(0, dtheta, 2 + granularity)[1:-1];
-    curves = radius*np.vstack([np.cos(thetas).flat, np.sin(thetas).flat]).T;
-    curves = curves.reshape((-1, granularity, 2))*factors[:, np.newaxis, np.newaxis];
-    curves += vertices[:, np.newaxis, :];
-
-    # Now interleave the pieces
-    image = vertices.tolist()
+    curves = radius*np.stack([np.cos(thetas), np.sin(thetas)], axis=-1)
+    curves *= factors[:, np.newaxis, np.newaxis]
+    curves += vertices[:, np.newaxis, :]
+
+    # Don't round a vertex if it is degenerate. Convex corners get the
+    # end of the last straight line segment, the curved edge, then
+    # the start of the next straight line segment; concave corners
+    # don't use the curved region, they just get the intersection of
+    # the two neighboring segments.
+    skip = np.logical_or(dthetas < 1e-6, np.abs(2*np.pi - dthetas) < 1e-6)
+    convex = np.logical_and(dthetas <= np.pi, ~skip)
+    concave = np.logical_and(~(dthetas <= np.pi), ~skip)
+
+    numVerts = len(vertices)
+    cornerCounts = np.zeros(numVerts, dtype=np.int64)
+    cornerCounts[convex] = granularity + 2
+    cornerCounts[concave] = 1
+    # index of the first added vertex for each corner
+    cornerStarts = numVerts + np.cumsum(cornerCounts) - cornerCounts
+    # index of the first added vertex of the following rounded corner
+    cornerNexts = cornerStarts + cornerCounts
+    totalVerts = numVerts + np.sum(cornerCounts)
+
     # vertex_types: int mask with mask&1 indicating "inside shape (not
     # boundary)", mask&2 "part of a curve", mask&4 "is an added curve
     # vertex", mask&8 "is a vertex immediately before a curve"; this
     # translates to: 1 inside vertex; 10 pre-curve boundary; 2
     # post-curve boundary; 6 mid-curve boundary; 0 concave boundary
-    vertex_types = len(image)*[1]
+    image = np.empty((totalVerts, 2), dtype=np.float64)
+    vertex_types = np.empty(totalVerts, dtype=np.int32)
+    image[:numVerts] = vertices
+    vertex_types[:numVerts] = 1
     # image and innerImage are the same for the interior region
-    innerImage = vertices.tolist()
-    indices = Polygon(vertices).triangleIndices.tolist()
-    numVerts = len(vertices)
-    # by default, absStarts[i] and absEnds[i] are the start and end of
-    # the rectangular segment past vertices[i] going counterclockwise.
-    for (end, curve, start, vert, dtheta, vertidx, nextvertidx) in \
-        zip(absEnds, curves, absStarts, vertices, dthetas,
-            np.arange(len(vertices)),
-            np.roll(np.arange(len(vertices)), -1)):
-        # Don't round a vertex if it is degenerate
-        skip = dtheta < 1e-6 or np.abs(2*np.pi - dtheta) < 1e-6
-
-        # convex case: add the end of the last straight line
-        # segment, the curved edge, then the start of the next
-        # straight line segment.
-        if dtheta <= np.pi and not skip:
-            triangles = [(vertidx, i, i + 1)
-                         for i in range(numVerts, numVerts + granularity + 1)]
-            triangles.append((vertidx, numVerts + granularity + 1, nextvertidx))
-            triangles.append((numVerts + granularity + 2, nextvertidx, numVerts + granularity + 1))
-            indices.extend(triangles)
-            numVerts += granularity + 2
-
-            image.append(end);
-            image.append(curve);
-            image.append(start);
-
-            innerImage.extend((granularity + 2)*[vert])
-            vertex_types.append(10)
-            vertex_types.extend(granularity*[6])
-            vertex_types.append(2)
-        # concave case: don't use the curved region, just find the
-        # intersection and add that point.
-        elif not skip:
-            indices.append((vertidx, numVerts + 1, nextvertidx))
-            indices.append((numVerts + 1, vertidx, numVerts))
-            numVerts += 1
-
-            l = radius/np.cos(dtheta/2);
-            p = 2*vert - start - end;
-            p /= np.sqrt(np.dot(p, p));
-
-            image.append(vert + p*l);
-            innerImage.append(vert)
-            vertex_types.append(0)
-
-    image = np.vstack(image)
-    innerImage = np.vstack(innerImage)
-    indices = np.vstack(indices)
-    vertex_types = np.array(vertex_types, dtype=np.int32)
+    innerImage = np.concatenate([
+        vertices, np.repeat(vertices, cornerCounts, axis=0)]).astype(np.float64)
+
+    convexTarget = (cornerStarts[convex, np.newaxis] +
+                    np.arange(granularity + 2)).reshape(-1)
+    image[convexTarget] = np.concatenate([
+        absEnds[convex, np.newaxis], curves[convex],
+        absStarts[convex, np.newaxis]], axis=1).reshape((-1, 2))
+    vertex_types[convexTarget] = np.tile(
+        [10] + granularity*[6] + [2], np.count_nonzero(convex))
+
+    vert = vertices[concave]
+    l = radius/np.cos(dthetas[concave]/2);
+    p = 2*vert - absStarts[concave] - absEnds[concave];
+    p /= np.linalg.norm(p, axis=-1, keepdims=True)
+    image[cornerStarts[concave]] = vert + p*l[:, np.newaxis]
+    vertex_types[cornerStarts[concave]] = 0
+
+    # convex corners are covered by a fan of triangles around the
+    # vertex and a rectangle joining them to the next corner;
+    # concave corners only need the rectangle
+    vertidx = np.arange(numVerts)
+    nextvertidx = np.roll(vertidx, -1)
+
+    (v, n, start, nextStart) = (vertidx[convex], nextvertidx[convex],
+                                cornerStarts[convex], cornerNexts[convex])
+    fan = start[:, np.newaxis] + np.arange(granularity + 1)
+    convexTriangles = np.concatenate([
+        np.stack([np.repeat(v[:, np.newaxis], granularity + 1, axis=1),
+                  fan, fan + 1], axis=-1),
+        np.stack([v, start + granularity + 1, n], axis=-1)[:, np.newaxis],
+        np.stack([nextStart, n, start + granularity + 1], axis=-1)[:, np.newaxis],
+    ], axis=1)
+
+    (v, n, start, nextStart) = (vertidx[concave], nextvertidx[concave],
+                                cornerStarts[concave], cornerNexts[concave])
+    concaveTriangles = np.stack([
+        np.stack([v, nextStart, n], axis=-1),
+        np.stack([nextStart, v, start], axis=-1)], axis=1)
+
+    triangleCounts = np.zeros(numVerts, dtype=np.int64)
+    triangleCounts[convex] = granularity + 3
+    triangleCounts[concave] = 2
+    triangleStarts = np.cumsum(triangleCounts) - triangleCounts
+
+    indices = np.empty((np.sum(triangleCounts), 3), dtype=np.int64)
+    indices[(triangleStarts[convex, np.newaxis] +
+             np.arange(granularity + 3)).reshape(-1)] = convexTriangles.reshape((-1, 3))
+    indices[triangleStarts[concave, np.newaxis] +
+            np.arange(2)] = concaveTriangles
+    indices = np.concatenate([
+        np.asarray(Polygon(vertices).triangleIndices, dtype=np.int64).reshape((-1, 3)),
+        indices])
 
     # rounded segment indexing should be modulo number of rounded
     # segment vertices
@@ -348,6 +394,28 @@ def spheropolygonMesh(vertices, radius=1.0, granularity=5):
 
     return SpheropolygonMesh(image, innerImage, indices, vertex_types)
 
+def spheropolygonGranularity(radius, tolerance=1., maxGranularity=16):
+    """Choose the number of points to add to each rounded corner of a
+    spheropolygon by :py:func:`spheropolygonMesh`.
+
+    Returns the smallest power of two granularity (up to
+    maxGranularity) for which the curve points of any convex corner
+    lie within tolerance of the rounded arc they enclose.
+
+    :param radius: Rounding radius of the spheropolygon, in the same units as tolerance (for example, pixels)
+    :param tolerance: Maximum distance of curve points from the arc
+    :param maxGranularity: Maximum granularity to return
+    """
+    if radius <= 0:
+        return 1
+
+    # corners turn by at most pi radians, so the points are at most a
+    # distance radius*(1/cos(pi/(granularity + 1)) - 1) from the arc
+    maxAngle = np.arccos(radius/(radius + tolerance))
+    granularity = max(1, int(np.ceil(np.pi/maxAngle)) - 1)
+    granularity = 1 << int(np.ceil(np.log2(granularity)))
+    return min(granularity, maxGranularity)
+
 def splitChunks(indices, maxIndex=None):
     """Split an index array into a series of chunks such that the
     resulting index arrays always contain elements with values less
@@ -40,6 +40,7 @@ setup(name='plato-draw',
           'plato.draw.matplotlib',
           'plato.draw.povray',
           'plato.draw.pythreejs',
+          'plato.draw.raster',
           'plato.draw.vispy',
           'plato.draw.zdog',
       ],
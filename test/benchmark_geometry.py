@@ -0,0 +1,221 @@
+"""Benchmarks for polygon and polyhedron functions in plato.geometry.
+
+Run directly to print timings comparing current implementations to
+reference (previous) versions::
+
+    python benchmark_geometry.py
+"""
+import timeit
+
+import numpy as np
+import plato.geometry as geometry
+
+def reference_triangulation(vertices):
+    vertices = np.asarray(vertices, dtype=np.float32)
+
+    if len(vertices) == 3:
+        vertices = np.array(vertices)
+        cross = np.cross(vertices[1] - vertices[0], vertices[2] - vertices[0])
+        if cross > 0:
+            return np.array([[0, 1, 2]], dtype=np.uint32)
+        else:
+            return np.array([[0, 2, 1]], dtype=np.uint32)
+    elif len(vertices) < 3:
+        raise RuntimeError('Trying to triangulate a polygon with no area')
+
+    result = [];
+    remaining = vertices + np.random.uniform(-1, 1, size=vertices.shape)*1e-6
+    remainingIndices = range(len(remaining))
+
+    # step around the shape and grab ears until only 4 vertices are left
+    while len(remaining) > 4:
+        signs = [];
+        for vert in (remaining[-1], remaining[1]):
+            arms1 = remaining[2:-2] - vert;
+            arms2 = vert - remaining[3:-1];
+            signs.append(np.sign(arms1[:, 1]*arms2[:, 0] -
+                                    arms2[:, 1]*arms1[:, 0]));
+        for rest in (remaining[2:-2], remaining[3:-1]):
+            arms1 = remaining[-1] - rest;
+            arms2 = rest - remaining[1];
+            signs.append(np.sign(arms1[:, 1]*arms2[:, 0] -
+                                    arms2[:, 1]*arms1[:, 0]));
+
+        cross = np.any(np.bitwise_and(signs[0] != signs[1],
+                                            signs[2] != signs[3]));
+        if not cross and geometry.twiceTriangleArea(
+                remaining[-1], remaining[0], remaining[1]) > 0.:
+            # triangle [-1, 0, 1] is a good one, cut it out
+            result.append((remainingIndices[-1], remainingIndices[0],
+                           remainingIndices[1]))
+            remaining = remaining[1:];
+            remainingIndices = remainingIndices[1:]
+        else:
+            remaining = np.roll(remaining, 1, axis=0);
+            remainingIndices = np.roll(remainingIndices, 1, axis=0)
+
+    # there must now be 0 or 1 concave vertices left; find the
+    # concave vertex (or a vertex) and fan out from it
+    vertices = remaining;
+    shiftedUp = vertices - np.roll(vertices, 1, axis=0);
+    shiftedBack = np.roll(vertices, -1, axis=0) - vertices;
+
+    # signed area for each triangle (i-1, i, i+1) for vertex i
+    areas = shiftedBack[:, 1]*shiftedUp[:, 0] - shiftedUp[:, 1]*shiftedBack[:, 0];
+
+    concave = np.where(areas < 0.)[0];
+
+    fan = (concave[0] if len(concave) else 0);
+    fanIndex = remainingIndices[fan]
+    remainingIndices = np.roll(remainingIndices, -fan, axis=0)[1:];
+
+    result.extend([(fanIndex, remainingIndices[0], remainingIndices[1]),
+                   (fanIndex, remainingIndices[1], remainingIndices[2])]);
+
+    return np.array(result, dtype=np.uint32);
+
+def reference_insetPolygon(vertices, distance):
+    vertices = np.asarray(vertices)
+    dimension = vertices.shape[1]
+
+    rijs = np.roll(vertices, -1, axis=0) - vertices
+    face_normal = np.cross(rijs[0], rijs[1])
+    face_normal /= np.linalg.norm(face_normal)
+    rijs_normal = rijs/np.linalg.norm(rijs, axis=-1, keepdims=True)
+    if dimension == 3:
+        perps = np.cross([face_normal], rijs_normal)
+        perps /= np.linalg.norm(perps, axis=-1, keepdims=True)
+    else:
+        perps = np.dot(rijs_normal, [[0, 1], [-1, 0]])
+
+    # construct a linear system of equations Ax=b solving for the
+    # intersection point of each inset vertex
+    A = np.tile(rijs_normal[:, :, np.newaxis], (1, 1, 2))
+    A[:, :, 1] = np.roll(rijs_normal, 1, axis=0)
+    b = distance*(perps - np.roll(perps, 1, axis=0))
+
+    if dimension == 3:
+        lams = np.array([np.linalg.lstsq(a_, b_, rcond=-1)[0]
+                         for (a_, b_) in zip(A, b)], dtype=np.float32)
+    else:
+        lams = np.linalg.solve(A, b)
+
+    result = vertices - lams[..., 1, np.newaxis]*rijs_normal + distance*perps
+    return result
+
+def _fanIndices(starts, counts):
+    """Return (Nt, 3) triangle indices fanning out from the first vertex
+    of each polygon, given the start and size of each polygon."""
+    triCounts = np.maximum(counts - 2, 0)
+    triFaces = np.repeat(np.arange(len(counts)), triCounts)
+    local = np.arange(len(triFaces)) - (np.cumsum(triCounts) - triCounts)[triFaces] + 1
+    firsts = starts[triFaces]
+    return np.array([firsts, firsts + local, firsts + local + 1]).T
+
+def reference_massProperties(vertices, faces=None, factor=1.):
+    # only the 3D case of the previous implementation
+    vertices = np.array(vertices)
+
+    # multiplicative factors
+    factors = 1./np.array([6, 24, 24, 24, 60, 60, 60, 120, 120, 120])
+
+    # order: 1, x, y, z, x^2, y^2, z^2, xy, yz, zx
+    intg = np.zeros(10)
+
+    for (v0, v1, v2) in geometry.fanTriangles(vertices, faces):
+        # (xi, yi, zi) = vi
+        abc1 = v1 - v0
+        abc2 = v2 - v0
+        d = np.cross(abc1, abc2)
+
+        temp0 = v0 + v1
+        f1 = temp0 + v2
+        temp1 = v0*v0
+        temp2 = temp1 + v1*temp0
+        f2 = temp2 + v2*f1
+        f3 = v0*temp1 + v1*temp2 + v2*f2
+        g0 = f2 + v0*(f1 + v0)
+        g1 = f2 + v1*(f1 + v1)
+        g2 = f2 + v2*(f1 + v2)
+
+        intg[0] += d[0]*f1[0]
+        intg[1:4] += d*f2
+        intg[4:7] += d*f3
+        intg[7] += d[0]*(v0[1]*g0[0] + v1[1]*g1[0] + v2[1]*g2[0])
+        intg[8] += d[1]*(v0[2]*g0[1] + v1[2]*g1[1] + v2[2]*g2[1])
+        intg[9] += d[2]*(v0[0]*g0[2] + v1[0]*g1[2] + v2[0]*g2[2])
+
+    intg *= factors
+
+    mass = intg[0]
+    com = intg[1:4]/mass
+
+    moment = np.zeros(6)
+
+    moment[0] = intg[5] + intg[6] - mass*np.sum(com[1:]**2)
+    moment[1] = -(intg[7] - mass*com[0]*com[1])
+    moment[2] = -(intg[9] - mass*com[0]*com[2])
+    moment[3] = intg[4] + intg[6] - mass*np.sum(com[[0, 2]]**2)
+    moment[4] = -(intg[8] - mass*com[1]*com[2])
+    moment[5] = intg[4] + intg[5] - mass*np.sum(com[:2]**2)
+
+    return mass*factor, com, moment*factor
+
+def random_polygon(n, seed=13):
+    """Create a (generally concave) star-shaped polygon with n vertices."""
+    np.random.seed(seed)
+    thetas = np.sort(np.random.uniform(0, 2*np.pi, n))
+    radii = np.random.uniform(.2, 1, n)
+    return np.array([radii*np.cos(thetas), radii*np.sin(thetas)]).T
+
+def time_function(f, *args, repeat=3):
+    return min(timeit.repeat(lambda: f(*args), number=1, repeat=repeat))
+
+def benchmark_triangulation(sizes=(16, 64, 500), batch_size=100):
+    for n in sizes:
+        vertices = random_polygon(n)
+        reference_time = time_function(reference_triangulation, vertices, repeat=1)
+        current_time = time_function(geometry.triangulatePolygons, [vertices])
+        print('triangulation: {} vertices: reference {:.4f}s, current {:.4f}s ({:.0f}x)'.format(
+            n, reference_time, current_time, reference_time/current_time))
+
+        polygons = [random_polygon(n, seed) for seed in range(batch_size)]
+        single_time = time_function(
+            lambda: [geometry.triangulatePolygons([p]) for p in polygons], repeat=1)
+        batch_time = time_function(geometry.triangulatePolygons, polygons, repeat=1)
+        print('triangulatePolygons: {} polygons of {} vertices: individually {:.4f}s, '
+              'batched {:.4f}s'.format(batch_size, n, single_time, batch_time))
+
+def benchmark_mass_properties(sizes=(16, 256), batch_size=1000):
+    for n in sizes:
+        np.random.seed(13)
+        (vertices, faces) = geometry.convexHull(np.random.normal(size=(n, 3)))
+        reference_time = time_function(reference_massProperties, vertices, faces)
+        current_time = time_function(geometry.massProperties, vertices, faces)
+        print('massProperties: {} faces: reference {:.4f}s, current {:.4f}s ({:.0f}x)'.format(
+            len(faces), reference_time, current_time, reference_time/current_time))
+
+        args = (np.tile(vertices, (batch_size, 1)), batch_size*[len(vertices)],
+                np.tile(np.concatenate(faces), batch_size),
+                batch_size*[len(face) for face in faces], batch_size*[len(faces)])
+        batch_time = time_function(geometry.batchMassProperties, *args)
+        print('batchMassProperties: {} shapes of {} faces: {:.4f}s ({:.0f}x faster than '
+              'the reference individually)'.format(
+                  batch_size, len(faces), batch_time, batch_size*reference_time/batch_time))
+
+def benchmark_inset(sizes=(16, 256, 4096)):
+    for n in sizes:
+        np.random.seed(13)
+        (vertices, faces) = geometry.convexHull(np.random.normal(size=(n, 3)))
+        face_vertices = [vertices[face] for face in faces]
+        reference_time = time_function(
+            lambda: [reference_insetPolygon(face, .1) for face in face_vertices])
+        args = (np.concatenate(face_vertices), [len(face) for face in faces], .1)
+        current_time = time_function(geometry.insetPolygons, *args)
+        print('insetPolygons: {} faces: reference {:.4f}s, current {:.5f}s ({:.0f}x)'.format(
+            len(faces), reference_time, current_time, reference_time/current_time))
+
+if __name__ == '__main__':
+    benchmark_triangulation()
+    benchmark_mass_properties()
+    benchmark_inset()
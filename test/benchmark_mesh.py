@@ -0,0 +1,349 @@
+"""Benchmarks for mesh generation functions in plato.mesh.
+
+Run directly to print timings comparing current implementations to
+reference (previous) versions::
+
+    python benchmark_mesh.py
+"""
+from collections import defaultdict
+from itertools import repeat
+import timeit
+
+import numpy as np
+import plato.geometry as geometry
+import plato.mesh as pmesh
+
+def reference_computeNormals(vertices, indices):
+    expandedVertices = vertices[indices]
+    faceNormals = np.cross(expandedVertices[:, 1, :] - expandedVertices[:, 0, :],
+                            expandedVertices[:, 2, :] - expandedVertices[:, 0, :])
+    faceNormals /= np.linalg.norm(faceNormals, axis=-1, keepdims=True)
+
+    vertexFaceNormals = defaultdict(list)
+
+    for ((i, j, k), normal) in zip(indices, faceNormals):
+        vertexFaceNormals[i].append(normal)
+        vertexFaceNormals[j].append(normal)
+        vertexFaceNormals[k].append(normal)
+
+    vertexNormals = []
+    for i in range(len(vertices)):
+        if vertexFaceNormals[i]:
+            normal = np.mean(vertexFaceNormals[i], axis=0)
+            normal /= np.linalg.norm(normal)
+        else:
+            normal = [0, 0, 0]
+        vertexNormals.append(normal)
+
+    return np.array(vertexNormals, dtype=np.float32)
+
+def reference_convexPolyhedronMesh(vertices):
+    (vertices, faces) = geometry.convexHull(vertices)
+    vertices = vertices.astype(np.float32)
+
+    image = [[vertices[i] for i in face] for face in faces]
+    outline_image = [geometry.insetPolygon(vertices[face], 1.0) for face in faces]
+    outline_delta = [oimg - img for (oimg, img) in zip(outline_image, image)]
+
+    vidx = 0
+    indices = []
+    normal = []
+    face_centers = []
+    for face in faces:
+        verts = vertices[face[:3]]
+        cross = np.cross(verts[1] - verts[0], verts[2] - verts[0])
+        cross /= np.sqrt(np.sum(cross**2))
+        normal.extend(len(face)*[cross])
+        shiftedFace = list(range(vidx, vidx + len(face)))
+        indices.extend(list(zip(repeat(shiftedFace[0]), shiftedFace[1:], shiftedFace[2:])))
+        face_centers.extend(len(face)*[np.mean(vertices[face], axis=0)])
+        vidx += len(face)
+    indices = np.array(indices, dtype=np.uint16).reshape((-1, 3))
+    normal = np.array(normal, dtype=np.float32).reshape((-1, 3))
+    face_centers = np.array(face_centers, dtype=np.float32).reshape((-1, 3))
+
+    image = sum(image, [])
+    image = np.array(image, dtype=np.float32).reshape((-1, 3))
+
+    outline_delta = np.concatenate(outline_delta, axis=0)
+
+    return pmesh.ConvexPolyhedronMesh(image, normal, indices, face_centers, outline_delta)
+
+def reference_convexSpheropolyhedronMesh(vertices, radius=.5):
+    (vertices, faces) = geometry.convexHull(vertices)
+
+    edgeNormals = defaultdict(list)
+    vertexNormals = defaultdict(list)
+    temps = {}
+
+    for face in faces:
+        inners = vertices[face]
+        deltas = np.roll(inners, -1, axis=0) - inners
+        # deltas is normalized
+        deltas /= np.sqrt(np.sum(deltas**2, axis=1))[:, np.newaxis]
+
+        cross = np.cross(inners[1] - inners[0], inners[2] - inners[0])
+        cross /= np.sqrt(np.sum(cross**2))
+
+        temps[tuple(face)] = (inners, deltas, cross)
+
+        for vert in face:
+            vertexNormals[vert].append(cross)
+
+        for pair in (tuple(sorted(p)) for p in zip(face, np.roll(face, 1))):
+            edgeNormals[pair].append(cross)
+
+    avgEdgeNormals, avgVertNormals = {}, {}
+    for key in edgeNormals:
+        norm = np.mean(edgeNormals[key], axis=0)
+        norm /= np.sqrt(np.sum(norm**2))
+        avgEdgeNormals[key] = norm
+
+    for key in vertexNormals:
+        norm = np.mean(vertexNormals[key], axis=0)
+        norm /= np.sqrt(np.sum(norm**2))
+        avgVertNormals[key] = norm
+
+    capIndices = {}
+    image = []
+    innerImage = []
+    normal = []
+    indices = []
+    vidx = 0
+    for face in faces:
+        (inners, deltas, cross) = temps[tuple(face)]
+        shiftedInners = inners + radius*cross
+
+        # first triangulate the inner polygons of the face
+        faceInnerImage = list(inners)
+        faceImage = list(shiftedInners)
+        shiftedFace = list(range(vidx, vidx + len(face)))
+        faceIndices = list(zip(repeat(shiftedFace[0]), shiftedFace[1:], shiftedFace[2:]))
+
+        # next triangulate the "fins" that stick out of the face
+        finDeltas = np.array([avgEdgeNormals[tuple(sorted(p))] for p in zip(face, np.roll(face, -1))], dtype=np.float32)
+        finVertices = np.array([inners + radius*finDeltas,
+                                np.roll(inners, -1, axis=0) + radius*finDeltas], dtype=np.float32)
+
+        faceInnerImage.extend(list(inners) + list(np.roll(inners, -1, axis=0)))
+        faceImage.extend(list(finVertices.reshape((-1, 3))))
+
+        innerStart = vidx
+        firstFinStart = vidx + len(face)
+        secondFinStart = vidx + 2*len(face)
+
+        for (curInner, nextInner, curFin, nextFin) in zip(
+                range(innerStart, innerStart + len(face)),
+                np.roll(list(range(innerStart, innerStart + len(face))), -1),
+                range(firstFinStart, firstFinStart + len(face)),
+                range(secondFinStart, secondFinStart + len(face))):
+            faceIndices.append((curInner, curFin, nextFin))
+            faceIndices.append((curInner, nextFin, nextInner))
+
+        # finally triangulate the rounded caps
+        for vertidx in face:
+            if vertidx not in capIndices:
+                faceInnerImage.append(vertices[vertidx])
+                faceImage.append(vertices[vertidx] + radius*avgVertNormals[vertidx])
+                capIndices[vertidx] = vidx + 3*len(face)
+                vidx += 1
+
+        for (inner, curFin, nextFin, vertidx) in zip(
+                range(innerStart, innerStart + len(face)),
+                np.roll(list(range(secondFinStart, secondFinStart + len(face))), 1),
+                range(firstFinStart, firstFinStart + len(face)),
+                face):
+            faceIndices.append((inner, curFin, capIndices[vertidx]))
+            faceIndices.append((inner, capIndices[vertidx], nextFin))
+
+        image.extend(faceImage)
+        innerImage.extend(faceInnerImage)
+        normal.extend(len(faceImage)*[cross])
+        indices.extend(faceIndices)
+        vidx += len(face)*3
+
+    image = np.asarray(image, dtype=np.float32)
+    innerImage = np.asarray(innerImage, dtype=np.float32)
+    normal = np.asarray(normal, dtype=np.float32)
+    indices = np.asarray(indices, dtype=np.uint32)
+
+    return pmesh.ConvexSpheropolyhedronMesh(image, innerImage, normal, indices)
+
+def reference_spheropolygonMesh(vertices, radius=1.0, granularity=5):
+    vertices = np.asarray(vertices, dtype=np.float32)
+
+    # Make 3D unit vectors drs from each vertex i to its neighbor i+1
+    drs = np.roll(vertices, -1, axis=0) - vertices;
+    drs /= np.sqrt(np.sum(drs*drs, axis=1))[:, np.newaxis];
+    drs = np.hstack([drs, np.zeros((drs.shape[0], 1))]);
+
+    # relStarts are the offsets relative to the first point
+    # of each straight line segment in the polygon.
+    rvec = np.array([[0, 0, -1]])*radius;
+    relStarts = np.cross(rvec, drs)[:, :2];
+    relEnds = np.roll(relStarts, 1, axis=0)
+
+    # absStarts and absEnds are the beginning and end points for each
+    # straight line segment.
+    absStarts = vertices + relStarts
+    absEnds = vertices + relEnds
+
+    # We will join each of these segments by a round cap; this will be
+    # done by tracing an arc with the given radius, centered at each
+    # vertex from an end of a line segment to a beginning of the next
+    theta1s = np.arctan2(relEnds[:, 1], relEnds[:, 0]);
+    theta2s = np.arctan2(relStarts[:, 1], relStarts[:, 0]);
+    dthetas = (theta2s - theta1s) % (2*np.pi);
+
+    # thetas are the angles at which we'll place points for each
+    # vertex; curves are the points on the approximate curves on the
+    # corners.
+    thetas = np.zeros((vertices.shape[0], granularity));
+    # increase the radius of each point by a factor to completely
+    # enclose the rounded cap
+    factors = 1./np.cos(dthetas/(granularity + 1))
+    factors[dthetas > np.pi] = 1.
+    for i, (theta1, dtheta) in enumerate(zip(theta1s, dthetas)):
+        thetas[i] = theta1 + np.linspace(0, dtheta, 2 + granularity)[1:-1];
+    curves = radius*np.vstack([np.cos(thetas).flat, np.sin(thetas).flat]).T;
+    curves = curves.reshape((-1, granularity, 2))*factors[:, np.newaxis, np.newaxis];
+    curves += vertices[:, np.newaxis, :];
+
+    # Now interleave the pieces
+    image = vertices.tolist()
+    # vertex_types: int mask with mask&1 indicating "inside shape (not
+    # boundary)", mask&2 "part of a curve", mask&4 "is an added curve
+    # vertex", mask&8 "is a vertex immediately before a curve"; this
+    # translates to: 1 inside vertex; 10 pre-curve boundary; 2
+    # post-curve boundary; 6 mid-curve boundary; 0 concave boundary
+    vertex_types = len(image)*[1]
+    # image and innerImage are the same for the interior region
+    innerImage = vertices.tolist()
+    indices = geometry.Polygon(vertices).triangleIndices.tolist()
+    numVerts = len(vertices)
+    # by default, absStarts[i] and absEnds[i] are the start and end of
+    # the rectangular segment past vertices[i] going counterclockwise.
+    for (end, curve, start, vert, dtheta, vertidx, nextvertidx) in \
+        zip(absEnds, curves, absStarts, vertices, dthetas,
+            np.arange(len(vertices)),
+            np.roll(np.arange(len(vertices)), -1)):
+        # Don't round a vertex if it is degenerate
+        skip = dtheta < 1e-6 or np.abs(2*np.pi - dtheta) < 1e-6
+
+        # convex case: add the end of the last straight line
+        # segment, the curved edge, then the start of the next
+        # straight line segment.
+        if dtheta <= np.pi and not skip:
+            triangles = [(vertidx, i, i + 1)
+                         for i in range(numVerts, numVerts + granularity + 1)]
+            triangles.append((vertidx, numVerts + granularity + 1, nextvertidx))
+            triangles.append((numVerts + granularity + 2, nextvertidx, numVerts + granularity + 1))
+            indices.extend(triangles)
+            numVerts += granularity + 2
+
+            image.append(end);
+            image.append(curve);
+            image.append(start);
+
+            innerImage.extend((granularity + 2)*[vert])
+            vertex_types.append(10)
+            vertex_types.extend(granularity*[6])
+            vertex_types.append(2)
+        # concave case: don't use the curved region, just find the
+        # intersection and add that point.
+        elif not skip:
+            indices.append((vertidx, numVerts + 1, nextvertidx))
+            indices.append((numVerts + 1, vertidx, numVerts))
+            numVerts += 1
+
+            l = radius/np.cos(dtheta/2);
+            p = 2*vert - start - end;
+            p /= np.sqrt(np.dot(p, p));
+
+            image.append(vert + p*l);
+            innerImage.append(vert)
+            vertex_types.append(0)
+
+    image = np.vstack(image)
+    innerImage = np.vstack(innerImage)
+    indices = np.vstack(indices)
+    vertex_types = np.array(vertex_types, dtype=np.int32)
+
+    # rounded segment indexing should be modulo number of rounded
+    # segment vertices
+    indices[indices >= len(image)] -= len(image) - len(vertices)
+
+    return pmesh.SpheropolygonMesh(image, innerImage, indices, vertex_types)
+
+def grid_mesh(n):
+    """Create a bumpy height-field mesh with n*n vertices."""
+    (x, y) = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n))
+    z = 0.1*np.sin(8*x)*np.cos(5*y)
+    vertices = np.array([x.flat, y.flat, z.flat], dtype=np.float32).T
+
+    corners = (np.arange(n - 1)[:, np.newaxis]*n + np.arange(n - 1)).reshape(-1)
+    indices = np.concatenate([
+        np.array([corners, corners + 1, corners + n + 1]).T,
+        np.array([corners, corners + n + 1, corners + n]).T], axis=0)
+    return vertices, indices.astype(np.uint32)
+
+def time_function(f, *args, repeat=3):
+    return min(timeit.repeat(lambda: f(*args), number=1, repeat=repeat))
+
+def benchmark_normals(sizes=(32, 128, 512)):
+    for n in sizes:
+        (vertices, indices) = grid_mesh(n)
+        reference = reference_computeNormals(vertices, indices)
+        current = pmesh.computeNormals_(vertices, indices)
+        error = np.max(np.abs(reference - current))
+
+        reference_time = time_function(
+            reference_computeNormals, vertices, indices, repeat=1)
+        current_time = time_function(pmesh.computeNormals_, vertices, indices)
+        print('computeNormals_: {} triangles: reference {:.3f}s, current {:.4f}s '
+              '({:.0f}x), max difference {:.2e}'.format(
+                  len(indices), reference_time, current_time,
+                  reference_time/current_time, error))
+
+def sphere_points(n, seed=13):
+    np.random.seed(seed)
+    points = np.random.normal(size=(n, 3))
+    points /= np.linalg.norm(points, axis=-1, keepdims=True)
+    return points
+
+def benchmark_polyhedron_meshes(sizes=(8, 64, 512)):
+    # compare generation time without the geometry cache
+    functions = [
+        ('convexPolyhedronMesh', reference_convexPolyhedronMesh,
+         pmesh.convexPolyhedronMesh.uncached, ()),
+        ('convexSpheropolyhedronMesh', reference_convexSpheropolyhedronMesh,
+         pmesh.convexSpheropolyhedronMesh.uncached, (.25,)),
+    ]
+    for (name, reference_function, current_function, args) in functions:
+        for n in sizes:
+            vertices = sphere_points(n)
+            reference_time = time_function(reference_function, vertices, *args)
+            current_time = time_function(current_function, vertices, *args)
+            print('{}: {} vertices: reference {:.4f}s, current {:.4f}s ({:.0f}x)'.format(
+                name, n, reference_time, current_time, reference_time/current_time))
+
+def regular_polygon(n, radius=1):
+    thetas = np.linspace(0, 2*np.pi, n, endpoint=False)
+    return radius*np.array([np.cos(thetas), np.sin(thetas)]).T
+
+def benchmark_spheropolygon_meshes(sizes=(4, 16, 64), granularities=(2, 16)):
+    for n in sizes:
+        vertices = regular_polygon(n)
+        for granularity in granularities:
+            args = (vertices, .25, granularity)
+            reference_time = time_function(reference_spheropolygonMesh, *args)
+            current_time = time_function(pmesh.spheropolygonMesh, *args)
+            print('spheropolygonMesh: {} vertices, granularity {}: reference {:.4f}s, '
+                  'current {:.4f}s ({:.1f}x)'.format(
+                      n, granularity, reference_time, current_time,
+                      reference_time/current_time))
+
+if __name__ == '__main__':
+    benchmark_normals()
+    benchmark_polyhedron_meshes()
+    benchmark_spheropolygon_meshes()
@@ -6,13 +6,33 @@ run as:
 
 """
 
+import bpy
 import plato.draw.blender as draw
 import test_scenes
 from test_internals import get_fname
 
+assert bpy.app.version >= (3, 2, 0), 'plato.draw.blender requires blender 3.2 or newer'
+
+INSTANCED_TYPES = (draw.ConvexPolyhedra, draw.Spheres)
+
+def check_instances(scene):
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    instance_counts = {}
+    for instance in depsgraph.object_instances:
+        if instance.is_instance:
+            name = instance.parent.original.name
+            instance_counts[name] = instance_counts.get(name, 0) + 1
+
+    for (i, prim) in enumerate(scene):
+        if isinstance(prim, INSTANCED_TYPES):
+            name = '{}_{}'.format(type(prim).__name__, i)
+            assert instance_counts.get(name, 0) == len(prim), (
+                name, instance_counts.get(name, 0), len(prim))
+
 def render(scene, name=''):
     fname = get_fname('blender_{}.png'.format(name))
     scene.save(fname)
+    check_instances(scene)
 
 for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
     render(scene, name)
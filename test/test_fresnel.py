@@ -1,5 +1,6 @@
 import logging
 import unittest
+import numpy as np
 import plato.draw.fresnel as draw
 import subprocess
 import test_scenes
@@ -14,6 +15,70 @@ class FresnelTests(unittest.TestCase):
         fname = get_fname('fresnel_{}.png'.format(name))
         scene.save(fname)
 
+    def test_geometry_reuse(self):
+        prim = draw.Spheres(positions=np.zeros((4, 3)), radii=np.ones(4))
+        scene = draw.Scene(prim, size=(8, 8), pixel_scale=4)
+        scene.render()
+        (_, geometry) = scene._geometries[id(prim)]
+
+        # modified colors are copied into the existing geometry
+        prim.colors = np.tile([[1, 0, 0, 1]], (4, 1))
+        scene.render()
+        self.assertIs(scene._geometries[id(prim)][1], geometry)
+        np.testing.assert_allclose(geometry.color[:], np.tile([[1, 0, 0]], (4, 1)))
+
+        # changing the number of particles requires a new geometry
+        prim.positions = np.zeros((5, 3))
+        prim.radii = np.ones(5)
+        scene.render()
+        self.assertIsNot(scene._geometries[id(prim)][1], geometry)
+
+        scene.remove_primitive(prim)
+        scene.render()
+        self.assertEqual(scene._geometries, {})
+
+    def test_output_cache(self):
+        prim = draw.Spheres(positions=np.zeros((4, 3)), radii=np.ones(4))
+        scene = draw.Scene(prim, size=(8, 8), pixel_scale=4)
+        first = scene.render()
+        self.assertIs(scene.render(), first)
+        # cached images can't be modified by callers
+        with self.assertRaises(ValueError):
+            first[:] = 0
+
+        # changing the camera invalidates the output...
+        scene.rotation = (0, 1, 0, 0)
+        second = scene.render()
+        self.assertIsNot(second, first)
+
+        # ...but previous views are kept
+        scene.rotation = (1, 0, 0, 0)
+        self.assertIs(scene.render(), first)
+
+        # modifying primitives also invalidates the output
+        prim.colors = (1, 0, 0, 1)
+        self.assertIsNot(scene.render(), first)
+
+    def test_progressive_path_tracing(self):
+        prim = draw.Spheres(positions=np.zeros((4, 3)), radii=np.ones(4))
+        scene = draw.Scene(prim, size=(8, 8), pixel_scale=4, features=dict(
+            pathtracer=dict(samples=8, batch_size=2, tolerance=0)))
+        progress = list(scene.render_progressive())
+        self.assertEqual([p.samples for p in progress], [2, 4, 6, 8])
+        self.assertEqual(progress[0].error, np.inf)
+        self.assertIs(scene.render(), progress[-1].image)
+
+        # a large tolerance stops as soon as an error can be estimated
+        calls = []
+        scene.enable('pathtracer', samples=64, batch_size=2, tolerance=1e3,
+                     callback=calls.append)
+        scene.render()
+        self.assertEqual([p.samples for p in calls], [2, 4])
+
+        scene.enable('pathtracer', samples=0)
+        with self.assertRaises(ValueError):
+            scene.render()
+
 for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
     new_name = 'test_{}'.format(name)
     print(new_name)
@@ -0,0 +1,210 @@
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+import plato.geometry as geometry
+
+from benchmark_geometry import (
+    random_polygon, reference_insetPolygon, reference_massProperties)
+
+class ConvexHullTests(unittest.TestCase):
+    def test_cube(self):
+        vertices = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1)
+                             for z in (-1, 1)], dtype=np.float32)
+        (vertices, faces) = geometry.convexHull(vertices)
+
+        self.assertEqual(len(faces), 6)
+        for face in faces:
+            self.assertEqual(len(face), 4)
+            # faces are wound counterclockwise when viewed from outside
+            r = vertices[face]
+            normal = np.cross(r[1] - r[0], r[2] - r[1])
+            self.assertGreater(np.dot(normal, np.mean(r, axis=0)), 0)
+
+    def test_many_points(self):
+        np.random.seed(13)
+        points = np.random.normal(size=(4096, 3))
+        points /= np.linalg.norm(points, axis=-1, keepdims=True)
+        (vertices, faces) = geometry.convexHull(points)
+
+        self.assertEqual(len(faces), len(np.concatenate(faces))//3)
+        decomposition = geometry.convexDecomposition(points)
+        # Euler characteristic of a convex polyhedron
+        self.assertEqual(
+            len(np.unique(np.concatenate(faces))) - len(decomposition.edges) + len(faces), 2)
+        npt.assert_allclose(geometry.massProperties(vertices, faces)[0],
+                            4/3*np.pi, rtol=1e-2)
+
+class GeometryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = geometry.GeometryCache()
+        self.hull = self.cache.memoize(geometry.convexHull.uncached)
+
+    def test_hits(self):
+        vertices = np.random.normal(size=(32, 3))
+
+        for _ in range(1000):
+            (hull_vertices, faces) = self.hull(vertices)
+        info = self.cache.info()
+        self.assertEqual((info.hits, info.misses, info.entries), (999, 1, 1))
+
+        # results can be modified without affecting the cache
+        hull_vertices[:] = 0
+        faces.pop()
+        (hull_vertices, new_faces) = self.hull(vertices.copy())
+        npt.assert_array_equal(hull_vertices, vertices)
+        self.assertEqual(len(new_faces), len(faces) + 1)
+        self.assertEqual(self.cache.info().hits, 1000)
+
+        self.hull(vertices + 1)
+        self.assertEqual(self.cache.info().misses, 2)
+
+    def test_budget(self):
+        self.cache.max_bytes = 8*1024
+        for _ in range(16):
+            self.hull(np.random.normal(size=(32, 3)))
+
+        info = self.cache.info()
+        self.assertEqual(info.misses, 16)
+        self.assertLess(info.entries, 16)
+        self.assertLessEqual(info.nbytes, self.cache.max_bytes)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.info().entries, 0)
+
+class InsetTests(unittest.TestCase):
+    def test_square(self):
+        square = np.array([[0, 0], [2, 0], [2, 2], [0, 2]], dtype=np.float32)
+        npt.assert_allclose(geometry.insetPolygon(square, .5),
+                            [[.5, .5], [1.5, .5], [1.5, 1.5], [.5, 1.5]], atol=1e-6)
+
+        square3d = np.hstack([square, np.ones((4, 1))])
+        npt.assert_allclose(geometry.insetPolygon(square3d, .5)[:, :2],
+                            geometry.insetPolygon(square, .5), atol=1e-6)
+
+    def test_collinear(self):
+        # square with an extra vertex in the middle of its bottom edge
+        square = np.array([[0, 0], [1, 0], [2, 0], [2, 2], [0, 2]])
+        expected = [[.5, .5], [1, .5], [1.5, .5], [1.5, 1.5], [.5, 1.5]]
+        for dtype in (np.float32, np.float64):
+            inset = geometry.insetPolygon(square.astype(dtype), .5)
+            self.assertEqual(inset.dtype, dtype)
+            npt.assert_allclose(inset, expected, atol=1e-6)
+
+            square3d = np.hstack([square, np.ones((5, 1))]).astype(dtype)
+            inset = geometry.insetPolygon(square3d, .5)
+            npt.assert_allclose(inset[:, :2], expected, atol=1e-6)
+            npt.assert_allclose(inset[:, 2], 1, atol=1e-6)
+
+    def test_faces(self):
+        np.random.seed(13)
+        (vertices, faces) = geometry.convexHull(np.random.normal(size=(64, 3)))
+        inset = geometry.insetPolygons(
+            vertices[np.concatenate(faces)], [len(face) for face in faces], .05)
+        references = [reference_insetPolygon(vertices[face], .05) for face in faces]
+        npt.assert_allclose(inset, np.concatenate(references), atol=1e-5)
+
+        for n in (3, 8, 64):
+            polygon = random_polygon(n, n)
+            npt.assert_allclose(geometry.insetPolygon(polygon, .01),
+                                reference_insetPolygon(polygon, .01), atol=1e-8)
+
+class MassPropertiesTests(unittest.TestCase):
+    def hulls(self):
+        np.random.seed(13)
+        return [geometry.convexHull(np.random.normal(size=(n, 3)) + (1, 2, 3))
+                for n in (4, 16, 256)]
+
+    def test_polyhedra(self):
+        for (vertices, faces) in self.hulls():
+            for (ref, cur) in zip(reference_massProperties(vertices, faces, 2),
+                                  geometry.massProperties(vertices, faces, 2)):
+                npt.assert_allclose(cur, ref, rtol=1e-8, atol=1e-12)
+
+        # unit cube centered at (1, 1, 1)
+        cube = np.array([[x, y, z] for x in (.5, 1.5) for y in (.5, 1.5)
+                         for z in (.5, 1.5)])
+        (mass, com, moment) = geometry.massProperties(*geometry.convexHull(cube))
+        npt.assert_allclose(mass, 1)
+        npt.assert_allclose(com, 1)
+        npt.assert_allclose(moment, [1/6, 0, 0, 1/6, 0, 1/6], atol=1e-12)
+
+    def test_polygon(self):
+        # 2x1 rectangle, not centered at the origin
+        rectangle = np.array([[0, 0], [2, 0], [2, 1], [0, 1]]) + (3, 4)
+        (mass, com, moment) = geometry.massProperties(rectangle, factor=2)
+        npt.assert_allclose(mass, 4)
+        npt.assert_allclose(com, (4, 4.5))
+        npt.assert_allclose(moment, [1/3, 0, 0, 4/3, 0, 5/3], atol=1e-12)
+
+        polygon = geometry.Polygon(rectangle)
+        polygon.center()
+        npt.assert_allclose(np.mean(polygon.vertices, axis=0), 0, atol=1e-6)
+
+    def test_batch(self):
+        hulls = self.hulls()
+        vertices = np.concatenate([vertices for (vertices, _) in hulls])
+        faces = np.concatenate([np.concatenate(faces) for (_, faces) in hulls])
+        face_sizes = [len(face) for (_, faces) in hulls for face in faces]
+        (masses, coms, moments) = geometry.batchMassProperties(
+            vertices, [len(vertices) for (vertices, _) in hulls], faces,
+            face_sizes, [len(faces) for (_, faces) in hulls])
+        for (i, (vertices, faces)) in enumerate(hulls):
+            (mass, com, moment) = geometry.massProperties(vertices, faces)
+            npt.assert_allclose(masses[i], mass)
+            npt.assert_allclose(coms[i], com)
+            npt.assert_allclose(moments[i], moment, atol=1e-12)
+
+        polygons = [random_polygon(n, n) for n in (3, 8, 64)]
+        (masses, coms, moments) = geometry.batchMassProperties(
+            np.concatenate(polygons), [len(polygon) for polygon in polygons])
+        for (i, polygon) in enumerate(polygons):
+            (mass, com, moment) = geometry.massProperties(polygon)
+            npt.assert_allclose(masses[i], geometry.Polygon(polygon).area(), rtol=1e-5)
+            npt.assert_allclose(masses[i], mass)
+            npt.assert_allclose(coms[i], com)
+            npt.assert_allclose(moments[i], moment)
+
+class TriangulationTests(unittest.TestCase):
+    def shapes(self):
+        square = [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (1, 2), (0, 2), (0, 1)]
+        notch = [(0, 0), (1, 0), (1, 1), (.5, .2), (0, 1)]
+        comb = [(0, 0), (16, 0), (16, 1)]
+        for x in range(16, 0, -1):
+            comb.extend([(x - .25, 4), (x - .75, 1)])
+        # turns of the spiral are separated by more than its width
+        thetas = np.linspace(2*np.pi, 8*np.pi, 128)
+        spiral = np.concatenate([
+            np.transpose([(thetas + 1)*np.cos(thetas), (thetas + 1)*np.sin(thetas)]),
+            np.transpose([thetas*np.cos(thetas), thetas*np.sin(thetas)])[::-1]])
+        shapes = [np.array(square), np.array(notch), np.array(comb), spiral]
+        shapes.extend(random_polygon(n, n) for n in (3, 4, 7, 64, 500))
+        # clockwise polygons are also supported
+        shapes.extend([shape[::-1] for shape in shapes])
+        return shapes
+
+    def assertTriangulation(self, vertices, triangles):
+        self.assertEqual(triangles.shape, (len(vertices) - 2, 3))
+        self.assertEqual(triangles.dtype, np.uint32)
+        areas = [geometry.twiceTriangleArea(*vertices[tri])/2 for tri in triangles]
+        # counterclockwise triangles which exactly cover the polygon
+        self.assertGreaterEqual(np.min(areas), -1e-10)
+        npt.assert_allclose(np.sum(areas), abs(geometry.Polygon(vertices).area()), rtol=1e-5)
+
+    def test_polygon(self):
+        for vertices in self.shapes():
+            self.assertTriangulation(vertices, geometry.Polygon(vertices).triangleIndices)
+
+    def test_batch(self):
+        shapes = self.shapes()
+        triangulations = geometry.triangulatePolygons(shapes)
+        self.assertEqual(len(triangulations), len(shapes))
+        for (vertices, triangles) in zip(shapes, triangulations):
+            self.assertTriangulation(vertices, triangles)
+
+        self.assertEqual(geometry.triangulatePolygons([]), [])
+        with self.assertRaises(RuntimeError):
+            geometry.triangulatePolygons([[(0, 0), (1, 0)]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
+import numpy as np
 import matplotlib; matplotlib.use('AGG')
+import matplotlib.pyplot
 import plato.draw.matplotlib as draw
 import test_scenes
 from test_internals import get_fname
@@ -10,6 +12,28 @@ class MatplotlibTests(unittest.TestCase):
         fname = get_fname('matplotlib_{}.png'.format(name))
         scene.save(fname)
 
+    def test_outline_order(self):
+        np.random.seed(11)
+        N = 64
+        cube = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+        prim = draw.ConvexPolyhedra(
+            positions=np.random.uniform(-20, 20, (N, 3)),
+            colors=np.random.uniform(.5, 1, (N, 4)),
+            vertices=cube, outline=.1)
+        # each outline has the same z-order as its face
+        rotation = [0.88047624, 0.27984814, 0.33129458, 0.18061462]
+        scene = draw.Scene(prim, rotation=rotation, zoom=4,
+                           features=dict(ambient_light=.5))
+        (figure, axes) = scene.render()
+
+        colors = np.concatenate([
+            collection.get_facecolor() for collection in axes.collections])
+        matplotlib.pyplot.close(figure)
+        self.assertEqual(len(colors) % 2, 0)
+        # each face is immediately followed by its black outline
+        self.assertTrue(np.all(colors[0::2, :3] > 0))
+        np.testing.assert_array_equal(colors[1::2, :3], 0)
+
 for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
     new_name = 'test_{}'.format(name)
     setattr(
@@ -0,0 +1,129 @@
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+import plato.mesh as pmesh
+
+from benchmark_mesh import (
+    reference_convexPolyhedronMesh, reference_convexSpheropolyhedronMesh,
+    reference_spheropolygonMesh, regular_polygon, sphere_points)
+
+CUBE = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)],
+                dtype=np.float32)
+
+class NormalTests(unittest.TestCase):
+    def test_tetrahedron(self):
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1],
+                             [5, 5, 5]], dtype=np.float32)
+        indices = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+
+        for weighting in ['uniform', 'area', 'angle']:
+            normals = pmesh.computeNormals_(vertices, indices, weighting)
+            # normals point outward from the centroid
+            self.assertTrue(np.all(
+                np.sum(normals[1:4]*(vertices[1:4] - 0.25), axis=-1) > 0))
+            npt.assert_allclose(np.linalg.norm(normals[:4], axis=-1), 1, rtol=1e-6)
+            # unreferenced vertices have no normal
+            npt.assert_array_equal(normals[4], 0)
+
+        # by symmetry, the origin normal is along (-1, -1, -1)
+        npt.assert_allclose(pmesh.computeNormals_(vertices, indices)[0],
+                            -np.ones(3)/np.sqrt(3), rtol=1e-6)
+
+    def test_weighting(self):
+        # a large triangle and a thin sliver sharing vertex 0
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 0, -1e-1]],
+                            dtype=np.float32)
+        indices = np.array([[0, 1, 2], [0, 3, 1]])
+
+        area_normal = pmesh.computeNormals_(vertices, indices, 'area')[0]
+        uniform_normal = pmesh.computeNormals_(vertices, indices, 'uniform')[0]
+        angle_normal = pmesh.computeNormals_(vertices, indices, 'angle')[0]
+
+        npt.assert_allclose(uniform_normal, np.array([0, -1, 1])/np.sqrt(2), atol=1e-2)
+        # area and angle weighting favor the large triangle in this case
+        self.assertGreater(area_normal[2], uniform_normal[2])
+        self.assertGreater(angle_normal[2], uniform_normal[2])
+
+        with self.assertRaises(ValueError):
+            pmesh.computeNormals_(vertices, indices, 'unknown')
+
+class PolyhedronMeshTests(unittest.TestCase):
+    def shapes(self):
+        tetrahedron = [(1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1)]
+        # extra interior point, which is not part of the hull
+        return [CUBE, np.array(tetrahedron + [(0, 0, 0)], dtype=np.float32),
+                sphere_points(12), sphere_points(256)]
+
+    def assertMeshesClose(self, reference, current):
+        for (name, ref, cur) in zip(reference._fields, reference, current):
+            self.assertEqual(ref.shape, cur.shape, name)
+            self.assertEqual(ref.dtype, cur.dtype, name)
+            npt.assert_allclose(cur, ref, rtol=1e-3, atol=1e-5, err_msg=name)
+
+    def test_convex_polyhedron(self):
+        for vertices in self.shapes():
+            self.assertMeshesClose(
+                reference_convexPolyhedronMesh(vertices),
+                pmesh.convexPolyhedronMesh.uncached(vertices))
+
+        mesh = pmesh.convexPolyhedronMesh.uncached(CUBE)
+        self.assertEqual(len(mesh.image), 24)
+        self.assertEqual(len(mesh.indices), 12)
+        # unit outline deltas point inward along the diagonal of each square face
+        npt.assert_allclose(np.linalg.norm(mesh.outline_delta, axis=-1), np.sqrt(2))
+        npt.assert_allclose(np.sum(mesh.outline_delta*mesh.normal, axis=-1), 0, atol=1e-6)
+
+    def test_convex_spheropolyhedron(self):
+        for vertices in self.shapes():
+            for radius in (0, .5):
+                self.assertMeshesClose(
+                    reference_convexSpheropolyhedronMesh(vertices, radius),
+                    pmesh.convexSpheropolyhedronMesh.uncached(vertices, radius))
+
+        radius = .5
+        mesh = pmesh.convexSpheropolyhedronMesh.uncached(CUBE, radius)
+        # 6 faces*(4 face vertices + 8 fin vertices) + 8 cap vertices
+        self.assertEqual(len(mesh.image), 80)
+        npt.assert_allclose(np.linalg.norm(mesh.image - mesh.innerImage, axis=-1),
+                            radius, rtol=1e-6)
+
+class SpheropolygonMeshTests(unittest.TestCase):
+    def shapes(self):
+        concave = [(0, 0), (1, 0), (1, 1), (.5, .2), (0, 1)]
+        # the middle vertex of the bottom edge is degenerate
+        degenerate = [(0, 0), (1, 0), (2, 0), (2, 1), (0, 1)]
+        return [regular_polygon(3), regular_polygon(4), regular_polygon(17),
+                np.array(concave), np.array(degenerate)]
+
+    def test_spheropolygon(self):
+        for vertices in self.shapes():
+            for radius in (.1, 1):
+                for granularity in (1, 2, 5):
+                    reference = reference_spheropolygonMesh(vertices, radius, granularity)
+                    current = pmesh.spheropolygonMesh(vertices, radius, granularity)
+                    for (name, ref, cur) in zip(reference._fields, reference, current):
+                        self.assertEqual(ref.shape, cur.shape, name)
+                        self.assertEqual(ref.dtype, cur.dtype, name)
+                        npt.assert_allclose(cur, ref, atol=1e-6, err_msg=name)
+
+        mesh = pmesh.spheropolygonMesh(regular_polygon(4), .5, 3)
+        # 4 vertices + 4 corners*(3 curve points + 2 segment ends)
+        self.assertEqual(len(mesh.image), 24)
+        self.assertEqual(np.max(mesh.indices), len(mesh.image) - 1)
+
+    def test_granularity(self):
+        self.assertEqual(pmesh.spheropolygonGranularity(0), 1)
+        granularities = [pmesh.spheropolygonGranularity(radius)
+                         for radius in (.5, 2, 8, 32, 1e4)]
+        self.assertEqual(granularities, sorted(granularities))
+        self.assertEqual(granularities[-1], 16)
+
+        for radius in (.5, 2, 8, 32):
+            granularity = pmesh.spheropolygonGranularity(radius, maxGranularity=1024)
+            # curve points of a corner turning by pi stay within tolerance
+            deviation = radius*(1/np.cos(np.pi/(granularity + 1)) - 1)
+            self.assertLessEqual(deviation, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
 import logging
 import unittest
+import numpy as np
 import plato.draw.povray as draw
+from plato.draw.povray.internal import tile_regions
 import subprocess
 import test_scenes
 from test_internals import get_fname
@@ -20,6 +23,65 @@ class PovrayTests(unittest.TestCase):
         fname = get_fname('povray_{}.{}'.format(name, suffix))
         scene.save(fname)
 
+    def test_write_stream(self):
+        scene = test_scenes.many_3d_primitives().convert(draw)
+        target = io.StringIO()
+        scene.write(target)
+        self.assertEqual(target.getvalue(), scene.render() + '\n')
+
+    def count_lines(self, prim, **kwargs):
+        lines = '\n'.join(prim.render(**kwargs)).splitlines()
+        declares = [line for line in lines if line.startswith('#declare')]
+        objects = [line for line in lines if line.startswith('object {')]
+        return (len(declares), objects)
+
+    def test_instanced_mesh(self):
+        N = 12
+        vertices = [(1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1)]
+        indices = [(0, 1, 2), (0, 3, 1), (0, 2, 3), (1, 3, 2)]
+        # three unique shape colors
+        shape_colors = np.tile(np.eye(3, 4) + (0, 0, 0, 1), (N//3, 1))
+        prim = draw.Mesh(
+            vertices=vertices, indices=indices, colors=(.5, .5, .5, 1),
+            positions=np.random.uniform(-4, 4, (N, 3)),
+            shape_colors=shape_colors)
+
+        for (fraction, unique_meshes) in [(1, 1), (.5, 3), (0, 1)]:
+            prim.shape_color_fraction = fraction
+            (declares, objects) = self.count_lines(prim)
+            self.assertEqual(declares, unique_meshes)
+            self.assertEqual(len(objects), N)
+
+    def test_instanced_sphere_unions(self):
+        N = 5
+        positions = np.zeros((N, 3))
+        positions[:, 0] = np.arange(N)
+        prim = draw.SphereUnions(
+            positions=positions, points=[(0, 0, 0), (1, 0, 0)],
+            radii=[1, .5], colors=[(1, 0, 0, 1), (0, 0, 1, 1)])
+
+        # rotate by 90 degrees about z
+        rotation = (np.sqrt(.5), 0, 0, np.sqrt(.5))
+        (declares, objects) = self.count_lines(prim, rotation=rotation)
+        self.assertEqual(declares, 1)
+        self.assertEqual(len(objects), N)
+
+        matrices = np.array([
+            [float(v) for v in line.split('<')[1].split('>')[0].split(',')]
+            for line in objects])
+        np.testing.assert_allclose(
+            matrices[:, 9:], positions[:, [1, 0, 2]]*(-1, 1, 1), atol=1e-6)
+
+    def test_tile_regions(self):
+        (width, height) = (317, 211)
+        for mode in ['rows', 'rectangles']:
+            for tiles in [1, 7, 64, 1000]:
+                coverage = np.zeros((height, width), dtype=np.int32)
+                for (r0, r1, c0, c1) in tile_regions(width, height, tiles, mode):
+                    coverage[r0 - 1:r1, c0 - 1:c1] += 1
+                # every pixel is rendered exactly once
+                self.assertTrue(np.all(coverage == 1))
+
 for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
     new_name = 'test_{}'.format(name)
     setattr(
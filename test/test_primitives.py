@@ -1,4 +1,6 @@
 import unittest
+import numpy as np
+import numpy.testing as npt
 import plato.draw as draw
 
 class PrimitiveLenTests(unittest.TestCase):
@@ -14,5 +16,28 @@ class PrimitiveLenTests(unittest.TestCase):
         prim = draw.Box(Lx=3)
         self.assertEqual(len(prim), 12)
 
+class PrimitiveSubsetTests(unittest.TestCase):
+    def test_update_subset(self):
+        prim = draw.Spheres(positions=np.zeros((4, 3)), colors=(1, 1, 1, 1))
+        prim._dirty_attributes.clear()
+
+        prim.update_subset('positions', [1, 3], [(1, 2, 3), (4, 5, 6)])
+        npt.assert_allclose(prim.positions[[0, 2]], 0)
+        npt.assert_allclose(prim.positions[[1, 3]], [(1, 2, 3), (4, 5, 6)])
+        self.assertIn('positions', prim._dirty_attributes)
+        npt.assert_equal(np.concatenate(prim._dirty_subsets['positions']), [1, 3])
+
+        # broadcasted attributes are expanded and completely modified
+        prim.update_subset('colors', slice(2, None), (0, 0, 0, 1))
+        self.assertEqual(prim.colors.shape, (4, 4))
+        npt.assert_allclose(prim.colors[:, 0], [1, 1, 0, 0])
+        self.assertNotIn('colors', prim._dirty_subsets)
+
+        # setting the whole attribute supersedes subset updates
+        prim.positions = np.ones((4, 3))
+        self.assertNotIn('positions', prim._dirty_subsets)
+        prim.update_subset('positions', 0, (0, 0, 0))
+        self.assertNotIn('positions', prim._dirty_subsets)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,31 @@
 import os
 import unittest
+import numpy as np
+import plato.draw.pythreejs as draw
 from test_internals import get_fname
 
 from nbconvert.nbconvertapp import NbConvertApp
 
+INSTANCE_ITEM_SIZES = dict(
+    instance_offset=3, instance_orientation=4, instance_scale=3,
+    instance_color=4)
+
+MESH_ATTRIBUTES = {'position', 'normal', 'index'}
+
+def record_syncs(prim):
+    """Record the set of attribute names sent by each call to
+    prim._sync_attributes."""
+    result = []
+    sync = prim._sync_attributes
+
+    def recording_sync(*args, **kwargs):
+        sent = sync(*args, **kwargs)
+        result.append(sent)
+        return sent
+
+    prim._sync_attributes = recording_sync
+    return result
+
 class PythreejsTests(unittest.TestCase):
 
     def test_notebook(self):
@@ -13,5 +35,94 @@ class PythreejsTests(unittest.TestCase):
         NbConvertApp.launch_instance(
             argv=['--execute', '--to', 'html', '--output', fname, src])
 
+    def check_instances(self, prim, count):
+        geometry = prim.threejs_primitive.geometry
+
+        self.assertEqual(geometry.maxInstancedCount, count)
+        for (name, size) in INSTANCE_ITEM_SIZES.items():
+            attribute = geometry.attributes[name]
+            self.assertEqual(attribute.itemSize, size)
+            self.assertEqual(attribute.data.array.shape, (count, size))
+
+    def check_instancing(self, prim, count, update):
+        self.check_instances(prim, count)
+        geometry = prim.threejs_primitive.geometry
+        mesh_attributes = {name: geometry.attributes[name]
+                           for name in MESH_ATTRIBUTES}
+        mesh_arrays = {name: attribute.array for (name, attribute)
+                       in mesh_attributes.items()}
+
+        # changing per-instance values must not resend the mesh
+        update(prim)
+        prim.update_arrays()
+        self.check_instances(prim, count)
+
+        for (name, attribute) in mesh_attributes.items():
+            self.assertIs(geometry.attributes[name], attribute)
+            self.assertIs(attribute.array, mesh_arrays[name])
+
+    def test_instanced_spheres(self):
+        N = 5
+        prim = draw.Spheres(
+            positions=np.random.uniform(-4, 4, (N, 3)),
+            colors=np.random.uniform(0, 1, (N, 4)),
+            radii=np.random.uniform(.5, 1, N))
+
+        def move(prim):
+            prim.positions = prim.positions + 1
+
+        self.check_instancing(prim, N, move)
+
+        # changing the mesh resolution resends the mesh
+        geometry = prim.threejs_primitive.geometry
+        position = geometry.attributes['position']
+        prim.vertex_count = 32
+        prim.update_arrays()
+        self.assertIsNot(geometry.attributes['position'], position)
+        self.assertEqual(geometry.attributes['position'].array.shape, (32, 3))
+
+    def test_instanced_lines(self):
+        N = 3
+        prim = draw.Lines(
+            start_points=np.random.uniform(-4, 4, (N, 3)),
+            end_points=np.random.uniform(-4, 4, (N, 3)),
+            colors=np.random.uniform(0, 1, (N, 4)),
+            widths=np.random.uniform(.1, .5, N))
+
+        def widen(prim):
+            prim.widths = 2*prim.widths
+
+        self.check_instancing(prim, N, widen)
+
+    def check_color_sync(self, prim, color_attribute):
+        geometry = prim.threejs_primitive.geometry
+        attributes = dict(geometry.attributes)
+        syncs = record_syncs(prim)
+
+        prim.colors = 1 - prim.colors
+        prim.update_arrays()
+
+        self.assertEqual(set().union(*syncs), {color_attribute})
+        for (name, attribute) in attributes.items():
+            self.assertIs(geometry.attributes[name], attribute)
+
+    def test_sync_instance_colors(self):
+        N = 5
+        prim = draw.Spheres(
+            positions=np.random.uniform(-4, 4, (N, 3)),
+            colors=np.random.uniform(0, 1, (N, 4)),
+            radii=np.random.uniform(.5, 1, N))
+
+        self.check_color_sync(prim, 'instance_color')
+
+    def test_sync_vertex_colors(self):
+        vertices = [(1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1)]
+        indices = [(0, 1, 2), (0, 3, 1), (0, 2, 3), (1, 3, 2)]
+        colors = np.ones((len(vertices), 4))
+        colors[:, :3] = np.random.uniform(0, 1, (len(vertices), 3))
+        prim = draw.Mesh(vertices=vertices, indices=indices, colors=colors)
+
+        self.check_color_sync(prim, 'color')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import plato.draw.raster as draw
+import test_scenes
+from test_internals import get_fname
+
+class RasterTests(unittest.TestCase):
+
+    def render(self, scene, name=''):
+        fname = get_fname('raster_{}.png'.format(name))
+        scene.save(fname)
+
+    def test_depth_order(self):
+        # the nearer (red) sphere should cover the center of the image
+        # regardless of drawing order
+        for front in range(2):
+            positions = np.zeros((2, 3))
+            positions[:, 2] = -1
+            positions[front, 2] = 1
+            colors = np.tile([[0, 0, 1, 1]], (2, 1))
+            colors[front] = (1, 0, 0, 1)
+            prim = draw.Spheres(positions=positions, colors=colors, radii=4)
+            scene = draw.Scene(prim, features=dict(ambient_light=1, directional_light=(0, 0, 0)),
+                               size=(10, 10), pixel_scale=4)
+            image = scene.render()
+            self.assertEqual(image.shape, (40, 40, 4))
+            np.testing.assert_array_equal(image[20, 20], (255, 0, 0, 255))
+            np.testing.assert_array_equal(image[0, 0], (255, 255, 255, 255))
+
+    def test_draw_order(self):
+        # flat shapes are drawn in order, regardless of their size
+        for radii in ([4, 1], [1, 4]):
+            prim = draw.Disks(positions=np.zeros((2, 2)), radii=radii,
+                              colors=[(1, 0, 0, 1), (0, 0, 1, 1)])
+            scene = draw.Scene(prim, size=(10, 10), pixel_scale=4)
+            image = scene.render()
+            np.testing.assert_array_equal(image[20, 20], (0, 0, 255, 255))
+
+        # later primitives are drawn over earlier ones
+        prims = [draw.Disks(positions=np.zeros((1, 2)), radii=radius, colors=color)
+                 for (radius, color) in [(1, (1, 0, 0, 1)), (4, (0, 0, 1, 1))]]
+        image = draw.Scene(prims, size=(10, 10), pixel_scale=4).render()
+        np.testing.assert_array_equal(image[20, 20], (0, 0, 255, 255))
+
+for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
+    new_name = 'test_{}'.format(name)
+    setattr(
+        RasterTests, new_name, (lambda *args, scene=scene, name=name, **kwargs:
+                                RasterTests.render(*args, scene=scene,
+                                                   name=name)))
+    getattr(RasterTests, new_name).__name__ = new_name
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import functools
 import unittest
+from unittest import mock
 import numpy as np
 import os
 
@@ -112,6 +113,127 @@ class VispyTests(unittest.TestCase):
 
         self.render(scene, 'many_3d_normals')
 
+    def finalized_arrays(self, prim, instancing):
+        """Return the vertex arrays, triangle indices, and instanced
+        attribute names that prim sends to the GPU."""
+        calls = []
+        finalize = prim._finalize_array_updates
+
+        def recording_finalize(indices, vertex_arrays, instance_names=()):
+            calls.append((np.asarray(indices), vertex_arrays, set(instance_names)))
+            return finalize(indices, vertex_arrays, instance_names)
+
+        with mock.patch.object(type(prim), '_instancing', instancing), \
+                mock.patch.object(prim, '_finalize_array_updates', recording_finalize):
+            prim._dirty_attributes.add('positions')
+            # force the vertex arrays to be rebuilt
+            prim._gl_vertex_arrays.clear()
+            prim.update_arrays()
+
+        self.assertEqual(len(calls), 1)
+        (indices, vertex_arrays, instance_names) = calls[0]
+        arrays = dict(zip(prim._vertex_attribute_names, vertex_arrays))
+        return (arrays, indices, instance_names)
+
+    def test_instanced_arrays(self):
+        np.random.seed(13)
+        N = 6
+        positions = np.random.uniform(-4, 4, (N, 3))
+        colors = np.random.uniform(0, 1, (N, 4))
+        orientations = np.random.uniform(-1, 1, (N, 4))
+        orientations /= np.linalg.norm(orientations, axis=-1, keepdims=True)
+        prims = [
+            draw.Spheres(positions=positions, colors=colors),
+            draw.Disks(positions=positions[:, :2], colors=colors),
+            draw.Ellipsoids(positions=positions, colors=colors,
+                            orientations=orientations, a=1, b=.5, c=.25),
+            draw.Lines(start_points=positions, end_points=-positions,
+                       colors=colors, widths=.25),
+            draw.Polygons(positions=positions[:, :2], colors=colors,
+                          orientations=orientations,
+                          vertices=[(0, 0), (1, 0), (1, 1), (0, 1)]),
+        ]
+
+        for prim in prims:
+            (instanced, instanced_indices, instance_names) = \
+                self.finalized_arrays(prim, True)
+            (unfolded, unfolded_indices, unfolded_names) = \
+                self.finalized_arrays(prim, False)
+
+            self.assertTrue(instance_names)
+            self.assertFalse(unfolded_names)
+            self.assertEqual(set(instanced), set(unfolded))
+
+            vertex_count = None
+            for (name, unfolded_array) in unfolded.items():
+                self.assertEqual(unfolded_array.shape[0], N)
+                if name in instance_names:
+                    # per-shape quantities are repeated for each vertex
+                    expected = instanced[name][:, np.newaxis]
+                else:
+                    # per-vertex quantities are repeated for each shape
+                    expected = instanced[name][np.newaxis]
+                    vertex_count = len(instanced[name])
+                np.testing.assert_array_equal(
+                    unfolded_array, np.broadcast_to(expected, unfolded_array.shape))
+
+            # each shape's triangles index into its own copy of the mesh
+            offsets = vertex_count*np.arange(N)[:, np.newaxis, np.newaxis]
+            expected_indices = (instanced_indices[np.newaxis] + offsets).reshape((-1, 3))
+            np.testing.assert_array_equal(unfolded_indices, expected_indices)
+
+    def test_subset_rebuild(self):
+        prim = draw.Spheres(positions=np.zeros((4, 3)))
+        prim.update_arrays()
+
+        prim.update_subset('positions', [1, 3], [(1, 2, 3), (4, 5, 6)])
+        # modifying a uniform-like attribute rebuilds all vertex arrays
+        prim.light_levels = 3
+        prim.update_arrays()
+        self.assertFalse(prim._dirty_attributes)
+        self.assertFalse(prim._dirty_subsets)
+
+        prim.update_subset('positions', 0, (7, 8, 9))
+        prim.update_arrays()
+        self.assertFalse(prim._dirty_subsets)
+        positions = prim._gl_vertex_arrays['position']
+        np.testing.assert_allclose(
+            positions.reshape((4, -1, 3))[:, 0],
+            [(7, 8, 9), (1, 2, 3), (0, 0, 0), (4, 5, 6)])
+
+    def test_render_frames(self):
+        original_scene = test_scenes.colored_spheres()
+        prim = draw.Spheres.copy(list(original_scene)[0])
+        scene = draw.Scene(prim, zoom=4)
+
+        def frames():
+            yield None
+            for delta in [(1, 0, 0), (0, 1, 0)]:
+                yield {prim: dict(positions=prim.positions + delta)}
+            yield {0: dict(colors=np.ones_like(prim.colors))}
+
+        images = []
+        for image in draw.render_frames(scene, frames(), alpha=False):
+            images.append(image)
+            if len(images) == 1:
+                buffers = dict(prim._gl_buffers)
+
+        self.assertEqual(len(images), 4)
+        self.assertEqual(images[0].shape, tuple(scene.size_pixels[::-1].astype(np.int32)) + (3,))
+        for (a, b) in zip(images[:-1], images[1:]):
+            self.assertTrue(np.any(a != b))
+        # vertex buffers are reused between frames
+        for (key, buf) in buffers.items():
+            self.assertIs(prim._gl_buffers[key], buf)
+
+        fnames = draw.save_frames(
+            scene, [None, None], get_fname('vispy_frames_{:02d}.png'))
+        self.assertEqual(len(fnames), 2)
+        self.assertTrue(all(os.path.exists(fname) for fname in fnames))
+
+        scene._canvas.close()
+        vispy.app.process_events()
+
 for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
     new_name = 'test_{}'.format(name)
     setattr(
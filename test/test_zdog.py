@@ -1,14 +1,69 @@
+import base64
+import re
+import shutil
+import subprocess
 import unittest
+import numpy as np
 import plato.draw.zdog as draw
+from plato.draw.zdog.Scene import LOCAL_HELPER_SCRIPT
+from plato.draw.zdog.internal import (
+    TYPED_ARRAY_NAMES, encode_array, encode_colors, outline_color_string)
 import test_scenes
 from test_internals import get_fname
 
+def decode_array(expression):
+    """Decode the result of encode_array in python."""
+    (data, array_type) = re.fullmatch(
+        r'decode_array\("([A-Za-z0-9+/=]*)", (\w+)\)', expression).groups()
+    dtypes = {name: dtype for (dtype, name) in TYPED_ARRAY_NAMES.items()}
+    return np.frombuffer(base64.b64decode(data), dtype=dtypes[array_type].newbyteorder('<'))
+
 class ZdogTests(unittest.TestCase):
 
     def render(self, scene, name=''):
         fname = get_fname('zdog_{}.html'.format(name))
         scene.save(fname)
 
+    def test_encode_array(self):
+        array = np.random.uniform(-1e3, 1e3, (7, 3))
+        decoded = decode_array(encode_array(array))
+        self.assertEqual(decoded.dtype, np.float32)
+        self.assertEqual(decoded.shape, (array.size,))
+        np.testing.assert_array_equal(
+            decoded.reshape(array.shape), array.astype(np.float32))
+
+        array = np.arange(12).reshape((3, 4))
+        decoded = decode_array(encode_array(array, np.uint8))
+        self.assertEqual(decoded.dtype, np.uint8)
+        np.testing.assert_array_equal(decoded, np.arange(12))
+
+    @unittest.skipUnless(shutil.which('node'), 'node is required to evaluate javascript')
+    def test_rgba_string(self):
+        colors = np.array([
+            (255, 0, 0, 255),
+            (0, 128, 255, 0),
+            (300, -5, 17, 50.6),
+        ])
+        expected = [
+            'rgba(255, 0, 0, 1)',
+            'rgba(0, 128, 255, 0)',
+            'rgba(255, 0, 17, 0.2)',
+            'rgba(0, 0, 0, 1)',
+            'rgba(0, 0, 0, 0)',
+            'rgba(0, 0, 0, 0.2)',
+        ]
+
+        script = LOCAL_HELPER_SCRIPT + 'let colors = {};\n'.format(encode_colors(colors))
+        for i in range(len(colors)):
+            script += 'console.log(rgba_string(colors, {}));\n'.format(i)
+        for i in range(len(colors)):
+            script += 'console.log({});\n'.format(outline_color_string('colors', i))
+
+        output = subprocess.run(
+            ['node', '-e', script], check=True, stdout=subprocess.PIPE,
+            universal_newlines=True).stdout
+        self.assertEqual(output.splitlines(), expected)
+
 for i, (name, scene) in enumerate(test_scenes.translate_usable_scenes(draw)):
     new_name = 'test_{}'.format(name)
     setattr(